@@ -40,6 +40,9 @@ async def main_async(args):
         while ctx.scheduler.running_tasks():
             await asyncio.sleep(0.5)
 
+        from src.api.polis import close_client
+        await close_client()
+
         return 0
     
     # -----------------------------
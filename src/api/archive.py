@@ -0,0 +1,94 @@
+from typing import Dict, Iterator, Optional, Tuple
+from datetime import datetime
+from hashlib import blake2b
+from pathlib import Path
+import gzip
+import json
+import os
+
+from src.core.config import settings
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+ARCHIVE_DIR = settings.data_dir / "archive"
+
+
+# ==========================================================
+# RAW RESPONSE ARCHIVE
+# ==========================================================
+#
+# Response bodies exactly as the API returned them, gzipped and stored
+# content-addressed under objects/<digest[:2]>/<digest>.gz. A body already
+# in the archive is not written again, so unchanged polls cost one stat.
+# index.jsonl lists new bodies in arrival order (time, params, digest);
+# replay streams them back through the ingest pipeline.
+
+def body_digest(body: bytes) -> str:
+    return blake2b(body, digest_size=16).hexdigest()
+
+
+def _object_path(digest: str, archive_dir: Path) -> Path:
+    return archive_dir / "objects" / digest[:2] / f"{digest}.gz"
+
+
+def archive_response(
+    body: bytes,
+    params: Optional[dict] = None,
+    digest: Optional[str] = None,
+    archive_dir: Path = ARCHIVE_DIR,
+) -> bool:
+    """Store body unless already archived, returns True if it was new"""
+
+    digest = digest or body_digest(body)
+    path = _object_path(digest, archive_dir)
+
+    if path.exists():
+        return False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with gzip.open(tmp, "wb") as f:
+        f.write(body)
+    os.replace(tmp, path)
+
+    entry = {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "params": params or {},
+        "digest": digest,
+    }
+
+    with (archive_dir / "index.jsonl").open("a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    logger.debug(f"Archived response {digest} ({len(body)} bytes)")
+    return True
+
+
+def iter_archive(archive_dir: Path = ARCHIVE_DIR) -> Iterator[Tuple[Dict, bytes]]:
+    """(index entry, raw body) for every archived response, oldest first"""
+
+    index_file = archive_dir / "index.jsonl"
+    if not index_file.exists():
+        return
+
+    with index_file.open("r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+
+            try:
+                entry = json.loads(line)
+                path = _object_path(entry["digest"], archive_dir)
+
+            except (json.JSONDecodeError, KeyError, TypeError):
+                logger.warning(f"{index_file}:{line_no} is corrupt, skipping")
+                continue
+
+            try:
+                with gzip.open(path, "rb") as body:
+                    yield entry, body.read()
+
+            except (OSError, EOFError):
+                logger.warning(f"Archived response {entry['digest']} is missing or corrupt, skipping")
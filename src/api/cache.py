@@ -0,0 +1,149 @@
+from typing import List, Dict, Optional
+from contextlib import asynccontextmanager
+from hashlib import blake2b
+from pathlib import Path
+import asyncio
+import json
+import os
+import secrets
+import time
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# ==========================================================
+# DISK RESPONSE CACHE
+# ==========================================================
+#
+# One file per request params under cache_dir/responses, holding the
+# decoded events with the time they were fetched and the response
+# validators (ETag, Last-Modified, body digest). Entries younger than the
+# TTL are served without a request, so short-lived processes (cron, scripts
+# running main.py refresh) share one upstream fetch per TTL window. A miss
+# takes a lock file (O_CREAT | O_EXCL, portable) so concurrent processes
+# wait for the first one instead of all fetching. The lock file holds an
+# owner token, so a holder that was presumed dead and replaced only ever
+# removes its own lock. Entries are written to a
+# temp file and moved into place with os.replace, readers never see a
+# partial file.
+
+class ResponseCache:
+    def __init__(self, directory: Path, ttl_s: float, lock_timeout_s: float = 30.0):
+        self.directory = directory
+        self.ttl_s = ttl_s
+        self.lock_timeout_s = lock_timeout_s
+
+    def _path(self, params: dict) -> Path:
+        key = json.dumps(sorted(params.items()), ensure_ascii=False)
+        return self.directory / f"{blake2b(key.encode('utf-8'), digest_size=10).hexdigest()}.json"
+
+    # -----------------------------
+    # Entries
+    # -----------------------------
+    def load(self, params: dict) -> Optional[Dict]:
+        """Cached entry of any age, None if missing/corrupt"""
+
+        path = self._path(params)
+
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                entry = json.load(f)
+
+        except FileNotFoundError:
+            return None
+
+        except (json.JSONDecodeError, OSError):
+            logger.warning(f"{path} is corrupt, ignoring cached response")
+            return None
+
+        return entry if isinstance(entry, dict) and isinstance(entry.get("events"), list) else None
+
+    def fresh(self, params: dict) -> Optional[Dict]:
+        entry = self.load(params)
+
+        if entry is None or time.time() - entry.get("fetched_at", 0) > self.ttl_s:
+            return None
+
+        return entry
+
+    def store(self, params: dict, events: Optional[List[Dict]], validators: Dict, previous: Optional[Dict] = None) -> Dict:
+        """Save a fetched response; events None re-stamps previous (not modified)"""
+
+        entry = {
+            "fetched_at": time.time(),
+            "etag": validators.get("etag"),
+            "last_modified": validators.get("last_modified"),
+            "digest": validators.get("digest"),
+            "events": events if events is not None else previous["events"],
+        }
+
+        path = self._path(params)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+
+        os.replace(tmp, path)
+        return entry
+
+    # -----------------------------
+    # Cross-process lock
+    # -----------------------------
+    @staticmethod
+    def _lock_owner(path: Path) -> Optional[str]:
+        try:
+            return path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _unlock(path: Path, token: str) -> None:
+        """Remove the lock file only while it still holds token"""
+
+        if ResponseCache._lock_owner(path) == token:
+            path.unlink(missing_ok=True)
+
+    @asynccontextmanager
+    async def lock(self, params: dict):
+        """Hold the fetch lock for params, breaking locks older than lock_timeout_s"""
+
+        path = self._path(params).with_suffix(".lock")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        deadline = time.monotonic() + self.lock_timeout_s
+        token = f"{os.getpid()}:{secrets.token_hex(8)}"
+
+        while True:
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                try:
+                    os.write(fd, token.encode("utf-8"))
+                finally:
+                    os.close(fd)
+                break
+
+            except FileExistsError:
+                owner = self._lock_owner(path)
+
+                try:
+                    stale = time.time() - path.stat().st_mtime > self.lock_timeout_s
+                except FileNotFoundError:
+                    continue
+
+                if stale or time.monotonic() > deadline:
+                    logger.warning(f"Breaking stale response cache lock {path.name}")
+
+                    # only the lock judged stale, not one taken meanwhile
+                    self._unlock(path, owner)
+                    deadline = time.monotonic() + self.lock_timeout_s
+                    continue
+
+                await asyncio.sleep(0.05)
+
+        try:
+            yield
+
+        finally:
+            self._unlock(path, token)
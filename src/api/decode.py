@@ -0,0 +1,190 @@
+from typing import List, Dict, Optional, TypedDict
+from collections import Counter
+import json
+import re
+
+try:
+    import msgspec
+except ImportError:  # optional, the hand-rolled decoder is used instead
+    msgspec = None
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# ==========================================================
+# EVENT PAYLOAD DECODING
+# ==========================================================
+#
+# The events list is decoded and validated item by item in one pass into
+# the record shape the rest of the app indexes (id, datetime, name,
+# summary, url, type, location{name, gps}); unknown keys are left out.
+# Items that do not fit are dropped and counted instead of failing the
+# whole response or crashing later on e["id"]. With msgspec installed the
+# list is split into raw items and each is decoded straight into a typed
+# dict (the whole list at once when every item is valid, the common case),
+# otherwise json.loads plus a hand-rolled check.
+
+class PolisAPIDecodeError(ValueError):
+    """Payload is not JSON or not a list"""
+
+
+class _LocationName(TypedDict):
+    name: str
+
+
+class Location(_LocationName, total=False):
+    gps: Optional[str]  # null is accepted and left out, as in _check_item
+
+
+class Event(TypedDict):
+    id: int
+    datetime: str
+    name: str
+    summary: str
+    url: str
+    type: str
+    location: Location
+
+
+_STR_FIELDS = ("datetime", "name", "summary", "url", "type")
+
+# items seen / dropped, and dropped per reason ("dropped:<field>")
+decode_stats = Counter()
+
+
+# -----------------------------
+# Hand-rolled
+# -----------------------------
+def _check_item(item) -> tuple:
+    """(record, None) or (None, reason)"""
+
+    if not isinstance(item, dict):
+        return None, "not an object"
+
+    event_id = item.get("id")
+    if not isinstance(event_id, int) or isinstance(event_id, bool):
+        return None, "id"
+
+    record = {"id": event_id}
+    for field in _STR_FIELDS:
+        value = item.get(field)
+        if not isinstance(value, str):
+            return None, field
+        record[field] = value
+
+    location = item.get("location")
+    if not isinstance(location, dict) or not isinstance(location.get("name"), str):
+        return None, "location.name"
+
+    record["location"] = {"name": location["name"]}
+
+    gps = location.get("gps")
+    if gps is not None:
+        if not isinstance(gps, str):
+            return None, "location.gps"
+        record["location"]["gps"] = gps
+
+    return record, None
+
+
+def _decode_python(body: bytes) -> tuple:
+    try:
+        data = json.loads(body)
+    except ValueError as e:
+        raise PolisAPIDecodeError("Invalid JSON") from e
+
+    if not isinstance(data, list):
+        raise PolisAPIDecodeError("Unexpected format (expected list)")
+
+    events, dropped = [], Counter()
+    for item in data:
+        record, reason = _check_item(item)
+
+        if record is None:
+            dropped[reason] += 1
+        else:
+            events.append(record)
+
+    return events, dropped
+
+
+# -----------------------------
+# msgspec
+# -----------------------------
+if msgspec is not None:
+    _events_decoder = msgspec.json.Decoder(List[Event])
+    _list_decoder = msgspec.json.Decoder(List[msgspec.Raw])
+    _event_decoder = msgspec.json.Decoder(Event)
+
+_ERROR_PATH = re.compile(r"at `\$\.?([^`]*)`")
+_ERROR_MISSING = re.compile(r"missing required field `([^`]*)`")
+
+
+def _error_reason(error: Exception) -> str:
+    """Dotted field path of a msgspec validation error, like _check_item reasons"""
+
+    message = str(error)
+    path = _ERROR_PATH.search(message)
+    missing = _ERROR_MISSING.search(message)
+
+    parts = [path.group(1) if path else "", missing.group(1) if missing else ""]
+    return ".".join(p for p in parts if p) or "not an object"
+
+
+def _strip_null_gps(events: List[Dict]) -> List[Dict]:
+    for e in events:
+        location = e["location"]
+        if "gps" in location and location["gps"] is None:
+            del location["gps"]
+
+    return events
+
+
+def _decode_msgspec(body: bytes) -> tuple:
+    try:
+        return _strip_null_gps(_events_decoder.decode(body)), Counter()
+    except msgspec.DecodeError:
+        pass  # find out what is wrong, item by item
+
+    try:
+        items = _list_decoder.decode(body)
+
+    except msgspec.ValidationError as e:
+        raise PolisAPIDecodeError("Unexpected format (expected list)") from e
+
+    except msgspec.DecodeError as e:
+        raise PolisAPIDecodeError("Invalid JSON") from e
+
+    events, dropped = [], Counter()
+    for raw in items:
+        try:
+            events.append(_event_decoder.decode(raw))
+
+        except msgspec.ValidationError as e:
+            dropped[_error_reason(e)] += 1
+
+    return _strip_null_gps(events), dropped
+
+
+# -----------------------------
+# Public
+# -----------------------------
+def decode_events(body: bytes | str) -> List[Dict]:
+    """Validated event records from a raw events payload, raises PolisAPIDecodeError"""
+
+    events, dropped = (_decode_msgspec if msgspec is not None else _decode_python)(body)
+
+    total = sum(dropped.values())
+    decode_stats["items"] += len(events) + total
+
+    if total:
+        decode_stats["dropped"] += total
+        for reason, count in dropped.items():
+            decode_stats[f"dropped:{reason}"] += count
+
+        reasons = ", ".join(f"{reason}={count}" for reason, count in dropped.most_common())
+        logger.warning(f"Dropped {total} malformed events ({reasons})")
+
+    return events
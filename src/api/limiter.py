@@ -0,0 +1,136 @@
+from typing import Optional
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import asyncio
+import random
+import time
+
+
+# ==========================================================
+# SHARED RATE LIMIT / CIRCUIT BREAKER
+# ==========================================================
+#
+# One TokenBucket and one CircuitBreaker live on the pooled PolisClient, so
+# refresh, poll and backfill all draw from the same request budget and all
+# stop together once the API blocks us. Both are plain synchronous state
+# updated between awaits, which is atomic on a single event loop and keeps
+# them usable across loops (no asyncio.Lock bound to one loop).
+
+class TokenBucket:
+    """rate_per_s tokens per second, at most burst stored"""
+
+    def __init__(self, rate_per_s: float, burst: int = 1):
+        self.rate = rate_per_s
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """Take a token, returns how long the caller must wait before using it"""
+
+        if self.rate <= 0:
+            return 0.0
+
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        # tokens may go negative: each waiting caller holds a reservation
+        self.tokens -= 1
+        return max(-self.tokens / self.rate, 0.0)
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class CircuitBreaker:
+    """
+    closed: requests pass, consecutive failures are counted.
+    open: requests are refused until the cool-down ends.
+    half-open: a single probe request decides whether to close or reopen.
+    """
+
+    def __init__(self, failure_threshold: int, reset_s: float):
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_s = reset_s
+        self.failures = 0
+        self.open_until = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.open_until > time.monotonic():
+            return "open"
+        if self.open_until:
+            return "half-open"
+        return "closed"
+
+    def remaining(self) -> float:
+        return max(self.open_until - time.monotonic(), 0.0)
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now, claims the probe when half-open"""
+
+        state = self.state
+
+        if state == "open":
+            return False
+
+        if state == "half-open":
+            if self._probing:
+                return False
+            self._probing = True
+
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.open_until = 0.0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+
+        if self._probing or self.failures >= self.failure_threshold:
+            self.trip(self.reset_s)
+
+    def release_probe(self) -> None:
+        """Give up a claimed probe without a verdict (cancelled or crashed)"""
+
+        self._probing = False
+
+    def trip(self, seconds: float) -> None:
+        """Open for at least seconds (e.g. a server supplied Retry-After)"""
+
+        self.open_until = max(self.open_until, time.monotonic() + seconds)
+        self._probing = False
+
+
+def backoff_delay(attempt: int, base_s: float, max_s: float, modifier: float) -> float:
+    """Full-jitter exponential backoff for retry attempt (1-based)"""
+
+    ceiling = min(max_s, base_s * modifier ** (attempt - 1))
+    return random.uniform(0, ceiling)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After header as seconds, either delta-seconds or an HTTP date"""
+
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
@@ -0,0 +1,97 @@
+from typing import Dict, Optional
+from collections import Counter, deque
+import math
+import time
+
+
+# ==========================================================
+# IN-PROCESS METRICS
+# ==========================================================
+#
+# Counters plus histograms that keep the last SAMPLES observations (a
+# sliding window, so percentiles follow current behaviour and memory stays
+# bounded). api.polis records every request here; 'stats api' reads it.
+
+SAMPLES = 1024
+
+
+class Histogram:
+    def __init__(self, samples: int = SAMPLES):
+        self.values = deque(maxlen=samples)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.values.append(value)
+        self.count += 1
+        self.total += value
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Nearest-rank percentile (p in 0..100) over the window"""
+
+        if not self.values:
+            return None
+
+        ordered = sorted(self.values)
+        rank = max(math.ceil(p / 100 * len(ordered)) - 1, 0)
+        return ordered[min(rank, len(ordered) - 1)]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.counters = Counter()
+        self.histograms: Dict[str, Histogram] = {}
+        self.started = time.time()
+
+    def inc(self, name: str, value: int = 1) -> None:
+        self.counters[name] += value
+
+    def observe(self, name: str, value: float) -> None:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+
+        histogram.observe(value)
+
+    def reset(self) -> None:
+        self.counters.clear()
+        self.histograms.clear()
+        self.started = time.time()
+
+
+api_metrics = MetricsRegistry()
+
+
+class RequestTrace:
+    """
+    httpcore trace callback (request extensions={"trace": ...}) collecting
+    phase timestamps: connect (TCP incl. DNS, plus TLS) only happens on a
+    new pooled connection, TTFB is request sent -> response headers.
+    """
+
+    def __init__(self):
+        self.marks: Dict[str, float] = {}
+
+    async def __call__(self, name: str, info: dict) -> None:
+        self.marks[name] = time.perf_counter()
+
+    def span(self, start: str, end: str) -> Optional[float]:
+        if start in self.marks and end in self.marks:
+            return self.marks[end] - self.marks[start]
+
+        return None
+
+    def connect_s(self) -> Optional[float]:
+        tcp = self.span("connection.connect_tcp.started", "connection.connect_tcp.complete")
+        if tcp is None:
+            return None
+
+        return tcp + (self.span("connection.start_tls.started", "connection.start_tls.complete") or 0.0)
+
+    def ttfb_s(self) -> Optional[float]:
+        for http in ("http11", "http2"):
+            span = self.span(f"{http}.send_request_headers.started", f"{http}.receive_response_headers.complete")
+            if span is not None:
+                return span
+
+        return None
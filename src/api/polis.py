@@ -1,9 +1,15 @@
 from typing import List, Dict, Optional
 import asyncio
+import time
 import httpx
 
 from src.core.config import settings
 from src.core.logger import get_logger
+from src.api.limiter import TokenBucket, CircuitBreaker, backoff_delay, parse_retry_after
+from src.api.cache import ResponseCache
+from src.api.archive import archive_response, body_digest
+from src.api.decode import decode_events, PolisAPIDecodeError
+from src.api.metrics import api_metrics, RequestTrace
 
 logger = get_logger(__name__)
 
@@ -12,6 +18,7 @@ BACKOFF_S = settings.http_backoff_s
 BACKOFF_MAX_S = settings.http_backoff_max_s
 BACKOFF_MODIFIER = settings.http_backoff_modifier
 RETRIES = settings.http_max_retries
+ARCHIVE = settings.http_archive
 
 # -----------------------------
 # Exceptions (domain errors)
@@ -28,6 +35,120 @@ class PolisAPIUnavailable(PolisAPIError):
     """Retryable: server/network/rate limit problem"""
 
 
+class PolisAPIRateLimited(PolisAPIUnavailable):
+    """Retryable: blocked (403/429), retry_after seconds if the server said"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class PolisAPICircuitOpen(PolisAPIUnavailable):
+    """Refused locally: too many recent failures or a block, cooling down"""
+
+
+# -----------------------------
+# Pooled client
+# -----------------------------
+class PolisClient:
+    """
+    Long-lived httpx.AsyncClient with keep-alive pooling, so repeated
+    polls reuse connections instead of paying DNS/TCP/TLS setup each time.
+    The underlying client is created lazily on the running event loop.
+    Every request also goes through the shared limiter and breaker, and
+    the disk response cache when cache_ttl_s > 0.
+    """
+
+    def __init__(
+        self,
+        timeout_s: int = settings.http_timeout_s,
+        max_connections: int = settings.http_max_connections,
+        max_keepalive: int = settings.http_max_keepalive,
+        keepalive_expiry_s: int = settings.http_keepalive_expiry_s,
+        rate_per_s: float = settings.http_rate_per_s,
+        burst: int = settings.http_burst,
+        breaker_failures: int = settings.http_breaker_failures,
+        breaker_reset_s: int = settings.http_breaker_reset_s,
+        cache_ttl_s: float = settings.http_cache_ttl_s,
+    ):
+        self.timeout = httpx.Timeout(timeout_s)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry_s,
+        )
+        self.limiter = TokenBucket(rate_per_s, burst)
+        self.breaker = CircuitBreaker(breaker_failures, breaker_reset_s)
+
+        self.cache = None
+        if cache_ttl_s > 0:
+            # long enough for a fetch with all its retries
+            lock_timeout_s = timeout_s + RETRIES * (timeout_s + BACKOFF_MAX_S)
+            self.cache = ResponseCache(settings.cache_dir / "responses", cache_ttl_s, lock_timeout_s)
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # per request params: {"etag", "last_modified", "digest"} of the
+        # last accepted response, for conditional requests, and those of
+        # responses fetched with commit=False and not accepted yet
+        self.validators: Dict[tuple, Dict[str, Optional[str]]] = {}
+        self.pending_validators: Dict[tuple, Dict[str, Optional[str]]] = {}
+
+    def commit_validators(self, params: Optional[dict] = None) -> None:
+        """Accept the pending validators for params (after the events were stored)"""
+
+        key = tuple(sorted((params or {}).items()))
+        pending = self.pending_validators.pop(key, None)
+
+        if pending is not None:
+            self.validators[key] = pending
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+
+        # a client is bound to the loop it was created on
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                headers={
+                    "User-Agent": f"{settings.app_name}/{settings.version}",
+                    "Accept": "application/json",
+                },
+            )
+            self._loop = loop
+            logger.debug("Opened pooled Polis API client")
+
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.debug("Closed pooled Polis API client")
+
+        self._client = None
+        self._loop = None
+
+
+_client: Optional[PolisClient] = None
+
+
+def get_client() -> PolisClient:
+    global _client
+
+    if _client is None:
+        _client = PolisClient()
+
+    return _client
+
+
+async def close_client() -> None:
+    if _client is not None:
+        await _client.close()
+
+
 # -----------------------------
 # HTTP -> Domain translation
 # -----------------------------
@@ -35,11 +156,13 @@ def _translate_http_error(resp: httpx.Response, err: Exception) -> None:
     status = resp.status_code
 
     # Retryable
+    retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+
     if status == 403:
-        raise PolisAPIUnavailable("Blocked / rate limited by Polis API") from err
+        raise PolisAPIRateLimited("Blocked / rate limited by Polis API", retry_after) from err
 
     if status == 429:
-        raise PolisAPIUnavailable("Too many requests") from err
+        raise PolisAPIRateLimited("Too many requests", retry_after) from err
 
     if 500 <= status < 600:
         raise PolisAPIUnavailable(f"Server error {status}") from err
@@ -50,18 +173,33 @@ def _translate_http_error(resp: httpx.Response, err: Exception) -> None:
 
 async def _request(
     client: httpx.AsyncClient,
-    params: Optional[dict] = None
-) -> List[Dict]:
+    params: Optional[dict] = None,
+    validators: Optional[Dict[str, Optional[str]]] = None,
+) -> Optional[List[Dict]]:
+    """
+    GET the events list. With validators (updated in place) the request is
+    conditional: None is returned when the server answers 304 or the raw
+    body hashes the same as last time, before any JSON decoding.
+    """
+
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    api_metrics.inc("requests")
+    trace = RequestTrace()
+    start = time.perf_counter()
 
     try:
-        resp = await client.get(
-            EVENT_URL,
-            params=params,
-            headers={
-                "User-Agent": f"{settings.app_name}/{settings.version}",
-                "Accept": "application/json",
-            },
-        )
+        resp = await client.get(EVENT_URL, params=params, headers=headers, extensions={"trace": trace})
+        _record_response(resp, trace, start)
+
+        if resp.status_code == 304 and validators is not None:
+            logger.debug("Polis API: not modified (304)")
+            return None
 
         try:
             resp.raise_for_status()
@@ -69,23 +207,67 @@ async def _request(
             _translate_http_error(resp, e)
 
     except httpx.TimeoutException as e:
+        api_metrics.inc("errors:timeout")
         raise PolisAPITimeout("Polis API request timed out") from e
 
     except httpx.RequestError as e:
+        api_metrics.inc("errors:network")
         raise PolisAPIUnavailable(f"Network error: {e}") from e
 
+    digest = None
+    if validators is not None:
+        digest = body_digest(resp.content)
+
+        if digest == validators.get("digest"):
+            logger.debug("Polis API: response body unchanged")
+            api_metrics.inc("unchanged")
+            return None
+
+    if ARCHIVE:
+        try:
+            archive_response(resp.content, params, digest)
+        except OSError:
+            logger.exception("Failed to archive API response")
+
     # -------- Response validation --------
     try:
-        data = resp.json()
-    except ValueError as e:
-        raise PolisAPIError("Invalid JSON returned from API") from e
+        data = decode_events(resp.content)
+    except PolisAPIDecodeError as e:
+        api_metrics.inc("errors:decode")
+        raise PolisAPIError(f"{e} returned from API") from e
+
+    api_metrics.observe("events", len(data))
 
-    if not isinstance(data, list):
-        raise PolisAPIError("Unexpected API format (expected list)")
+    if validators is not None:
+        validators["etag"] = resp.headers.get("ETag")
+        validators["last_modified"] = resp.headers.get("Last-Modified")
+        validators["digest"] = digest
 
     return data
 
 
+def _record_response(resp: httpx.Response, trace: RequestTrace, start: float) -> None:
+    api_metrics.inc(f"status:{resp.status_code}")
+    api_metrics.observe("latency_s", time.perf_counter() - start)
+    api_metrics.observe("response_bytes", len(resp.content))
+
+    ttfb = trace.ttfb_s()
+    if ttfb is not None:
+        api_metrics.observe("ttfb_s", ttfb)
+
+    connect = trace.connect_s()
+    if connect is not None:
+        api_metrics.inc("connections_opened")
+        api_metrics.observe("connect_s", connect)
+
+
+def _circuit_open(breaker: CircuitBreaker) -> PolisAPICircuitOpen:
+    if breaker.state == "open":
+        return PolisAPICircuitOpen(f"Polis API circuit open, retry in {breaker.remaining():.0f}s")
+
+    return PolisAPICircuitOpen("Polis API circuit half-open, probe request in flight")
+
+
 # -----------------------------
 # Public API
 # -----------------------------
@@ -97,7 +279,21 @@ async def fetch_events(
     backoff_max_s: int = BACKOFF_MAX_S,
     backoff_modifier: float = BACKOFF_MODIFIER,
     retries: int = RETRIES,
-) -> List[Dict]:
+    client: Optional[PolisClient] = None,
+    conditional: bool = False,
+    commit: bool = True,
+) -> Optional[List[Dict]]:
+    """
+    Fetch events from the Polis API, retrying with jittered exponential
+    backoff (or the server's Retry-After). With conditional=True returns
+    None when nothing changed since the last accepted conditional fetch
+    with the same parameters; commit=False leaves this response's
+    validators pending until client.commit_validators(), so a caller that
+    fails to store the events sees them again. Raises PolisAPICircuitOpen
+    without a request while the shared breaker is open. Served from the
+    disk response cache when it is enabled and holds a fresh entry for
+    the parameters.
+    """
 
     params = {}
 
@@ -108,27 +304,140 @@ async def fetch_events(
     if limit:
         params["limit"] = limit
 
+    client = client or get_client()
+    retry = (backoff_s, backoff_max_s, backoff_modifier, retries)
+
+    if not conditional:
+        return await _fetch_events(client, params, None, retry)
+
+    # updated on a copy, accepted now or by commit_validators()
+    key = tuple(sorted(params.items()))
+    validators = dict(client.validators.get(key, {}))
+
+    events = await _fetch_events(client, params, validators, retry)
+
+    if commit:
+        client.validators[key] = validators
+    else:
+        client.pending_validators[key] = validators
+
+    return events
+
+
+async def _fetch_events(
+    client: PolisClient,
+    params: dict,
+    validators: Optional[Dict],
+    retry: tuple,
+) -> Optional[List[Dict]]:
+    cache = client.cache
+    if cache is None:
+        return await _fetch_with_retries(client, params, validators, *retry)
+
+    entry = cache.fresh(params)
+
+    if entry is None:
+        api_metrics.inc("cache:miss")
+
+        async with cache.lock(params):
+            # another process may have fetched while we waited
+            entry = cache.fresh(params)
+
+            if entry is None:
+                previous = cache.load(params)
+
+                # the stale entry's validators make the upstream fetch conditional
+                upstream = {
+                    key: previous.get(key) for key in ("etag", "last_modified", "digest")
+                } if previous else {}
+
+                events = await _fetch_with_retries(client, params, upstream, *retry)
+                entry = cache.store(params, events, upstream, previous)
+    else:
+        api_metrics.inc("cache:hit")
+        logger.debug("Polis API: served from response cache")
+
+    return _from_cache_entry(entry, validators)
+
+
+def _from_cache_entry(entry: Dict, validators: Optional[Dict]) -> Optional[List[Dict]]:
+    if validators is not None:
+        if entry.get("digest") and entry["digest"] == validators.get("digest"):
+            return None
+
+        validators["etag"] = entry.get("etag")
+        validators["last_modified"] = entry.get("last_modified")
+        validators["digest"] = entry.get("digest")
+
+    return entry["events"]
+
+
+async def _fetch_with_retries(
+    client: PolisClient,
+    params: dict,
+    validators: Optional[Dict],
+    backoff_s: int,
+    backoff_max_s: int,
+    backoff_modifier: float,
+    retries: int,
+) -> Optional[List[Dict]]:
     attempt = 0
-    backoff_val = backoff_s
+    breaker = client.breaker
+
+    while True:
+        if not breaker.allow():
+            api_metrics.inc("circuit_open")
+            raise _circuit_open(breaker)
+
+        try:
+            await client.limiter.acquire()
+            events = await _request(client.client, params, validators)
+
+        except (PolisAPITimeout, PolisAPIUnavailable) as e:
+            breaker.record_failure()
+            attempt += 1
+
+            retry_after = getattr(e, "retry_after", None)
+
+            if isinstance(e, PolisAPIRateLimited):
+                # a block applies to every caller, not just this one
+                breaker.trip(retry_after if retry_after is not None else backoff_max_s)
+
+            if attempt > retries:
+                api_metrics.inc("failed")
+                raise PolisAPIUnavailable("Failed after multiple retries") from e
+
+            if breaker.state == "open":
+                if retry_after is None or retry_after > backoff_max_s:
+                    api_metrics.inc("failed")
+                    raise _circuit_open(breaker) from e
+
+                delay = breaker.remaining()
+            else:
+                delay = backoff_delay(attempt, backoff_s, backoff_max_s, backoff_modifier)
+
+            api_metrics.inc("retries")
+            logger.warning(
+                f"API retry {attempt}/{retries}: {e} — sleeping {delay:.1f}s"
+            )
 
-    timeout = httpx.Timeout(settings.http_timeout_s)
+            await asyncio.sleep(delay)
+            continue
 
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        while True:
-            try:
-                events = await _request(client, params)
-                logger.debug(f"Fetched {len(events)} events")
-                return events
+        except PolisAPIError:
+            # the server answered, only the response was unusable
+            breaker.record_success()
+            raise
 
-            except (PolisAPITimeout, PolisAPIUnavailable) as e:
-                attempt += 1
+        except BaseException:
+            # cancelled (kill, shutdown) or crashed before an answer, a
+            # claimed half-open probe must not block every later request
+            breaker.release_probe()
+            raise
 
-                if attempt > retries:
-                    raise PolisAPIUnavailable("Failed after multiple retries") from e
+        breaker.record_success()
 
-                logger.warning(
-                    f"API retry {attempt}/{retries}: {e} — sleeping {backoff_val}s"
-                )
+        if events is not None:
+            logger.debug(f"Fetched {len(events)} events")
 
-                await asyncio.sleep(backoff_val)
-                backoff_val *= min(int(round(backoff_modifier)), backoff_max_s)
+        return events
@@ -0,0 +1,75 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.core.runtime import RuntimeContext
+
+import re
+
+from src.core.logger import get_logger
+from src.ui.log_buffer import log_buffer
+from src.services.backfill import backfill_events, resolve_names, COUNTIES, EVENT_TYPES
+from src.core.registry import command
+
+logger = get_logger(__name__)
+
+@command(
+    name="backfill",
+    usage="backfill [--counties <a,b,...>] [--types <all | a,b,...>] [--concurrency <n>]",
+    description=(
+        "Fetch history the latest-events window misses by querying\n"
+        "every county (and optionally every type) concurrently.\n"
+        "Results are merged into the stored events without duplicates.\n\n"
+        "Options:\n"
+        "    --counties <a,b,...>\n"
+        "        Comma separated counties (default all 21 län).\n\n"
+        "    --types <all | a,b,...>\n"
+        "        Also split each county by event type.\n\n"
+        "    --concurrency <n>\n"
+        "        Requests in flight (POLIS_SCANNER_BACKFILL_CONCURRENCY).\n"
+        "        Request starts are limited by POLIS_SCANNER_HTTP_RATE_PER_S.\n"
+        "Examples:\n"
+        "    backfill\n"
+        "    backfill --counties stockholms län,skåne län --types brand,rån"
+    ),
+    category="data"
+)
+async def cmd_backfill(args, ctx: RuntimeContext=None):
+    text = " ".join(args or [])
+
+    def extract(flag):
+        match = re.search(rf"{flag}\s+(.*?)(?=\s+--\w+|$)", text)
+        return match.group(1).strip() if match else None
+
+    counties = extract("--counties")
+    types = extract("--types")
+    concurrency = extract("--concurrency")
+
+    counties = resolve_names(counties.split(","), COUNTIES) if counties else None
+
+    if types == "all":
+        types = list(EVENT_TYPES)
+    else:
+        types = resolve_names(types.split(","), EVENT_TYPES) if types else None
+
+    kwargs = {}
+    if concurrency:
+        if not concurrency.isdigit():
+            logger.warning("--concurrency must be a number")
+            return
+        kwargs["concurrency"] = int(concurrency)
+
+    logger.info("Backfilling events (fetching)...")
+    result = await backfill_events(counties=counties, event_types=types, **kwargs)
+
+    new_events = result["new_events"]
+
+    for event in new_events[::-1]:
+        log_buffer.write(
+            f"BACKFILL: {event['id']} - {event['name']} - {event['summary']}"
+        )
+
+    if result["failed"]:
+        logger.warning(f"{len(result['failed'])}/{result['partitions']} partitions failed, run backfill again to retry")
+
+    logger.info(f"Fetched {result['fetched']} events, {len(new_events)} new")
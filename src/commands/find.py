@@ -9,19 +9,29 @@ import asyncio
 from src.core.logger import get_logger
 from src.ui.log_buffer import log_buffer
 from src.services.fetcher import load_events
-from src.utils.query import query_events, parse_query
+from src.services.parallel import run_query
+from src.services.paging import PageCursor, query_pager, resolve_page_size, show_page
+from src.utils.index import get_index
+from src.utils.profile import QueryProfile, stage_of, write_profile
+from src.utils.query import parse_boolean_query, parse_count
 from src.core.registry import command
 
 logger = get_logger(__name__)
 
 @command(
     name="find",
-    usage="find <text>",
+    usage="find <text> [--page-size <n>] [--after <id>] [--explain | --profile]",
     description=(
         "Quick search using strict filtering (default behavior).\n"
         "Only events matching all words are returned.\n"
-        "Example:\n"
-        "    find brand stockholm"
+        "Supports OR, NOT, parentheses, \"quoted phrases\" and\n"
+        "field:value terms.\n"
+        "Examples:\n"
+        "    find brand stockholm\n"
+        "    find (brand or rån) not type:sammanfattning\n"
+        "    find brand --page-size 50      → continue with 'next'\n"
+        "    find brand --explain           → plan, per-stage time and rows\n"
+        "    find brand --profile           → same, plus peak memory per stage"
     ),
     category="data"
 )
@@ -30,20 +40,69 @@ async def cmd_find(args, ctx: RuntimeContext=None):
         logger.warning("Please enter text to find")
         return
 
-    text = " ".join(args)
+    # paging options, everything else is query text
+    options = {}
+    words = []
+    args_iter = iter(args)
+    for arg in args_iter:
+        if arg in ("--page-size", "--after"):
+            try:
+                options[arg] = parse_count(arg, next(args_iter, ""))
+            except ValueError as e:
+                logger.warning(str(e))
+                return
+        elif arg in ("--explain", "--profile"):
+            options[arg] = True
+        else:
+            words.append(arg)
+
+    if not words:
+        logger.warning("Please enter text to find")
+        return
+
+    text = " ".join(words)
     logger.debug(f"query text: {text}")
 
+    try:
+        boolean_query = parse_boolean_query(text)
+    except ValueError as e:
+        logger.warning(f"Invalid query: {e}")
+        return
+
+    profile = None
+    if options.get("--explain") or options.get("--profile"):
+        profile = QueryProfile(memory=bool(options.get("--profile")))
+
     logger.info(f"Finding events (stored)...")
-    events = load_events()
+    with stage_of(profile)("load_events") as s:
+        events = load_events()
+        s.rows_out = len(events)
 
     if not events:
         logger.warning("No events saved, run 'refresh' first")
         return
 
-    result = query_events(events=events, text=text)
+    def write(page):
+        for event in page[::-1]:
+            log_buffer.write(f"FIND{f' (score={event['score']})' if event['score'] else ''}: {event['id']} - {event['name']} - {event['summary']}")
 
-    for event in result[::-1]:
-        log_buffer.write(f"FIND{f' (score={event['score']})' if event['score'] else ''}: {event['id']} - {event['name']} - {event['summary']}")
+    page_size = resolve_page_size(options.get("--page-size"), ctx)
+    after = options.get("--after")
 
-    logger.info(f"Returned {len(result)} events")
+    if page_size or after:
+        cursor = PageCursor(
+            name="find",
+            page_size=page_size or len(events),
+            fetch=query_pager(events, get_index(events), query=boolean_query, profile=profile),
+            write=write
+        )
+        await show_page(cursor, ctx, after=after)
+        write_profile(profile)
+        return
 
+    result = await run_query(events=events, query=boolean_query, profile=profile)
+
+    write(result)
+    write_profile(profile)
+
+    logger.info(f"Returned {len(result)} events")
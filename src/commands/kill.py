@@ -13,8 +13,12 @@ logger = get_logger(__name__)
 
 @command(
     name="kill",
-    usage="kill <name>",
-    description="Stop a running task.",
+    usage="kill <job id | name>",
+    description=(
+        "Stop a running or queued task.\n\n"
+        "A job id (see tasks) stops that job,\n"
+        "a command name stops all of its jobs."
+    ),
     category="tasks"
 )
 async def cmd_kill(args, ctx: RuntimeContext=None):
@@ -22,12 +26,15 @@ async def cmd_kill(args, ctx: RuntimeContext=None):
         logger.warning("Please specify command to kill")
         return
 
-    name = args[0]
+    key = args[0]
+    jobs = ctx.scheduler.resolve(key)
 
-    if not ctx.scheduler.has_worker(name):
-        logger.warning(f"No running task named '{name}'")
+    if not jobs:
+        logger.warning(f"No running task named '{key}'")
         return
 
-    logger.info(f"Killing '{name}'...")
-    await ctx.scheduler.stop_and_wait(name)
-    logger.info(f"'{name}' stopped")
+    ids = ", ".join(job.id for job in jobs)
+
+    logger.info(f"Killing {ids}...")
+    await ctx.scheduler.stop_and_wait(key)
+    logger.info(f"{ids} stopped")
@@ -9,17 +9,34 @@ import asyncio
 from src.core.logger import get_logger
 from src.ui.log_buffer import log_buffer
 from src.services.fetcher import load_events
+from src.services.paging import PageCursor, store_pager, resolve_page_size, show_page
+from src.utils.index import get_index
+from src.utils.query import parse_query
 from src.core.registry import command
 
 logger = get_logger(__name__)
 
 @command(
     name="load",
-    usage="load",
-    description="Display events stored in local storage.",
+    usage="load [--page-size <n>] [--after <id>]",
+    description=(
+        "Display events stored in local storage.\n\n"
+        "Options:\n"
+        "    --page-size <n>\n"
+        "        Show n events per page, continue with 'next'.\n"
+        "        (Default in interactive mode: POLIS_SCANNER_PAGE_SIZE, 0 = all)\n\n"
+        "    --after <id>\n"
+        "        Start after the event with this id."
+    ),
     category="data"
 )
 async def cmd_load(args=None, ctx: RuntimeContext=None):
+    try:
+        query = parse_query(args) if args else {}
+    except ValueError as e:
+        logger.warning(str(e))
+        return
+
     logger.info("Loading events (stored)...")
     events = load_events()
 
@@ -27,10 +44,24 @@ async def cmd_load(args=None, ctx: RuntimeContext=None):
         logger.warning("No events saved, run 'refresh' instead")
         return
 
-    for event in events[::-1]:
-        log_buffer.write(
-            f"LOAD: {event['id']} - {event['name']} - {event['summary']}"
+    def write(page):
+        for event in page[::-1]:
+            log_buffer.write(
+                f"LOAD: {event['id']} - {event['name']} - {event['summary']}"
+            )
+
+    page_size = resolve_page_size(query.get("page_size"), ctx)
+
+    if page_size or query.get("after"):
+        cursor = PageCursor(
+            name="load",
+            page_size=page_size or len(events),
+            fetch=store_pager(get_index(events)),
+            write=write
         )
+        await show_page(cursor, ctx, after=query.get("after"))
+        return
 
-    logger.info(f"Returned {len(events)} events")
+    write(events)
 
+    logger.info(f"Returned {len(events)} events")
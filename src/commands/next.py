@@ -0,0 +1,35 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.core.runtime import RuntimeContext
+
+from src.core.logger import get_logger
+from src.services.paging import show_page
+from src.core.registry import command
+
+logger = get_logger(__name__)
+
+@command(
+    name="next",
+    usage="next",
+    description=(
+        "Show the next page of the last paged load, find or search.\n"
+        "Pages are keyed by the last shown event id, so newly\n"
+        "fetched events do not shift them."
+    ),
+    category="data"
+)
+async def cmd_next(args=None, ctx: RuntimeContext=None):
+    cursor = ctx.state.get("page_cursor") if ctx else None
+
+    if not cursor:
+        logger.warning("Nothing to continue, run a paged load, find or search first")
+        return
+
+    if cursor.after is None:
+        logger.info(f"No more results for last '{cursor.name}'")
+        return
+
+    logger.info(f"Next page of '{cursor.name}'...")
+    await show_page(cursor, ctx, after=cursor.after)
@@ -10,23 +10,34 @@ from src.core.config import settings
 from src.core.logger import get_logger
 from src.ui.log_buffer import log_buffer
 from src.utils.query import parse_interval
+from src.utils.adaptive import AdaptiveInterval
 from src.services.fetcher import refresh_events
+from src.services.watch import match_watches
 from src.core.registry import command
 
 logger = get_logger(__name__)
 
 @command(
     name="poll",
-    usage="poll [interval]",
+    usage="poll [interval] | poll auto [max interval]",
     description=(
         "Repeatedly refresh events at a fixed interval.\n\n"
         "Interval format: <int>[s|m|h|d]\n"
         "(seconds, minutes, hours, days).\n"
-        "Example interval values: 30s, 5m, 1h, 2d."
+        "Example interval values: 30s, 5m, 1h, 2d.\n\n"
+        "poll auto adapts the interval to the event arrival rate:\n"
+        "shorter during bursts, longer when quiet, between\n"
+        "POLIS_SCANNER_POLL_INTERVALL_LOWEST_ALLOWED_S and the max\n"
+        "(POLIS_SCANNER_POLL_INTERVAL_MAX_S)."
     ),
     category="tasks"
 )
 async def cmd_poll(args, ctx: RuntimeContext = None):
+    args = list(args or [])
+
+    if args and args[0] == "auto":
+        return await poll_auto(args[1:])
+
     # -----------------------------
     # Resolve interval
     # -----------------------------
@@ -80,18 +91,72 @@ async def cmd_poll(args, ctx: RuntimeContext = None):
 
     try:
         while True:
-            new_events = await refresh_events()
+            await poll_once()
+            await asyncio.sleep(seconds)
+
+    except asyncio.CancelledError:
+        logger.info("Poll cancelled")
+        raise
+
+
+async def poll_auto(args):
+    max_s = settings.poll_interval_max_s
+
+    if args:
+        try:
+            max_s = parse_interval(args)
+        except ValueError:
+            logger.warning("Invalid max interval format from arguments")
+
+    try:
+        initial_s = parse_interval(settings.poll_interval)
+    except ValueError:
+        initial_s = 5 * 60
+
+    interval = AdaptiveInterval(
+        initial_s=initial_s,
+        min_s=settings.poll_interval_lowest_allowed_s,
+        max_s=max_s,
+        target_events=settings.poll_auto_target_events,
+    )
+
+    logger.info(
+        f"Adaptive poll started, interval={interval.interval:.0f}s "
+        f"(range {interval.min_s}s-{interval.max_s}s)"
+    )
+
+    try:
+        while True:
+            new_events = await poll_once()
+            seconds = interval.observe(len(new_events))
 
-            if new_events:
-                for event in new_events:
-                    log_buffer.write(
-                        f"POLL: {event['id']} - "
-                        f"{event['name']} - "
-                        f"{event['summary']}"
-                    )
+            logger.debug(
+                f"Next poll in {seconds:.0f}s "
+                f"(rate {interval.rate * 3600:.1f} events/h)"
+            )
 
             await asyncio.sleep(seconds)
 
     except asyncio.CancelledError:
         logger.info("Poll cancelled")
         raise
+
+
+async def poll_once():
+    new_events = await refresh_events()
+
+    if new_events:
+        for event in new_events:
+            log_buffer.write(
+                f"POLL: {event['id']} - "
+                f"{event['name']} - "
+                f"{event['summary']}"
+            )
+
+        for watch, event in match_watches(new_events):
+            log_buffer.write(
+                f"WATCH: #{watch['id']} {watch['query']} → "
+                f"{event['id']} - {event['name']}"
+            )
+
+    return new_events or []
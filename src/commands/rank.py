@@ -8,8 +8,13 @@ import asyncio
 
 from src.core.logger import get_logger
 from src.ui.log_buffer import log_buffer
-from src.services.fetcher import load_events
-from src.utils.query import query_events, parse_query
+from src.services.fetcher import load_events, DATA_FILE
+from src.services.parallel import run_query
+from src.services.views import get_group_counts
+from src.services.sketches import approx_rank
+from src.services.dedupe import get_superseded
+from src.utils.query import parse_query, parse_boolean_query, rank_groups
+from src.utils.profile import QueryProfile, stage_of, write_profile
 from src.core.registry import command
 
 logger = get_logger(__name__)
@@ -20,8 +25,12 @@ logger = get_logger(__name__)
     description=(
         "Group events by a field and display statistics.\n\n"
         "Options:\n"
-        "    --group <field>\n"
-        "        Field used for grouping.\n\n"
+        "    --group <field>[,<field> ...]\n"
+        "        Field used for grouping. Several comma separated fields\n"
+        "        give a pivot with one row per combination (cell).\n\n"
+        "    --query <expression>\n"
+        "        Boolean query (AND/OR/NOT, parentheses, \"phrases\",\n"
+        "        field:value) applied before grouping.\n\n"
         "    --text <text>\n"
         "        Apply text filtering before grouping.\n\n"
         "    --fields <field1 field2 ...>\n"
@@ -36,9 +45,22 @@ logger = get_logger(__name__)
         "        Limit number of groups returned.\n\n"
         "    --strict <true|false>\n"
         "        true  (default)  → hard filtering only\n"
-        "        false            → enable relevance scoring and ranking\n"
-        "Example:\n"
-        "   rank --group location.name --filters type brand"
+        "        false            → enable relevance scoring and ranking\n\n"
+        "    --dedupe\n"
+        "        Count each near-duplicate report cluster once.\n\n"
+        "    --explain\n"
+        "        Print the chosen plan with per-stage time and rows in/out.\n\n"
+        "    --profile\n"
+        "        Like --explain, plus peak memory allocated per stage\n"
+        "        (tracing makes the query itself slower).\n\n"
+        "    --approx\n"
+        "        Answer from ingest-time sketches with error bounds\n"
+        "        (POLIS_SCANNER_RANK_SKETCH_FIELDS). Only filters on\n"
+        "        type and datetime <year> are supported.\n"
+        "Examples:\n"
+        "   rank --group location.name --filters type brand\n"
+        "   rank --group type,location.name --limit 20\n"
+        "   rank --group location.name --approx --filters type brand datetime 2025 --limit 20"
     ),
     category="data"
 )
@@ -47,37 +69,143 @@ async def cmd_rank(args, ctx: RuntimeContext=None):
         logger.warning("Please provide ranking arguments")
         return
 
-    query = parse_query(args)
+    try:
+        query = parse_query(args)
+    except ValueError as e:
+        logger.warning(str(e))
+        return
+
     logger.debug(f"query: {query}")
 
     if not query.get("group"):
         logger.warning("rank requires --group")
         return
+
+    try:
+        boolean_query = parse_boolean_query(query["query"])
+    except ValueError as e:
+        logger.warning(f"Invalid --query: {e}")
+        return
         
+    if query["approx"]:
+        if await rank_approx(query):
+            return
+
+        logger.warning("Falling back to exact ranking")
+
+    profile = QueryProfile(memory=query["profile"]) if query["explain"] else None
+    stage = stage_of(profile)
+
     logger.info(f"Ranking events (stored)...")
-    events = load_events()
 
-    if not events:
-        logger.warning("No events saved, run 'refresh' first")
-        return
+    # Unfiltered ranking can be answered from the materialized group counts
+    counts = None
+    if not query["text"] and not query["filters"] and not boolean_query and not query["dedupe"]:
+        with stage("materialized view lookup") as s:
+            counts = get_group_counts(query["group"], DATA_FILE)
+            s.rows_out = len(counts) if counts is not None else None
 
-    result = query_events(
-        events=events,
-        text=query["text"],
-        fields=query["fields"],
-        filters=query["filters"],
-        group_by=query["group"],
-        sort=query["sort"],
-        limit=query["limit"],
-        strict=query["strict"]
-    )
+    if counts is not None:
+        logger.debug(f"Using materialized group view for '{query['group']}'")
+
+        if profile:
+            profile.note(f"materialized group view for {query['group']}")
+
+        with stage("sort + limit groups", len(counts)) as s:
+            result = rank_groups(
+                {k: {"count": c, "score_sum": 0} for k, c in counts.items()},
+                sort=query["sort"],
+                limit=query["limit"]
+            )
+            s.rows_out = len(result)
+
+    else:
+        with stage("load_events") as s:
+            events = load_events()
+            s.rows_out = len(events)
+
+        if not events:
+            logger.warning("No events saved, run 'refresh' first")
+            return
+
+        exclude_ids = None
+        if query["dedupe"]:
+            with stage("near-duplicate clusters") as s:
+                exclude_ids = get_superseded(DATA_FILE)
+                s.rows_out = len(exclude_ids)
+
+        result = await run_query(
+            events=events,
+            text=query["text"],
+            fields=query["fields"],
+            filters=query["filters"],
+            group_by=query["group"],
+            sort=query["sort"],
+            limit=query["limit"],
+            strict=query["strict"],
+            query=boolean_query,
+            exclude_ids=exclude_ids,
+            profile=profile
+        )
 
     if not result: 
         logger.info("No ranking results")
+        write_profile(profile)
         return
 
     for row in result[::-1]:
-        log_buffer.write(f"RANK: {row['group']} (count={row['count']} / avg_score={row['avg_score']})")
+        group = " × ".join(row["group"]) if isinstance(row["group"], tuple) else row["group"]
+        log_buffer.write(f"RANK: {group} (count={row['count']} / avg_score={row['avg_score']})")
+
+    write_profile(profile)
         
     logger.info(f"Returned {len(result)} ranked groups")
 
+
+
+async def rank_approx(query: dict) -> bool:
+    """Rank from sketches, returns False if the query can not be answered approximately"""
+
+    filters = query["filters"] or {}
+    unsupported = set(filters) - {"type", "datetime"}
+    year = filters.get("datetime")
+
+    if query["text"] or query["query"] or query["dedupe"] or unsupported:
+        logger.warning("--approx supports only type and datetime <year> filters (no --dedupe)")
+        return False
+
+    if year and not (len(year) == 4 and year.isdigit()):
+        logger.warning("--approx supports datetime filter by year only (e.g. 2025)")
+        return False
+
+    logger.info(f"Ranking events (approximate)...")
+    answer = approx_rank(
+        query["group"],
+        DATA_FILE,
+        event_type=filters.get("type"),
+        year=year,
+        limit=query["limit"]
+    )
+
+    if answer is None:
+        logger.warning(f"No sketches kept for '{query['group']}'")
+        return False
+
+    if not answer["rows"]:
+        logger.info("No ranking results")
+        return True
+
+    for row in answer["rows"][::-1]:
+        log_buffer.write(
+            f"RANK~: {row['group']} (count≈{row['count']}, "
+            f"true count {row['min_count']}..{row['count']})"
+        )
+
+    log_buffer.write(
+        f"RANK~: {answer['n']} events, distinct {query['group']} ≈ {answer['distinct']} "
+        f"(±{answer['distinct_error']:.1%} std. error), "
+        f"count overestimate ≤ {answer['count_error']} with 98% confidence"
+    )
+
+    logger.info(f"Returned {len(answer['rows'])} approximate groups")
+    return True
@@ -9,6 +9,7 @@ import asyncio
 from src.core.logger import get_logger
 from src.ui.log_buffer import log_buffer
 from src.services.fetcher import refresh_events
+from src.services.watch import match_watches
 from src.core.registry import command
 
 logger = get_logger(__name__)
@@ -32,5 +33,8 @@ async def cmd_refresh(args=None, ctx: RuntimeContext=None):
             f"REFRESH: {event['id']} - {event['name']} - {event['summary']}"
         )
 
+    for watch, event in match_watches(events):
+        log_buffer.write(f"WATCH: #{watch['id']} {watch['query']} → {event['id']} - {event['name']}")
+
     logger.info(f"Returned {len(events)} events")
 
@@ -0,0 +1,45 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.core.runtime import RuntimeContext
+
+from src.core.logger import get_logger
+from src.ui.log_buffer import log_buffer
+from src.services.replay import replay_archive
+from src.core.registry import command
+
+logger = get_logger(__name__)
+
+@command(
+    name="replay",
+    usage="replay [--rebuild]",
+    description=(
+        "Ingest archived raw API responses again, oldest first,\n"
+        "at full speed (archiving: POLIS_SCANNER_HTTP_ARCHIVE=true).\n\n"
+        "Options:\n"
+        "    --rebuild\n"
+        "        Start from an empty store, the current one is\n"
+        "        kept as events.json.bak."
+    ),
+    category="data"
+)
+async def cmd_replay(args=None, ctx: RuntimeContext=None):
+    rebuild = "--rebuild" in (args or [])
+
+    logger.info("Replaying archived responses...")
+    stats = await replay_archive(rebuild=rebuild)
+
+    if not stats["responses"]:
+        logger.warning("No archived responses, enable POLIS_SCANNER_HTTP_ARCHIVE first")
+        return
+
+    seconds = max(stats["seconds"], 1e-9)
+    log_buffer.write(
+        f"REPLAY: {stats['responses']} responses, {stats['events']} events, "
+        f"{stats['new']} new in {stats['seconds']:.2f}s "
+        f"({stats['responses'] / seconds:.1f} responses/s, {stats['events'] / seconds:.0f} events/s)"
+    )
+
+    if stats["skipped"]:
+        logger.warning(f"Skipped {stats['skipped']} unreadable responses")
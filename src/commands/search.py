@@ -8,23 +8,34 @@ import asyncio
 
 from src.core.logger import get_logger
 from src.ui.log_buffer import log_buffer
-from src.services.fetcher import load_events
-from src.utils.query import query_events, parse_query
+from src.services.fetcher import load_events, DATA_FILE
+from src.services.dedupe import get_superseded
+from src.services.parallel import run_query
+from src.services.paging import PageCursor, list_pager, query_pager, resolve_page_size, show_page
+from src.utils.index import get_index
+from src.utils.profile import QueryProfile, stage_of, write_profile
+from src.utils.query import parse_query, parse_boolean_query
 from src.core.registry import command
 
 logger = get_logger(__name__)
 
+FACET_ROWS = 10 # values shown per facet
+
 @command(
     name="search",
     usage="search [options]",
     description=(
         "Advanced search with filtering, sorting and limit.\n\n"
         "Options:\n"
+        "    --query <expression>\n"
+        "        Boolean query: AND (implicit), OR, NOT, parentheses,\n"
+        "        \"quoted phrases\" and field:value terms.\n"
+        "        Example: (brand or rån) not \"sammanfattning natt\" location.name:malmö\n\n"
         "    --text <text>\n"
         "        Match all words in the specified fields.\n\n"
         "    --fields <field1 field2 ...>\n"
         "        Fields used for text matching.\n"
-        "        (Default all): name, summary, type, location.name.\n\n"
+        "        (Default all): name, summary, type, location.name, body.\n\n"
         "    --filters <field1 value1 field2 value2 ...>\n"
         "        Exact field-value filtering.\n\n"
         "    --sort <field1 field2 ...>\n"
@@ -35,9 +46,28 @@ logger = get_logger(__name__)
         "        Limit the number of returned results.\n\n"
         "    --strict <true|false>\n"
         "        true  (default)  → hard filtering only\n"
-        "        false            → enable relevance scoring and ranking\n"
+        "        false            → enable relevance scoring and ranking\n\n"
+        "    --page-size <n>\n"
+        "        Show n events per page, continue with 'next'.\n"
+        "        (Default in interactive mode: POLIS_SCANNER_PAGE_SIZE, 0 = all)\n\n"
+        "    --after <id>\n"
+        "        Start after the event with this id.\n\n"
+        "    --dedupe\n"
+        "        Hide events superseded by a newer near-duplicate report\n"
+        "        (POLIS_SCANNER_DEDUPE_THRESHOLD, MinHash similarity) of\n"
+        "        the same type and location, reported within\n"
+        "        POLIS_SCANNER_DEDUPE_WINDOW_H hours.\n\n"
+        "    --facets <field1 field2 ...>\n"
+        "        Also count matches per value of these fields, in the\n"
+        "        same pass as the results (top values are shown).\n\n"
+        "    --explain\n"
+        "        Print the chosen plan with per-stage time and rows in/out.\n\n"
+        "    --profile\n"
+        "        Like --explain, plus peak memory allocated per stage\n"
+        "        (tracing makes the query itself slower).\n"
         "Example:\n"
         "   search --text polis --filters type brand location.name stockholm --limit 3\n"
+        "   search --text brand --facets type location.name --limit 20\n"
     ),
     category="data"
 )
@@ -46,17 +76,105 @@ async def cmd_search(args, ctx: RuntimeContext=None):
         logger.warning("Please enter search argument")
         return
 
-    query = parse_query(args)
+    try:
+        query = parse_query(args)
+    except ValueError as e:
+        logger.warning(str(e))
+        return
+
     logger.debug(f"query: {query}")
+
+    try:
+        boolean_query = parse_boolean_query(query["query"])
+    except ValueError as e:
+        logger.warning(f"Invalid --query: {e}")
+        return
         
+    profile = QueryProfile(memory=query["profile"]) if query["explain"] else None
+
     logger.info(f"Searching in events (stored)...")
-    events = load_events()
+    with stage_of(profile)("load_events") as s:
+        events = load_events()
+        s.rows_out = len(events)
 
     if not events:
         logger.warning("No events saved, run 'refresh' first")
         return
 
-    result = query_events(
+    exclude_ids = None
+    if query["dedupe"]:
+        with stage_of(profile)("near-duplicate clusters") as s:
+            exclude_ids = get_superseded(DATA_FILE)
+            s.rows_out = len(exclude_ids)
+
+    def write(page):
+        for event in page[::-1]:
+            log_buffer.write(f"SEARCH{f' (score={event['score']})' if not query['strict'] else ''}: {event['id']} - {event['name']} - {event['summary']}")
+
+    def write_facets(facet_counts):
+        for field, table in facet_counts.items():
+            rows = sorted(table.items(), key=lambda kv: (-kv[1], kv[0]))[:FACET_ROWS]
+            values = ", ".join(f"{value}={count}" for value, count in rows)
+            log_buffer.write(f"FACET: {field} ({len(table)} values) - {values}")
+
+    page_size = resolve_page_size(query["page_size"], ctx)
+
+    if query["facets"]:
+        result, facet_counts = await run_query(
+            events=events,
+            text=query["text"],
+            fields=query["fields"],
+            filters=query["filters"],
+            sort=query["sort"],
+            limit=query["limit"],
+            strict=query["strict"],
+            query=boolean_query,
+            facets=query["facets"],
+            exclude_ids=exclude_ids,
+            profile=profile
+        )
+
+        if page_size or query["after"]:
+            cursor = PageCursor(
+                name="search",
+                page_size=page_size or len(result),
+                fetch=list_pager(result),
+                write=write
+            )
+            await show_page(cursor, ctx, after=query["after"])
+
+        else:
+            write(result)
+            logger.info(f"Returned {len(result)} events")
+
+        write_facets(facet_counts)
+        write_profile(profile)
+        return
+
+    if page_size or query["after"]:
+        cursor = PageCursor(
+            name="search",
+            page_size=page_size or len(events),
+            fetch=query_pager(
+                events,
+                get_index(events),
+                text=query["text"],
+                fields=query["fields"],
+                filters=query["filters"],
+                sort=query["sort"],
+                limit=query["limit"],
+                strict=query["strict"],
+                query=boolean_query,
+                exclude_ids=exclude_ids,
+                profile=profile
+            ),
+            write=write
+        )
+        await show_page(cursor, ctx, after=query["after"])
+        write_profile(profile)
+        return
+
+    result = await run_query(
         events=events,
         text=query["text"],
         fields=query["fields"],
@@ -64,10 +182,13 @@ async def cmd_search(args, ctx: RuntimeContext=None):
         group_by=None, # not used by this command
         sort=query["sort"],
         limit=query["limit"],
-        strict=query["strict"]
+        strict=query["strict"],
+        query=boolean_query,
+        exclude_ids=exclude_ids,
+        profile=profile
     )
 
-    for event in result[::-1]:
-        log_buffer.write(f"SEARCH{f' (score={event['score']})' if not query['strict'] else ''}: {event['id']} - {event['name']} - {event['summary']}")
+    write(result)
+    write_profile(profile)
 
     logger.info(f"Returned {len(result)} events")
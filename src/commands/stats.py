@@ -0,0 +1,99 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.core.runtime import RuntimeContext
+
+from datetime import datetime
+
+from src.core.logger import get_logger
+from src.ui.log_buffer import log_buffer
+from src.api.metrics import api_metrics
+from src.api.decode import decode_stats
+from src.core.registry import command
+
+logger = get_logger(__name__)
+
+# histogram -> (label, unit, scale)
+HISTOGRAMS = {
+    "latency_s": ("total", "ms", 1000),
+    "ttfb_s": ("ttfb", "ms", 1000),
+    "connect_s": ("connect", "ms", 1000),
+    "response_bytes": ("size", "KB", 1 / 1024),
+    "events": ("events", "", 1),
+}
+
+PERCENTILES = (50, 90, 99)
+
+
+@command(
+    name="stats",
+    usage="stats api [--reset]",
+    description=(
+        "Show Polis API client telemetry for this session:\n"
+        "request latency (total, time to first byte, connect)\n"
+        "and response size percentiles, status codes, retries,\n"
+        "cache hits and dropped malformed events.\n\n"
+        "Options:\n"
+        "    --reset\n"
+        "        Clear the collected metrics."
+    ),
+    category="other"
+)
+async def cmd_stats(args=None, ctx: RuntimeContext=None):
+    args = args or []
+
+    if not args or args[0] != "api":
+        logger.warning("Usage: stats api [--reset]")
+        return
+
+    if "--reset" in args:
+        api_metrics.reset()
+        decode_stats.clear()
+        logger.info("API metrics reset")
+        return
+
+    counters = api_metrics.counters
+    since = datetime.fromtimestamp(api_metrics.started).strftime("%Y-%m-%d %H:%M:%S")
+
+    if not counters["requests"]:
+        logger.info(f"No API requests since {since}")
+        return
+
+    statuses = sorted(
+        (name.split(":", 1)[1], count) for name, count in counters.items() if name.startswith("status:")
+    )
+
+    log_buffer.write(f"STATS: {counters['requests']} API requests since {since}")
+    log_buffer.write("STATS: status " + ", ".join(f"{code}={count}" for code, count in statuses))
+
+    header = "".join(f"{f'p{p}':>10}" for p in PERCENTILES)
+    log_buffer.write(f"STATS: {'':<12}{header}{'max':>10}{'n':>8}")
+
+    for name, (label, unit, scale) in HISTOGRAMS.items():
+        histogram = api_metrics.histograms.get(name)
+        if histogram is None or not histogram.values:
+            continue
+
+        values = [histogram.percentile(p) for p in PERCENTILES] + [max(histogram.values)]
+        cells = "".join(f"{v * scale:>10.1f}" for v in values)
+        label = f"{label} {unit}".strip()
+
+        log_buffer.write(f"STATS: {label:<12}{cells}{histogram.count:>8}")
+
+    other = [
+        ("retries", counters["retries"]),
+        ("failed", counters["failed"]),
+        ("circuit open", counters["circuit_open"]),
+        ("timeouts", counters["errors:timeout"]),
+        ("network errors", counters["errors:network"]),
+        ("unchanged", counters["unchanged"]),
+        ("connections", counters["connections_opened"]),
+        ("cache hit/miss", f"{counters['cache:hit']}/{counters['cache:miss']}"),
+        ("dropped events", decode_stats["dropped"]),
+        ("pages fetched/cached/failed/skipped", (
+            f"{counters['pages:fetched']}/{counters['pages:cached']}/"
+            f"{counters['pages:failed']}/{counters['pages:skipped']}"
+        )),
+    ]
+    log_buffer.write("STATS: " + ", ".join(f"{label}={value}" for label, value in other))
@@ -5,6 +5,7 @@ if TYPE_CHECKING:
     from src.core.runtime import RuntimeContext
 
 import asyncio
+import time
 from src.core.registry import command
 from src.core.logger import get_logger
 from src.ui.log_buffer import log_buffer
@@ -14,7 +15,10 @@ logger = get_logger(__name__)
 @command(
     name="tasks",
     usage="tasks",
-    description="List running background tasks.",
+    description=(
+        "List running and queued background tasks\n"
+        "with their job ids (for kill)."
+    ),
     category="tasks"
 )
 async def cmd_tasks(args=None, ctx: RuntimeContext = None):
@@ -22,28 +26,26 @@ async def cmd_tasks(args=None, ctx: RuntimeContext = None):
         logger.error("Scheduler not available")
         return
 
-    workers = ctx.scheduler.list_workers()
-    result = workers
-    
-    if "tasks" in [name for name in result.keys()]:
-        result.pop("tasks")
+    current = asyncio.current_task()
+    result = [
+        job for job in ctx.scheduler.list_jobs()
+        if job.task is not current
+    ]
 
     if not result:
         logger.info("No tasks registered")
         return
-    
+
+    now = time.time()
+
     logger.info("Listing tasks...")
-    for name, task in result.items():
-        status = (
-            "running"
-            if not task.done()
-            else "cancelled"
-            if task.cancelled()
-            else "done"
-        )
+    for job in result:
+        since = job.started if job.started is not None else job.created
 
         log_buffer.write(
-            f"TASK: {name} - status={status}"
+            f"TASK: {job.id} - status={job.status}, "
+            f"for={now - since:.0f}s, "
+            f"limit={ctx.scheduler.limit(job.name) or 'none'}"
         )
 
     logger.info(f"Total tasks: {len(result)}")
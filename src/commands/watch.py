@@ -0,0 +1,72 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.core.runtime import RuntimeContext
+
+from src.core.logger import get_logger
+from src.ui.log_buffer import log_buffer
+from src.services.watch import add_watch, load_watches, remove_watch
+from src.core.registry import command
+
+logger = get_logger(__name__)
+
+@command(
+    name="watch",
+    usage="watch add <query> | list | remove <id>",
+    description=(
+        "Standing queries checked against newly fetched events.\n"
+        "Matches are reported by refresh and poll as WATCH lines.\n\n"
+        "Options:\n"
+        "    add <query>  → Save a boolean query (same syntax as find)\n"
+        "    list         → Show saved watches\n"
+        "    remove <id>  → Delete a watch\n"
+        "Examples:\n"
+        "    watch add brand location.name:stockholm\n"
+        "    watch add (rån or stöld) not type:sammanfattning\n"
+        "    watch remove 2"
+    ),
+    category="data"
+)
+async def cmd_watch(args, ctx: RuntimeContext=None):
+    action = args[0] if args else "list"
+
+    if action == "add":
+        query = " ".join(args[1:])
+
+        try:
+            watch = add_watch(query)
+
+        except ValueError as e:
+            logger.warning(f"Invalid watch query: {e}")
+            return
+
+        logger.info(f"Added watch #{watch['id']}: {watch['query']}")
+        return
+
+    if action in ("remove", "rm"):
+        if len(args) < 2 or not args[1].isdigit():
+            logger.warning("Please specify watch id to remove")
+            return
+
+        if not remove_watch(int(args[1])):
+            logger.warning(f"No watch with id {args[1]}")
+            return
+
+        logger.info(f"Removed watch #{args[1]}")
+        return
+
+    if action != "list":
+        logger.warning(f"Unknown watch action '{action}', use add, list or remove")
+        return
+
+    watches = load_watches()
+
+    if not watches:
+        logger.info("No watches saved")
+        return
+
+    for watch in watches:
+        log_buffer.write(f"WATCH: #{watch['id']} - {watch['query']}")
+
+    logger.info(f"Total watches: {len(watches)}")
@@ -1,5 +1,6 @@
 from pathlib import Path
 from dataclasses import dataclass
+from urllib.parse import urlsplit
 import os
 from dotenv import load_dotenv
 
@@ -56,15 +57,40 @@ class Settings:
     poll_interval: str
     poll_interval_lowest_allowed_s: int
     poll_interval_lowest_recomended_s: int
+    poll_interval_max_s: int
+    poll_auto_target_events: float
 
     http_timeout_s: int
     http_backoff_s: int
     http_backoff_max_s: int
     http_backoff_modifier: float
     http_max_retries: int
+    http_max_connections: int
+    http_max_keepalive: int
+    http_keepalive_expiry_s: int
+    http_rate_per_s: float
+    http_burst: int
+    http_breaker_failures: int
+    http_breaker_reset_s: int
+    http_cache_ttl_s: float
+    http_archive: bool
+    enrich_pages: bool
+    enrich_concurrency: int
+    enrich_max_pages: int
+    backfill_concurrency: int
 
     shutdown_grace_period: int
     command_history_len: int
+    job_limits: dict[str, int]
+    job_limit_default: int
+
+    rank_materialized_groups: tuple[str, ...]
+    rank_sketch_fields: tuple[str, ...]
+    query_workers: int
+    query_parallel_min_events: int
+    page_size: int
+    dedupe_threshold: float
+    dedupe_window_h: float
     
     default_theme: str
 
@@ -116,6 +142,19 @@ def load_settings(force_reload: bool = False) -> Settings:
         or (data_dir / "cache")
     )
 
+    polis_event_url = os.environ.get(
+        "POLIS_SCANNER_POLIS_EVENT_URL",
+        "https://polisen.se/api/events"
+    )
+
+    # event page urls are site-relative; unless set, they resolve against
+    # the host serving the API (so a local mock serves the pages too)
+    event_url = urlsplit(polis_event_url)
+    polis_base_url = os.environ.get(
+        "POLIS_SCANNER_POLIS_BASE_URL",
+        f"{event_url.scheme}://{event_url.netloc}"
+    )
+
     settings = Settings(
         env_path=env_path,
         app_name=os.environ.get("POLIS_SCANNER_NAME") or "polis-scanner",
@@ -125,14 +164,8 @@ def load_settings(force_reload: bool = False) -> Settings:
         data_dir=data_dir,
         logs_dir=logs_dir,
         cache_dir=cache_dir,
-        polis_base_url=os.environ.get(
-            "POLIS_SCANNER_POLIS_BASE_URL",
-            "https://polisen.se"
-        ),
-        polis_event_url=os.environ.get(
-            "POLIS_SCANNER_POLIS_EVENT_URL",
-            "https://polisen.se/api/events"
-        ),
+        polis_base_url=polis_base_url,
+        polis_event_url=polis_event_url,
         poll_interval=os.environ.get(
             "POLIS_SCANNER_POLL_INTERVAL",
             "5m"
@@ -149,6 +182,12 @@ def load_settings(force_reload: bool = False) -> Settings:
                 60
             )
         ),
+        poll_interval_max_s=int(
+            os.environ.get("POLIS_SCANNER_POLL_INTERVAL_MAX_S", 30 * 60)
+        ),
+        poll_auto_target_events=float(
+            os.environ.get("POLIS_SCANNER_POLL_AUTO_TARGET_EVENTS", 1)
+        ),
         http_timeout_s=int(
             os.environ.get("POLIS_SCANNER_HTTP_TIMEOUT_S", 10)
         ),
@@ -167,6 +206,41 @@ def load_settings(force_reload: bool = False) -> Settings:
         http_max_retries=int(
             os.environ.get("POLIS_SCANNER_HTTP_RETRIES", 3)
         ),
+        http_max_connections=int(
+            os.environ.get("POLIS_SCANNER_HTTP_MAX_CONNECTIONS", 10)
+        ),
+        http_max_keepalive=int(
+            os.environ.get("POLIS_SCANNER_HTTP_MAX_KEEPALIVE", 5)
+        ),
+        http_keepalive_expiry_s=int(
+            os.environ.get("POLIS_SCANNER_HTTP_KEEPALIVE_EXPIRY_S", 30)
+        ),
+        http_rate_per_s=float(
+            os.environ.get("POLIS_SCANNER_HTTP_RATE_PER_S", 2)
+        ),
+        http_burst=int(
+            os.environ.get("POLIS_SCANNER_HTTP_BURST", 4)
+        ),
+        http_breaker_failures=int(
+            os.environ.get("POLIS_SCANNER_HTTP_BREAKER_FAILURES", 5)
+        ),
+        http_breaker_reset_s=int(
+            os.environ.get("POLIS_SCANNER_HTTP_BREAKER_RESET_S", 60)
+        ),
+        http_cache_ttl_s=float(
+            os.environ.get("POLIS_SCANNER_HTTP_CACHE_TTL_S", 0)
+        ),
+        http_archive=os.environ.get("POLIS_SCANNER_HTTP_ARCHIVE", "false").lower() == "true",
+        enrich_pages=os.environ.get("POLIS_SCANNER_ENRICH_PAGES", "false").lower() == "true",
+        enrich_concurrency=int(
+            os.environ.get("POLIS_SCANNER_ENRICH_CONCURRENCY", 4)
+        ),
+        enrich_max_pages=int(
+            os.environ.get("POLIS_SCANNER_ENRICH_MAX_PAGES", 50)
+        ),
+        backfill_concurrency=int(
+            os.environ.get("POLIS_SCANNER_BACKFILL_CONCURRENCY", 4)
+        ),
         shutdown_grace_period=int(
             os.environ.get(
                 "POLIS_SCANNER_SHUTDOWN_GRACE_PERIOD",
@@ -179,6 +253,69 @@ def load_settings(force_reload: bool = False) -> Settings:
                 1000
             )
         ),
+        job_limits={
+            name.strip().lower(): int(limit)
+            for name, _, limit in (
+                f.partition(":")
+                for f in os.environ.get(
+                    "POLIS_SCANNER_JOB_LIMITS",
+                    "refresh:1,backfill:1,replay:1,load:1,clear:1,exit:1,quit:1"
+                ).split(",")
+                if f.strip()
+            )
+        },
+        job_limit_default=int(
+            os.environ.get(
+                "POLIS_SCANNER_JOB_LIMIT_DEFAULT",
+                4
+            )
+        ),
+        rank_materialized_groups=tuple(
+            f.strip().lower()
+            for f in os.environ.get(
+                "POLIS_SCANNER_RANK_MATERIALIZED_GROUPS",
+                "type,location.name"
+            ).split(",")
+            if f.strip()
+        ),
+        rank_sketch_fields=tuple(
+            f.strip().lower()
+            for f in os.environ.get(
+                "POLIS_SCANNER_RANK_SKETCH_FIELDS",
+                "location.name,type"
+            ).split(",")
+            if f.strip()
+        ),
+        query_workers=int(
+            os.environ.get(
+                "POLIS_SCANNER_QUERY_WORKERS",
+                1
+            )
+        ),
+        query_parallel_min_events=int(
+            os.environ.get(
+                "POLIS_SCANNER_QUERY_PARALLEL_MIN_EVENTS",
+                20000
+            )
+        ),
+        page_size=int(
+            os.environ.get(
+                "POLIS_SCANNER_PAGE_SIZE",
+                200
+            )
+        ),
+        dedupe_threshold=float(
+            os.environ.get(
+                "POLIS_SCANNER_DEDUPE_THRESHOLD",
+                0.7
+            )
+        ),
+        dedupe_window_h=float(
+            os.environ.get(
+                "POLIS_SCANNER_DEDUPE_WINDOW_H",
+                6
+            )
+        ),
         default_theme=(
             os.environ.get(
                 "POLIS_SCANNER_DEFAULT_THEME",
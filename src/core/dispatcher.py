@@ -8,13 +8,15 @@ import asyncio
 
 from src.utils.query import parse_command
 from src.core.logger import get_logger
-from src.core.scheduler import WorkerAlreadyRunningError
 from src.core.lifecycle import graceful_shutdown
 from src.api.polis import PolisAPIError
 
 from src.commands.refresh import cmd_refresh
+from src.commands.backfill import cmd_backfill
+from src.commands.replay import cmd_replay
 from src.commands.load import cmd_load
 from src.commands.more import cmd_more
+from src.commands.next import cmd_next
 from src.commands.help import cmd_help
 from src.commands.find import cmd_find
 from src.commands.search import cmd_search
@@ -23,6 +25,8 @@ from src.commands.clear import cmd_clear
 from src.commands.poll import cmd_poll
 from src.commands.kill import cmd_kill
 from src.commands.tasks import cmd_tasks
+from src.commands.watch import cmd_watch
+from src.commands.stats import cmd_stats
 from src.commands.exit import cmd_exit
 
 from src.core.registry import get_commands
@@ -41,8 +45,11 @@ async def handle_command(text, ctx: RuntimeContext=None):
 
     command_map = {
         "refresh": cmd_refresh,
+        "backfill": cmd_backfill,
+        "replay": cmd_replay,
         "load": cmd_load,
         "more": cmd_more,
+        "next": cmd_next,
         "help": cmd_help,
         "find": cmd_find,
         "search": cmd_search,
@@ -51,6 +58,8 @@ async def handle_command(text, ctx: RuntimeContext=None):
         "poll": cmd_poll,
         "kill": cmd_kill,
         "tasks": cmd_tasks,
+        "watch": cmd_watch,
+        "stats": cmd_stats,
         "exit": cmd_exit,
         "quit": cmd_exit
     }
@@ -70,14 +79,12 @@ async def handle_command(text, ctx: RuntimeContext=None):
                 # Special case for shutdown to evade recursion loop error
                 await handler(args=args, ctx=ctx)
             
-            ctx.scheduler.spawn(
+            job = ctx.scheduler.spawn(
                 cmd,
                 lambda: handler(args=args, ctx=ctx)
             )
+            logger.debug(f"Spawned job '{job.id}'")
 
-        except WorkerAlreadyRunningError:
-            logger.warning(f"Command '{cmd}' is already running")
-        
         except PolisAPIError:
             logger.error("Polis API error while fetching")
             
@@ -65,6 +65,20 @@ async def graceful_shutdown(
                 return_exceptions=True
             )
 
+    # --------------------------------------------------
+    # Stop query worker processes
+    # --------------------------------------------------
+
+    from src.services.parallel import shutdown_executor
+    shutdown_executor()
+
+    # --------------------------------------------------
+    # Close pooled API connections
+    # --------------------------------------------------
+
+    from src.api.polis import close_client
+    await close_client()
+
     # --------------------------------------------------
     # if GUI version, stop loop
     # --------------------------------------------------
@@ -1,59 +1,147 @@
 import asyncio
+import time
+from collections import Counter
+from dataclasses import dataclass
 from typing import Callable, Coroutine
 
-class WorkerAlreadyRunningError(RuntimeError):
-    def __init__(self, name: str):
-        super().__init__(f"Worker '{name}' already running")
-        self.name = name
+from src.core.config import settings
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# ==========================================================
+# JOBS
+# ==========================================================
+#
+# Every spawn is a job with its own id (<name>-<n>), so several instances
+# of a command can run side by side. Commands listed in
+# POLIS_SCANNER_JOB_LIMITS (others use POLIS_SCANNER_JOB_LIMIT_DEFAULT)
+# run at most that many at a time; further jobs are queued on a per-name
+# semaphore and start in order as slots free up. A limit <= 0 means
+# unlimited. Finished jobs are dropped.
+
+@dataclass(slots=True)
+class Job:
+    id: str
+    name: str
+    task: asyncio.Task | None = None
+    created: float = 0.0
+    started: float | None = None  # None while queued
+
+    @property
+    def status(self) -> str:
+        if not self.task.done():
+            return "running" if self.started is not None else "queued"
+
+        if self.task.cancelled():
+            return "cancelled"
+
+        return "failed" if self.task.exception() else "done"
+
 
 class Scheduler:
-    def __init__(self):
-        self._workers: dict[str, asyncio.Task] = {}
-    
+    def __init__(self, limits: dict[str, int] | None = None, default_limit: int | None = None):
+        self.limits = dict(settings.job_limits if limits is None else limits)
+        self.default_limit = settings.job_limit_default if default_limit is None else default_limit
+
+        self._jobs: dict[str, Job] = {}
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._seq = Counter()
+
+    def limit(self, name: str) -> int:
+        return self.limits.get(name, self.default_limit)
+
     def running_tasks(self) -> list[asyncio.Task]:
-        return [t for t in self._workers.values() if not t.done()]
-        
+        return [j.task for j in self._jobs.values() if not j.task.done()]
+
     def list_workers(self) -> dict[str, asyncio.Task]:
-        return dict(self._workers)
-        
+        return {job_id: job.task for job_id, job in self._jobs.items()}
+
+    def list_jobs(self) -> list[Job]:
+        return list(self._jobs.values())
+
     def active_workers(self) -> dict[str, asyncio.Task]:
         return {
-            name: task
-            for name, task in self._workers.items()
-            if not task.done()
+            job_id: job.task
+            for job_id, job in self._jobs.items()
+            if not job.task.done()
         }
 
-    def spawn(self, name: str, coro_factory: Callable[[], Coroutine]):
-        if name in self._workers and not self._workers[name].done():
-            raise WorkerAlreadyRunningError(name)
+    # -----------------------------
+    # Spawning
+    # -----------------------------
+    def _slot(self, name: str) -> asyncio.Semaphore | None:
+        limit = self.limit(name)
+        if limit <= 0:
+            return None
+
+        if name not in self._slots:
+            self._slots[name] = asyncio.Semaphore(limit)
+
+        return self._slots[name]
+
+    async def _run(self, job: Job, slot: asyncio.Semaphore | None, coro_factory: Callable[[], Coroutine]):
+        if slot is None:
+            job.started = time.time()
+            return await coro_factory()
+
+        async with slot:
+            job.started = time.time()
+            return await coro_factory()
 
-        task = asyncio.create_task(coro_factory())
-        self._workers[name] = task
+    def spawn(self, name: str, coro_factory: Callable[[], Coroutine]) -> Job:
+        self._seq[name] += 1
+        job = Job(id=f"{name}-{self._seq[name]}", name=name, created=time.time())
+
+        slot = self._slot(name)
+        if slot is not None and slot.locked():
+            logger.info(
+                f"Job '{job.id}' queued, {self.limit(name)} '{name}' "
+                f"job(s) already running"
+            )
+
+        job.task = asyncio.create_task(self._run(job, slot, coro_factory))
+        self._jobs[job.id] = job
 
         def _cleanup(_):
-            self._workers.pop(name, None)
+            self._jobs.pop(job.id, None)
 
-        task.add_done_callback(_cleanup)
-        return task
+        job.task.add_done_callback(_cleanup)
+        return job
 
-    def has_worker(self, name: str) -> bool:
-        task = self._workers.get(name)
-        return task is not None and not task.done()
+    # -----------------------------
+    # Lookup / stopping
+    # -----------------------------
+    def resolve(self, key: str) -> list[Job]:
+        """Unfinished jobs matching a job id, or every instance of a command name"""
 
-    def stop_worker(self, name: str):
-        task = self._workers.get(name)
-        if task and not task.done():
-            task.cancel()
+        job = self._jobs.get(key)
+        jobs = [job] if job else [j for j in self._jobs.values() if j.name == key]
+
+        # never the job doing the lookup (e.g. 'kill kill')
+        current = asyncio.current_task()
+        return [j for j in jobs if not j.task.done() and j.task is not current]
+
+    def has_worker(self, key: str) -> bool:
+        return bool(self.resolve(key))
+
+    def stop_worker(self, key: str):
+        for job in self.resolve(key):
+            job.task.cancel()
 
-    async def stop_and_wait(self, name: str, timeout: float | None = None):
-        task = self._workers.get(name)
-        if not task:
+    async def stop_and_wait(self, key: str, timeout: float | None = None):
+        tasks = [job.task for job in self.resolve(key)]
+        if not tasks:
             return
 
-        if not task.done():
+        for task in tasks:
             task.cancel()
 
         try:
-            await asyncio.wait_for(task, timeout=timeout)
+            await asyncio.wait_for(
+                asyncio.gather(*tasks, return_exceptions=True),
+                timeout=timeout
+            )
         except asyncio.TimeoutError:
             pass
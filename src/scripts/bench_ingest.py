@@ -0,0 +1,130 @@
+"""
+End-to-end ingest benchmark against the local mock Polis API.
+
+Runs refresh_events in a loop (fetch, decode, dedupe, store, derived data)
+against src.scripts.mock_polis with a fresh store, and reports refresh
+latency, ingest throughput and detection latency (event published on the
+mock -> stored).
+
+Usage (from project root):
+    python -m src.scripts.bench_ingest --cycles 40 --interval 0.5 --rate 20
+    python -m src.scripts.bench_ingest --initial 20000 --size 20000 --cycles 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import src.api.polis as polis
+from src.api.polis import PolisAPIError
+from src.scripts.mock_polis import MockPolisServer
+from src.services.fetcher import refresh_events
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cycles", type=int, default=40)
+    parser.add_argument("--interval", type=float, default=0.5, help="seconds between refreshes")
+    parser.add_argument("--rate", type=float, default=20, help="new events per second on the mock")
+    parser.add_argument("--initial", type=int, default=500)
+    parser.add_argument("--size", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    return parser.parse_args()
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+
+    values = sorted(values)
+    return values[min(int(len(values) * p), len(values) - 1)]
+
+
+def report(name, values, unit="ms", scale=1000):
+    if not values:
+        print(f"{name:<22}{'-':>10}")
+        return
+
+    print(
+        f"{name:<22}"
+        f"{statistics.median(values) * scale:>10.1f}"
+        f"{percentile(values, 0.95) * scale:>10.1f}"
+        f"{max(values) * scale:>10.1f}  {unit}"
+    )
+
+
+async def run(args):
+    server = MockPolisServer(
+        rate=args.rate,
+        size=args.size,
+        initial=args.initial,
+        latency_s=args.latency,
+        jitter_s=args.jitter,
+        error_rate=args.error_rate,
+        hang_s=2.0,
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        files = dict(
+            data_file=tmp / "events.json",
+            state_file=tmp / "last_event.json",
+            views_file=tmp / "group_views.json",
+            sketches_file=tmp / "sketches.json",
+            duplicates_file=tmp / "duplicates.json",
+        )
+
+        async with server:
+            polis.EVENT_URL = server.url
+
+            refresh_s, live, backlog = [], [], []
+            ingested = failures = 0
+            started = time.perf_counter()
+            live_from = time.monotonic()
+
+            for _ in range(args.cycles):
+                start = time.perf_counter()
+
+                try:
+                    new_events = await refresh_events(**files)
+                except PolisAPIError:
+                    failures += 1
+                    new_events = []
+
+                refresh_s.append(time.perf_counter() - start)
+
+                now = time.monotonic()
+                ingested += len(new_events)
+
+                for e in new_events:
+                    published = server.published.get(e["id"])
+                    if published is not None:
+                        # the initial feed was published before the first refresh
+                        (live if published >= live_from else backlog).append(now - published)
+
+                await asyncio.sleep(args.interval)
+
+            elapsed = time.perf_counter() - started
+
+            # the server waits for keep-alive connections when closing
+            await polis.close_client()
+
+    print(
+        f"cycles={args.cycles} interval={args.interval}s rate={args.rate}/s "
+        f"initial={args.initial} size={args.size} error_rate={args.error_rate}"
+    )
+    print(f"{'':<22}{'p50':>10}{'p95':>10}{'max':>10}")
+    report("refresh", refresh_s)
+    report("detection (live)", live)
+    report("detection (backlog)", backlog)
+    print(f"ingested={ingested} in {elapsed:.1f}s ({ingested / elapsed:.1f} events/s), failed refreshes={failures}")
+    print("mock:", ", ".join(f"{k}={v}" for k, v in sorted(server.stats.items())))
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
@@ -0,0 +1,77 @@
+"""
+Query scaling benchmark: sequential query_events vs sharded process pool.
+
+Usage (from project root):
+    python -m src.scripts.bench_query --events 200000 --workers 1 2 4 8 16
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from src.scripts.synthetic import make_events
+from src.services.fetcher import load_events
+from src.services.parallel import parallel_query_events, shutdown_executor
+from src.utils.query import query_events
+
+QUERIES = {
+    "search strict": dict(text="polis bil"),
+    "search scored": dict(text="polis bil natt", strict=False, limit=50),
+    "rank type": dict(group_by="type", text="larm"),
+    "rank location scored": dict(group_by="location.name", text="brand skadad", strict=False),
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args()
+
+
+def best_of(repeat, fn):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        took = time.perf_counter() - start
+        best = took if best is None else min(best, took)
+
+    return best
+
+
+async def run(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = Path(tmp) / "events.json"
+        data_file.write_text(json.dumps(make_events(args.events)), encoding="utf-8")
+        events = load_events(data_file)
+
+        print(f"events={len(events)} repeat={args.repeat}")
+        print(f"{'query':<24}{'workers':>8}{'seconds':>10}{'speedup':>9}")
+
+        for name, query in QUERIES.items():
+            base = best_of(args.repeat, lambda: query_events(events, **query))
+            print(f"{name:<24}{'seq':>8}{base:>10.3f}{1.0:>9.2f}")
+
+            for workers in args.workers:
+                # warm up: start processes and preload shards
+                await parallel_query_events(data_file, workers=workers, **query)
+
+                best = None
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    await parallel_query_events(data_file, workers=workers, **query)
+                    took = time.perf_counter() - start
+                    best = took if best is None else min(best, took)
+
+                print(f"{name:<24}{workers:>8}{best:>10.3f}{base / best:>9.2f}")
+
+        shutdown_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
@@ -0,0 +1,315 @@
+"""
+Local mock of https://polisen.se/api/events for offline testing.
+
+Serves a synthetic feed that grows at --rate events per second (the newest
+--size events, newest first, like the real API), with injected latency and
+errors (403/429 with Retry-After, 5xx, hung requests, or every request
+for some locationname values). Supports the locationname/type/limit
+parameters and ETag/If-None-Match, and serves an HTML detail page at
+every event's url (for page enrichment).
+
+Usage (from project root):
+    python -m src.scripts.mock_polis --port 8080 --rate 0.5 --error-rate 0.05
+    POLIS_SCANNER_POLIS_EVENT_URL=http://127.0.0.1:8080/api/events python3 main.py
+
+Event page urls resolve against the host of the event url unless
+POLIS_SCANNER_POLIS_BASE_URL is set, so enrichment hits the mock as well.
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit, parse_qs, unquote
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from src.scripts.synthetic import make_event, WORDS
+
+REASONS = {200: "OK", 304: "Not Modified", 403: "Forbidden", 404: "Not Found",
+           429: "Too Many Requests", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+PAGE = """<!DOCTYPE html>
+<html><head><title>{name}</title><script>var tracking = 1;</script></head>
+<body><nav>Polisen</nav>
+<main><h1>{name}</h1><div class="text-body editorial-html">{paragraphs}</div></main>
+</body></html>"""
+
+
+class MockPolisServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        rate: float = 0.5,
+        size: int = 500,
+        initial: int = 500,
+        latency_s: float = 0.0,
+        jitter_s: float = 0.0,
+        error_rate: float = 0.0,
+        errors: tuple = (403, 429, 500, 503, "timeout"),
+        retry_after_s: int = 5,
+        hang_s: float = 30.0,
+        etag: bool = True,
+        fail_locations: tuple = (),
+        seed: int = 1,
+    ):
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self.size = size
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self.error_rate = error_rate
+        self.errors = errors
+        self.retry_after_s = retry_after_s
+        self.hang_s = hang_s
+        self.etag = etag
+        self.fail_locations = {name.lower() for name in fail_locations}
+
+        self.rng = random.Random(seed)
+        self.stats = Counter()
+
+        # feed state, oldest first; published[id] is the monotonic time an
+        # event became visible, for end-to-end detection latency
+        self.events = []
+        self.published = {}
+        self.by_url = {}
+        self._next_id = 500_000
+        self._when = datetime(2024, 1, 1)
+        self._started = None
+        self._server = None
+
+        now = time.monotonic()
+        for _ in range(initial):
+            self._publish(now)
+        self._initial = initial
+
+    # -----------------------------
+    # Feed
+    # -----------------------------
+    def _publish(self, published_at: float) -> None:
+        self._when += timedelta(seconds=self.rng.randint(30, 900))
+        event = make_event(self._next_id, self._when, self.rng)
+
+        self.events.append(event)
+        self.published[event["id"]] = published_at
+        self.by_url[event["url"]] = event
+        self._next_id += 1
+
+    def _advance(self) -> None:
+        """Publish the events due since start at the configured rate"""
+
+        if self._started is None or self.rate <= 0:
+            return
+
+        due = int((time.monotonic() - self._started) * self.rate)
+        published = self._next_id - 500_000 - self._initial
+
+        # generated lazily, but stamped with the time they were due
+        for i in range(published + 1, due + 1):
+            self._publish(self._started + i / self.rate)
+
+    def feed(self, params: dict) -> list:
+        location = params.get("locationname")
+        event_type = params.get("type")
+        limit = int(params.get("limit") or self.size)
+
+        result = []
+        for e in reversed(self.events):
+            if location and e["location"]["name"].lower() != location.lower():
+                continue
+            if event_type and e["type"].lower() != event_type.lower():
+                continue
+
+            result.append(e)
+            if len(result) >= min(limit, self.size):
+                break
+
+        return result
+
+    def page_text(self, event: dict) -> list:
+        """Paragraphs of the detail page for event"""
+
+        rng = random.Random(event["id"])
+        return [event["summary"]] + [
+            " ".join(rng.choices(WORDS, k=rng.randint(8, 20))).capitalize() + "."
+            for _ in range(rng.randint(1, 3))
+        ]
+
+    # -----------------------------
+    # HTTP
+    # -----------------------------
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                parts = request_line.decode("latin-1").split()
+                target = parts[1] if len(parts) > 1 else "/"
+
+                if not await self._respond(target, headers, writer):
+                    break
+
+                if headers.get("connection", "").lower() == "close":
+                    break
+
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+
+        finally:
+            writer.close()
+
+    async def _respond(self, target: str, headers: dict, writer: asyncio.StreamWriter) -> bool:
+        """Write one response, False when the connection should be dropped"""
+
+        self.stats["requests"] += 1
+        self._advance()
+
+        delay = self.latency_s + self.rng.uniform(0, self.jitter_s)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self.error_rate and self.rng.random() < self.error_rate:
+            error = self.rng.choice(self.errors)
+            self.stats[str(error)] += 1
+
+            if error == "timeout":
+                await asyncio.sleep(self.hang_s)
+                return False
+
+            extra = {"Retry-After": str(self.retry_after_s)} if error in (403, 429) else {}
+            self._write(writer, error, b"", extra)
+            await writer.drain()
+            return True
+
+        url = urlsplit(target)
+        if not url.path.rstrip("/").endswith("/events") and url.path not in ("", "/"):
+            event = self.by_url.get(unquote(url.path))
+
+            if event is None:
+                self.stats["404"] += 1
+                self._write(writer, 404, b"")
+            else:
+                self.stats["page"] += 1
+                paragraphs = "".join(f"<p>{p}</p>" for p in self.page_text(event))
+                body = PAGE.format(name=event["name"], paragraphs=paragraphs).encode("utf-8")
+                self._write(writer, 200, body, {"Content-Type": "text/html; charset=utf-8"})
+
+            await writer.drain()
+            return True
+
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if params.get("locationname", "").lower() in self.fail_locations:
+            # a partition that is always down, for backfill tests
+            self.stats["503"] += 1
+            self._write(writer, 503, b"")
+            await writer.drain()
+            return True
+
+        events = self.feed(params)
+
+        tag = f'"{events[0]["id"] if events else 0}-{len(events)}"'
+        if self.etag and headers.get("if-none-match") == tag:
+            self.stats["304"] += 1
+            self._write(writer, 304, b"", {"ETag": tag})
+            await writer.drain()
+            return True
+
+        body = json.dumps(events, ensure_ascii=False).encode("utf-8")
+        self.stats["200"] += 1
+        self._write(writer, 200, body, {"ETag": tag} if self.etag else {})
+        await writer.drain()
+        return True
+
+    def _write(self, writer: asyncio.StreamWriter, status: int, body: bytes, extra: dict | None = None) -> None:
+        extra = {"Content-Type": "application/json; charset=utf-8", **(extra or {})}
+        head = [f"HTTP/1.1 {status} {REASONS.get(status, '')}", f"Content-Length: {len(body)}"]
+        head += [f"{k}: {v}" for k, v in extra.items()]
+
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+
+    # -----------------------------
+    # Lifecycle
+    # -----------------------------
+    @property
+    def url(self) -> str:
+        return f"{self.base_url}/api/events"
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> "MockPolisServer":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._started = time.monotonic()
+
+        return self
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "MockPolisServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--rate", type=float, default=0.5, help="new events per second")
+    parser.add_argument("--size", type=int, default=500, help="events per response")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra latency, seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with an error")
+    parser.add_argument("--errors", nargs="+", default=["403", "429", "500", "503", "timeout"])
+    parser.add_argument("--retry-after", type=int, default=5)
+    parser.add_argument("--no-etag", action="store_true")
+    return parser.parse_args()
+
+
+async def serve(args):
+    errors = tuple(e if e == "timeout" else int(e) for e in args.errors)
+
+    server = MockPolisServer(
+        host=args.host,
+        port=args.port,
+        rate=args.rate,
+        size=args.size,
+        latency_s=args.latency,
+        jitter_s=args.jitter,
+        error_rate=args.error_rate,
+        errors=errors,
+        retry_after_s=args.retry_after,
+        etag=not args.no_etag,
+    )
+
+    async with server:
+        print(f"Mock Polis API on {server.url}")
+        await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve(parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,73 @@
+"""
+Synthetic Polis-like events for benchmarks and offline testing.
+Shapes follow https://polisen.se/api/events (id, datetime, name, summary,
+url, type, location{name, gps}), values are random but seeded.
+"""
+
+from datetime import datetime, timedelta
+import random
+
+TYPES = [
+    "Brand", "Rån", "Trafikolycka", "Stöld", "Misshandel", "Inbrott",
+    "Skadegörelse", "Bedrägeri", "Rattfylleri", "Narkotikabrott",
+    "Ofredande/förargelse", "Sammanfattning natt", "Övrigt",
+]
+
+LOCATIONS = [
+    ("Stockholm", "59.329324,18.068581"),
+    ("Göteborg", "57.70887,11.97456"),
+    ("Malmö", "55.604981,13.003822"),
+    ("Uppsala", "59.858564,17.638927"),
+    ("Västerås", "59.609901,16.544809"),
+    ("Örebro", "59.275263,15.213411"),
+    ("Linköping", "58.410807,15.621373"),
+    ("Helsingborg", "56.046467,12.694512"),
+    ("Umeå", "63.825847,20.263035"),
+    ("Luleå", "65.584819,22.156702"),
+    ("Gävle", "60.67488,17.141273"),
+    ("Sundsvall", "62.390811,17.306927"),
+    ("Kalmar", "56.663445,16.35678"),
+    ("Visby", "57.634799,18.294844"),
+]
+
+WORDS = (
+    "polis patrull larm person skadad gripen lägenhet villa bil cykel "
+    "butik centrum natt kväll morgon rökutveckling räddningstjänst "
+    "vittnen anmälan utreds ambulans misstänkt väg korsning"
+).split()
+
+
+def make_event(event_id: int, when: datetime, rng: random.Random) -> dict:
+    event_type = rng.choice(TYPES)
+    location, gps = rng.choice(LOCATIONS)
+    stamp = when.strftime("%Y-%m-%d %H:%M:%S +01:00")
+
+    return {
+        "id": event_id,
+        "datetime": stamp,
+        "name": f"{when:%d %B %H.%M}, {event_type}, {location}",
+        "summary": " ".join(rng.choices(WORDS, k=rng.randint(6, 14))).capitalize() + ".",
+        "url": f"/aktuellt/handelser/{when:%Y/%B/%d}/{event_type.lower()}-{location.lower()}-{event_id}/",
+        "type": event_type,
+        "location": {"name": location, "gps": gps},
+    }
+
+
+def make_events(
+    count: int,
+    start_id: int = 500_000,
+    start: datetime | None = None,
+    seed: int = 1,
+) -> list[dict]:
+    """count events with increasing ids/datetimes, returned newest first"""
+
+    rng = random.Random(seed)
+    when = start or datetime(2024, 1, 1)
+
+    events = []
+    for i in range(count):
+        when += timedelta(seconds=rng.randint(30, 900))
+        events.append(make_event(start_id + i, when, rng))
+
+    events.reverse()
+    return events
@@ -0,0 +1,125 @@
+from typing import List, Dict, Optional, Sequence
+import asyncio
+
+from src.api.polis import fetch_events, PolisAPIError
+from src.core.config import settings
+from src.core.logger import get_logger
+from src.services.fetcher import ingest_events
+
+logger = get_logger(__name__)
+
+CONCURRENCY = settings.backfill_concurrency
+
+# locationname values accepted by the Polis API
+COUNTIES = (
+    "Blekinge län",
+    "Dalarnas län",
+    "Gotlands län",
+    "Gävleborgs län",
+    "Hallands län",
+    "Jämtlands län",
+    "Jönköpings län",
+    "Kalmar län",
+    "Kronobergs län",
+    "Norrbottens län",
+    "Skåne län",
+    "Stockholms län",
+    "Södermanlands län",
+    "Uppsala län",
+    "Värmlands län",
+    "Västerbottens län",
+    "Västernorrlands län",
+    "Västmanlands län",
+    "Västra Götalands län",
+    "Örebro län",
+    "Östergötlands län",
+)
+
+EVENT_TYPES = (
+    "Bedrägeri",
+    "Brand",
+    "Explosion",
+    "Försvunnen person",
+    "Inbrott",
+    "Misshandel",
+    "Mord/dråp",
+    "Narkotikabrott",
+    "Olaga hot",
+    "Rattfylleri",
+    "Rån",
+    "Sammanfattning natt",
+    "Skadegörelse",
+    "Skottlossning",
+    "Stöld",
+    "Trafikkontroll",
+    "Trafikolycka",
+)
+
+
+# -----------------------------
+# Backfill
+# -----------------------------
+def resolve_names(requested: Optional[Sequence[str]], known: Sequence[str]) -> List[str]:
+    """Match case-insensitively against known names, unknown names are kept as given"""
+
+    if not requested:
+        return []
+
+    by_lower = {name.lower(): name for name in known}
+    return [by_lower.get(name.strip().lower(), name.strip()) for name in requested if name.strip()]
+
+
+async def backfill_events(
+    counties: Optional[Sequence[str]] = None,
+    event_types: Optional[Sequence[str]] = None,
+    concurrency: int = CONCURRENCY,
+    **ingest_kwargs
+) -> Dict:
+    """
+    Fetch every (county, type) partition concurrently, at most concurrency
+    requests in flight (request starts are paced by the shared API limiter),
+    then merge all results into the store in one write. event_types None
+    means one request per county without a type filter.
+    """
+
+    partitions = [
+        (county, event_type)
+        for county in (counties or COUNTIES)
+        for event_type in (event_types or [None])
+    ]
+
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def fetch_partition(county, event_type):
+        async with semaphore:
+            return await fetch_events(location=county, event_type=event_type)
+
+    logger.info(f"Backfill: {len(partitions)} partitions, concurrency={concurrency}")
+
+    results = await asyncio.gather(
+        *(fetch_partition(county, event_type) for county, event_type in partitions),
+        return_exceptions=True
+    )
+
+    fetched = []
+    failed = []
+
+    for (county, event_type), result in zip(partitions, results):
+        if isinstance(result, PolisAPIError):
+            failed.append((county, event_type))
+            logger.warning(f"Backfill failed for {county} / {event_type or 'all types'}: {result}")
+            continue
+
+        if isinstance(result, BaseException):
+            raise result
+
+        fetched.extend(result or [])
+
+    new_events = ingest_events(fetched, **ingest_kwargs)
+
+    return {
+        "partitions": len(partitions),
+        "failed": failed,
+        "fetched": len(fetched),
+        "new_events": new_events,
+    }
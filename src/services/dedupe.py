@@ -0,0 +1,467 @@
+from typing import List, Dict, Optional, Set
+from array import array
+from datetime import datetime
+from pathlib import Path
+import json
+import os
+import struct
+
+from src.core.config import settings
+from src.core.logger import get_logger
+from src.services.views import source_stat
+from src.utils.query import compile_field, normalize_text
+from src.utils.sketch import minhash_signature, jaccard_estimate, lsh_bands
+
+logger = get_logger(__name__)
+
+DUPLICATES_FILE = settings.cache_dir / "duplicates.json"
+THRESHOLD = settings.dedupe_threshold
+WINDOW_S = settings.dedupe_window_h * 3600
+
+
+# -----------------------------
+# Near-duplicate detection
+# -----------------------------
+# The feed republishes incidents with lightly edited summaries. Every event
+# gets a MinHash signature over its summary; LSH buckets (16 bands, scoped
+# by type and location so only reports of the same kind and place can
+# match) turn "which earlier events are similar" into a few lookups, and
+# only those candidates are compared. A candidate only counts if it was
+# reported within the window (POLIS_SCANNER_DEDUPE_WINDOW_H), so recurring
+# boilerplate ("Hastighetskontroll på E10.") stays separate incidents, and
+# summaries shorter than one shingle are not indexed at all (every empty
+# summary would match every other). Events are added oldest first, so a
+# cluster is keyed by its first report. New events are clustered at ingest
+# by refresh_events when the saved index is current; otherwise the index is
+# rebuilt on first use (get_superseded), never during a refresh.
+#
+# Clusters and the index live in binary sidecars next to duplicates.json
+# (which only holds their sizes), all appended to per ingest, so an ingest
+# in a new process neither re-hashes the archive nor reads the stored
+# events:
+#
+#     <duplicates>.keys   per event record: id, timestamp and its band keys
+#     <duplicates>.sigs   per event record: MinHash signature
+#     <duplicates>.bands  (band key, record) pairs sorted by key
+#     <duplicates>.roots  (duplicate id, first report id) pairs
+#
+# Lookups bisect .bands on disk; records not merged into it yet (at most
+# MERGE_EVERY) are kept in a small in-memory tail, loaded from .keys.
+
+BANDS = 16
+SIGNATURE_SIZE = 128
+MERGE_EVERY = 4096
+SHINGLE_SIZE = 4
+
+_RECORD = struct.Struct(f"<{BANDS + 2}q")
+_SIGNATURE = struct.Struct(f"<{SIGNATURE_SIZE}I")
+_PAIR = struct.Struct("<qq")
+
+_get_type = compile_field("type")
+_get_location = compile_field("location.name")
+_get_summary = compile_field("summary")
+_get_datetime = compile_field("datetime")
+
+
+def dedupe_scope(event: Dict) -> tuple:
+    return normalize_text(_get_type(event)), normalize_text(_get_location(event))
+
+
+def _timestamp(event: Dict) -> Optional[int]:
+    try:
+        return int(datetime.strptime(_get_datetime(event), "%Y-%m-%d %H:%M:%S %z").timestamp())
+    except (TypeError, ValueError):
+        return None
+
+
+def _sidecars(duplicates_file: Path) -> tuple:
+    return tuple(duplicates_file.with_suffix(suffix) for suffix in (".keys", ".sigs", ".bands", ".roots"))
+
+
+def _bisect_pairs(f, count: int, key: int) -> List[int]:
+    """Records stored under key in a sorted pair file of count pairs"""
+
+    lo, hi = 0, count
+    while lo < hi:
+        mid = (lo + hi) // 2
+        f.seek(mid * _PAIR.size)
+
+        if _PAIR.unpack(f.read(_PAIR.size))[0] < key:
+            lo = mid + 1
+        else:
+            hi = mid
+
+    records = []
+    f.seek(lo * _PAIR.size)
+
+    for _ in range(lo, count):
+        found, record = _PAIR.unpack(f.read(_PAIR.size))
+        if found != key:
+            break
+        records.append(record)
+
+    return records
+
+
+def _clusters(roots: Dict[int, int]) -> Dict[int, List[int]]:
+    clusters = {}
+    for event_id, root in roots.items():
+        clusters.setdefault(root, [root]).append(event_id)
+
+    return clusters
+
+
+class DuplicateIndex:
+    def __init__(
+        self,
+        threshold: float = THRESHOLD,
+        duplicates_file: Optional[Path] = None,
+        window_s: float = WINDOW_S,
+    ):
+        self.threshold = threshold
+        self.window_s = window_s
+        self.duplicates_file = duplicates_file
+        self.roots: Dict[int, int] = {}  # duplicate id -> first report id
+        self.new_roots: List[tuple] = []  # (id, root) not saved
+
+        self.records = 0  # indexed events
+        self.saved = 0  # records in .keys/.sigs
+        self.merged = 0  # records in .bands
+        self.tail: Dict[int, List[int]] = {}  # band key -> records not merged
+        self.pending: List[tuple] = []  # (id, timestamp, keys, signature) not saved
+
+    def __len__(self) -> int:
+        return self.records
+
+    def _candidates(self, keys: List[int]) -> Set[int]:
+        candidates = set()
+        for key in keys:
+            candidates.update(self.tail.get(key, ()))
+
+        if self.merged:
+            bands_file = _sidecars(self.duplicates_file)[2]
+
+            with bands_file.open("rb") as f:
+                for key in keys:
+                    candidates.update(_bisect_pairs(f, self.merged * BANDS, key))
+
+        return candidates
+
+    def _read_saved(self, records: List[int]) -> Dict[int, tuple]:
+        """record -> (id, timestamp, signature) from the sidecars"""
+
+        keys_file, sigs_file = _sidecars(self.duplicates_file)[:2]
+        result = {}
+
+        with keys_file.open("rb") as keys, sigs_file.open("rb") as sigs:
+            for record in records:
+                keys.seek(record * _RECORD.size)
+                sigs.seek(record * _SIGNATURE.size)
+
+                event_id, timestamp = _RECORD.unpack(keys.read(_RECORD.size))[:2]
+                result[record] = (event_id, timestamp, _SIGNATURE.unpack(sigs.read(_SIGNATURE.size)))
+
+        return result
+
+    def add(self, event: Dict) -> Optional[int]:
+        """Index event, returns its cluster root if it duplicates an earlier one"""
+
+        event_id = event.get("id")
+        summary = normalize_text(_get_summary(event))
+        timestamp = _timestamp(event)
+
+        if len(summary) < SHINGLE_SIZE or timestamp is None:
+            return None
+
+        signature = minhash_signature(summary, SHINGLE_SIZE)
+        keys = lsh_bands(signature, bands=BANDS, prefix=dedupe_scope(event))
+
+        candidates = sorted(self._candidates(keys))
+
+        on_disk = [r for r in candidates if r < self.saved]
+        saved = self._read_saved(on_disk) if on_disk else {}
+
+        best, best_similarity = None, self.threshold
+        for record in candidates:
+            if record < self.saved:
+                candidate_id, candidate_timestamp, candidate_signature = saved[record]
+            else:
+                candidate_id, candidate_timestamp, _, candidate_signature = self.pending[record - self.saved]
+
+            if abs(timestamp - candidate_timestamp) > self.window_s:
+                continue
+
+            similarity = jaccard_estimate(signature, candidate_signature)
+            if similarity >= best_similarity:
+                best, best_similarity = candidate_id, similarity
+
+        for key in keys:
+            self.tail.setdefault(key, []).append(self.records)
+
+        self.pending.append((event_id, timestamp, keys, signature))
+        self.records += 1
+
+        if best is None:
+            return None
+
+        root = self.roots.get(best, best)
+        self.roots[event_id] = root
+        self.new_roots.append((event_id, root))
+        return root
+
+    def clusters(self) -> Dict[int, List[int]]:
+        return _clusters(self.roots)
+
+    # -----------------------------
+    # Sidecars
+    # -----------------------------
+    def write(self, duplicates_file: Path) -> None:
+        """Append pending records and roots, merging the tail into .bands when it is large"""
+
+        keys_file, sigs_file, bands_file, roots_file = _sidecars(duplicates_file)
+
+        self.duplicates_file = duplicates_file
+        mode = "ab" if self.saved else "wb"
+
+        with keys_file.open(mode) as keys, sigs_file.open(mode) as sigs:
+            for event_id, timestamp, band_keys, signature in self.pending:
+                keys.write(_RECORD.pack(event_id, timestamp, *band_keys))
+                sigs.write(_SIGNATURE.pack(*signature))
+
+        with roots_file.open(mode) as f:
+            for pair in self.new_roots:
+                f.write(_PAIR.pack(*pair))
+
+        self.saved = self.records
+        self.pending = []
+        self.new_roots = []
+
+        if not self.merged:
+            bands_file.unlink(missing_ok=True)
+
+        if self.records - self.merged > MERGE_EVERY:
+            self._merge(bands_file)
+
+    def _merge(self, bands_file: Path) -> None:
+        pairs = array("q")
+        if self.merged:
+            pairs.frombytes(bands_file.read_bytes())
+
+        merged = list(zip(pairs[0::2], pairs[1::2]))
+        merged.extend((key, record) for key, records in self.tail.items() for record in records)
+        merged.sort()
+
+        tmp = bands_file.with_suffix(f".{os.getpid()}.tmp")
+        with tmp.open("wb") as f:
+            for pair in merged:
+                f.write(_PAIR.pack(*pair))
+
+        os.replace(tmp, bands_file)
+
+        self.merged = self.records
+        self.tail = {}
+
+
+# Index for the stored file version it describes
+_index_cache = {"source": None, "index": None}
+
+
+def load_duplicates(duplicates_file: Path = DUPLICATES_FILE) -> Dict:
+    """Load the saved index sizes, safely handling missing/empty/invalid JSON"""
+
+    if not duplicates_file.exists() or duplicates_file.stat().st_size == 0:
+        return {}
+
+    try:
+        with duplicates_file.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+
+    except json.JSONDecodeError:
+        logger.warning(f"{duplicates_file} is empty or corrupt, rebuilding")
+        return {}
+
+    return data if isinstance(data, dict) else {}
+
+
+def _load_index(
+    data: Dict,
+    duplicates_file: Path,
+    threshold: float,
+    window_s: float,
+) -> Optional[DuplicateIndex]:
+    """Index over the sidecars, None if they do not match duplicates.json"""
+
+    records, merged, roots = data.get("records"), data.get("merged"), data.get("roots")
+    if (
+        not all(isinstance(n, int) for n in (records, merged, roots))
+        or not 0 <= merged <= records
+    ):
+        return None
+
+    keys_file, sigs_file, bands_file, roots_file = _sidecars(duplicates_file)
+    index = DuplicateIndex(threshold, duplicates_file, window_s)
+
+    try:
+        if (
+            keys_file.stat().st_size != records * _RECORD.size
+            or sigs_file.stat().st_size != records * _SIGNATURE.size
+            or (merged and bands_file.stat().st_size != merged * BANDS * _PAIR.size)
+            or roots_file.stat().st_size != roots * _PAIR.size
+        ):
+            return None
+
+        with keys_file.open("rb") as f:
+            f.seek(merged * _RECORD.size)
+            tail = f.read()
+
+        pairs = roots_file.read_bytes()
+
+    except OSError:
+        return None
+
+    for record, values in enumerate(_RECORD.iter_unpack(tail), merged):
+        for key in values[2:]:
+            index.tail.setdefault(key, []).append(record)
+
+    index.roots = dict(_PAIR.iter_unpack(pairs))
+    index.records = index.saved = records
+    index.merged = merged
+    return index
+
+
+def _current_index(
+    duplicates_file: Path,
+    source: Optional[Dict],
+    threshold: float,
+    window_s: float,
+) -> Optional[DuplicateIndex]:
+    """The saved index if it describes the store at source, else None"""
+
+    index = _index_cache["index"]
+    if (
+        _index_cache["source"] == source
+        and index is not None
+        and index.threshold == threshold
+        and index.window_s == window_s
+    ):
+        return index
+
+    # first use in this process, or another process ingested since
+    data = load_duplicates(duplicates_file)
+
+    if (
+        not data
+        or data.get("threshold") != threshold
+        or data.get("window_s") != window_s
+        or data.get("source") != source
+    ):
+        return None
+
+    index = _load_index(data, duplicates_file, threshold, window_s)
+    if index is not None:
+        _index_cache["source"] = source
+        _index_cache["index"] = index
+
+    return index
+
+
+def _save(index: DuplicateIndex, data_file: Path, duplicates_file: Path) -> None:
+    duplicates_file.parent.mkdir(parents=True, exist_ok=True)
+
+    # sidecars first: sizes that do not match them (crash in between) make
+    # the index be rebuilt on first use
+    index.write(duplicates_file)
+
+    data = {
+        "source": source_stat(data_file),
+        "threshold": index.threshold,
+        "window_s": index.window_s,
+        "records": index.records,
+        "merged": index.merged,
+        "roots": len(index.roots),
+    }
+
+    with duplicates_file.open("w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+    _index_cache["source"] = data["source"]
+    _index_cache["index"] = index
+
+
+def _build_index(events: List[Dict], threshold: float, window_s: float) -> DuplicateIndex:
+    index = DuplicateIndex(threshold, window_s=window_s)
+
+    for e in sorted(events, key=lambda e: e["id"]):
+        index.add(e)
+
+    return index
+
+
+def rebuild_duplicates(
+    events: List[Dict],
+    data_file: Path,
+    duplicates_file: Path = DUPLICATES_FILE,
+    threshold: float = THRESHOLD,
+    window_s: float = WINDOW_S,
+) -> DuplicateIndex:
+    index = _build_index(events, threshold, window_s)
+    _save(index, data_file, duplicates_file)
+
+    logger.debug(f"Rebuilt duplicate clusters from {len(events)} events: {len(index.clusters())} clusters")
+    return index
+
+
+def update_duplicates(
+    new_events: List[Dict],
+    data_file: Path,
+    source_before: Optional[Dict],
+    duplicates_file: Path = DUPLICATES_FILE,
+    threshold: float = THRESHOLD,
+    window_s: float = WINDOW_S,
+) -> None:
+    """
+    Cluster new_events after they were saved (see update_group_views).
+    An out of date index is left for get_superseded to rebuild.
+    """
+
+    index = _current_index(duplicates_file, source_before, threshold, window_s)
+    if index is None:
+        logger.debug(f"{duplicates_file} is out of date, rebuilt on first use")
+        return
+
+    found = 0
+    for e in sorted(new_events, key=lambda e: e["id"]):
+        if index.add(e) is not None:
+            found += 1
+
+    if found:
+        logger.info(f"Flagged {found} new events as near-duplicates")
+
+    _save(index, data_file, duplicates_file)
+
+
+def get_superseded(
+    data_file: Path,
+    duplicates_file: Path = DUPLICATES_FILE,
+    threshold: float = THRESHOLD,
+    window_s: float = WINDOW_S,
+) -> Set[int]:
+    """Ids of events replaced by a newer near-duplicate (every cluster keeps its newest)"""
+
+    index = _current_index(duplicates_file, source_stat(data_file), threshold, window_s)
+
+    if index is None:
+        from src.services.fetcher import load_events
+
+        events = load_events(data_file)
+        if not events:
+            return set()
+
+        index = rebuild_duplicates(events, data_file, duplicates_file, threshold, window_s)
+
+    superseded = set()
+    for ids in index.clusters().values():
+        newest = max(ids)
+        superseded.update(i for i in ids if i != newest)
+
+    return superseded
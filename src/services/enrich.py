@@ -0,0 +1,272 @@
+from typing import List, Dict, Optional
+from itertools import chain
+from pathlib import Path
+import asyncio
+import json
+import os
+import re
+
+import httpx
+from bs4 import BeautifulSoup
+
+from src.api.polis import PolisClient, get_client
+from src.api.limiter import CircuitBreaker, parse_retry_after
+from src.api.metrics import api_metrics
+from src.core.config import settings
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+PAGES_DIR = settings.cache_dir / "pages"
+PENDING_FILE = settings.cache_dir / "pages_pending.json"
+CONCURRENCY = settings.enrich_concurrency
+MAX_PAGES = settings.enrich_max_pages
+BASE_URL = settings.polis_base_url
+BLOCK_S = settings.http_backoff_max_s
+
+# first match wins; event pages keep the report text in .text-body
+BODY_SELECTORS = (".text-body", ".editorial-html", "article", "main")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+# -----------------------------
+# Page text
+# -----------------------------
+def extract_body(html: str) -> str:
+    """Report text of an event detail page, whitespace collapsed"""
+
+    soup = BeautifulSoup(html, "html.parser")
+
+    for tag in soup(["script", "style", "noscript"]):
+        tag.decompose()
+
+    node = None
+    for selector in BODY_SELECTORS:
+        node = soup.select_one(selector)
+        if node is not None:
+            break
+
+    text = (node or soup.body or soup).get_text(" ", strip=True)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _page_path(event_id: int, pages_dir: Path) -> Path:
+    return pages_dir / f"{event_id}.txt"
+
+
+def load_page(event_id: int, pages_dir: Path = PAGES_DIR) -> Optional[str]:
+    try:
+        return _page_path(event_id, pages_dir).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+
+def save_page(event_id: int, text: str, pages_dir: Path = PAGES_DIR) -> None:
+    path = _page_path(event_id, pages_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# -----------------------------
+# Enrichment
+# -----------------------------
+# Detail pages are fetched on the pooled client, at most `concurrency` at
+# a time and at most `max_pages` per call (newest events first), and their
+# text is cached on disk by event id, so an event page is only requested
+# once. Every page draws from the shared token bucket and reports to the
+# shared circuit breaker like an API request: a 403/429 blocks all callers,
+# and pages still waiting are skipped while it is open. Failures leave the
+# event without a body; a page that is gone (404/410) is cached as empty
+# text so it is not requested again.
+#
+# Events left without a body (over the cap, failed, circuit open) are
+# recorded in PENDING_FILE with their page url and retried on later
+# refreshes, after that refresh's new events and within the same cap.
+
+def _record_page_error(breaker: CircuitBreaker, resp: httpx.Response) -> None:
+    status = resp.status_code
+
+    if status in (403, 429):
+        retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+        breaker.record_failure()
+        breaker.trip(retry_after if retry_after is not None else BLOCK_S)
+
+    elif status >= 500:
+        breaker.record_failure()
+
+    else:
+        # the site answered (e.g. 404 for a removed page)
+        breaker.record_success()
+
+
+async def _fetch_body(
+    event: Dict,
+    client: PolisClient,
+    semaphore: asyncio.Semaphore,
+    pages_dir: Path,
+) -> Optional[str]:
+    url = event.get("url")
+    if not url:
+        return None
+
+    if not url.startswith("http"):
+        url = f"{BASE_URL}{url}"
+
+    breaker = client.breaker
+
+    async with semaphore:
+        await client.limiter.acquire()
+
+        # checked after waiting for a token, a block may have started since
+        if not breaker.allow():
+            api_metrics.inc("pages:skipped")
+            return None
+
+        try:
+            resp = await client.client.get(url, headers={"Accept": "text/html"})
+            resp.raise_for_status()
+
+        except httpx.HTTPStatusError as e:
+            _record_page_error(breaker, e.response)
+            api_metrics.inc("pages:failed")
+            logger.debug(f"Failed to fetch event page {url}: {e}")
+
+            if e.response.status_code in (404, 410):
+                save_page(event["id"], "", pages_dir)
+                return ""
+
+            return None
+
+        except httpx.HTTPError as e:
+            breaker.record_failure()
+            api_metrics.inc("pages:failed")
+            logger.debug(f"Failed to fetch event page {url}: {e}")
+            return None
+
+        except BaseException:
+            breaker.release_probe()
+            raise
+
+        breaker.record_success()
+
+    text = extract_body(resp.text)
+    save_page(event["id"], text, pages_dir)
+    api_metrics.inc("pages:fetched")
+
+    return text
+
+
+async def enrich_events(
+    events: List[Dict],
+    concurrency: int = CONCURRENCY,
+    pages_dir: Path = PAGES_DIR,
+    client: Optional[PolisClient] = None,
+    max_pages: int = MAX_PAGES,
+) -> int:
+    """Set event["body"] from the detail pages in place, returns how many got one"""
+
+    client = client or get_client()
+
+    missing = []
+    for e in events:
+        text = load_page(e["id"], pages_dir)
+
+        if text is None:
+            missing.append(e)
+        else:
+            e["body"] = text
+            api_metrics.inc("pages:cached")
+
+    if missing and client.breaker.state == "open":
+        logger.warning(f"API circuit open, not fetching {len(missing)} event pages")
+        missing = []
+
+    if max_pages > 0 and len(missing) > max_pages:
+        logger.info(f"Fetching the newest {max_pages} of {len(missing)} event pages")
+        missing = sorted(missing, key=lambda e: e["id"], reverse=True)[:max_pages]
+
+    if missing:
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+        bodies = await asyncio.gather(
+            *(_fetch_body(e, client, semaphore, pages_dir) for e in missing)
+        )
+
+        failed = 0
+        for e, text in zip(missing, bodies):
+            if text is None:
+                failed += 1
+            else:
+                e["body"] = text
+
+        if failed:
+            logger.warning(f"Failed to fetch {failed}/{len(missing)} event pages")
+
+        if client.breaker.state == "open":
+            logger.warning(f"API circuit opened while fetching event pages, retry in {client.breaker.remaining():.0f}s")
+
+        logger.debug(f"Fetched {len(missing) - failed} event pages")
+
+    return sum(1 for e in events if "body" in e)
+
+
+# -----------------------------
+# Pending pages
+# -----------------------------
+def load_pending(pending_file: Path = PENDING_FILE) -> Dict[int, str]:
+    """{event id: page url} of stored events still without a body"""
+
+    if not pending_file.exists() or pending_file.stat().st_size == 0:
+        return {}
+
+    try:
+        with pending_file.open("r", encoding="utf-8") as f:
+            pending = json.load(f)
+
+    except json.JSONDecodeError:
+        logger.warning(f"{pending_file} is empty or corrupt, ignoring pending pages")
+        return {}
+
+    return {int(i): url for i, url in pending.items()} if isinstance(pending, dict) else {}
+
+
+def save_pending(pending: Dict[int, str], pending_file: Path = PENDING_FILE) -> None:
+    pending_file.parent.mkdir(parents=True, exist_ok=True)
+    with pending_file.open("w", encoding="utf-8") as f:
+        json.dump(pending, f, ensure_ascii=False)
+
+
+async def enrich_with_pending(
+    events: List[Dict],
+    pending_file: Path = PENDING_FILE,
+    **kwargs
+) -> Dict[int, str]:
+    """
+    enrich_events for events plus the stored events still pending, and
+    record the ones left without a body. Returns {id: body} of the pending
+    events that got one, for the caller to write into the store.
+    """
+
+    pending = load_pending(pending_file)
+    new_ids = {e["id"] for e in events}
+    retries = [{"id": i, "url": url} for i, url in pending.items() if i not in new_ids]
+
+    # retries are older than the new events, so the cap takes them last
+    await enrich_events(events + retries, **kwargs)
+
+    left = {
+        e["id"]: e["url"]
+        for e in chain(events, retries)
+        if "body" not in e and e.get("url")
+    }
+
+    if left != pending:
+        save_pending(left, pending_file)
+
+    if left:
+        logger.info(f"{len(left)} event pages pending for later refreshes")
+
+    return {e["id"]: e["body"] for e in retries if "body" in e}
@@ -1,16 +1,30 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
+from itertools import chain
 from pathlib import Path
+import asyncio
+import heapq
 import json
+import os
+import shutil
+import textwrap
 
-from src.api.polis import fetch_events, PolisAPIError
+from src.api.polis import fetch_events, get_client, PolisAPIError
 from src.core.config import settings
 from src.core.logger import get_logger
+from src.services.views import VIEWS_FILE, update_group_views, restamp_source, source_stat
+from src.services.sketches import SKETCHES_FILE, update_sketches
+from src.services.dedupe import DUPLICATES_FILE, update_duplicates
+from src.services.enrich import enrich_with_pending
 
 logger = get_logger(__name__)
 
 STATE_FILE = settings.cache_dir / "last_event.json"
 DATA_FILE = settings.data_dir / "events.json"
 BASE_URL = settings.polis_base_url
+ENRICH = settings.enrich_pages
+
+# ids of the newest stored events kept in the state file, larger than the feed window
+RECENT_WINDOW = 2000
 
 def get_event(event_id: str|int, data_file: Path = DATA_FILE) -> Dict:
     if event_id is None:
@@ -34,30 +48,60 @@ def get_event(event_id: str|int, data_file: Path = DATA_FILE) -> Dict:
     
     event = next((e for e in events if e["id"] == event_id), None)
     
+    if event:
+        event = dict(event) # stored events are shared, see load_events
+
     if event and event.get("url") and not event.get("url").startswith("http"):
         event["url"] =  f"{settings.polis_base_url}{event['url']}"
     
     return event
     
 
+# Last loaded file, reused while its stat is unchanged. Callers share the
+# returned list (and indexes built over it), so treat it as read-only.
+_events_cache = {"key": None, "events": []}
+
+
+def _cache_key(data_file: Path) -> tuple:
+    stat = data_file.stat()
+    return (str(data_file), stat.st_mtime_ns, stat.st_size)
+
+
 def load_events(data_file: Path = DATA_FILE) -> List[Dict]:
     """Load all saved events from data_file, safely handling missing/empty/invalid JSON"""
 
     if not data_file.exists() or data_file.stat().st_size == 0:
         return []
 
+    key = _cache_key(data_file)
+
+    if _events_cache["key"] == key:
+        return _events_cache["events"]
+
+    events = read_events(data_file)
+    if events is None:
+        return []
+
+    _events_cache["key"] = key
+    _events_cache["events"] = events
+    return events
+
+
+def read_events(data_file: Path = DATA_FILE) -> Optional[List[Dict]]:
+    """Decode data_file without caching it, None if it is corrupt"""
+
     try:
         with data_file.open("r", encoding="utf-8") as f:
             events = json.load(f)
             if not isinstance(events, list):
-                return []
+                return None
 
             logger.debug(f"Loaded {len(events)} events from {data_file}")
             return events
 
     except json.JSONDecodeError:
         logger.warning(f"{data_file} is empty or corrupt, starting fresh")
-        return []
+        return None
 
 
 def save_events(old_events: List[Dict], new_events: List[Dict], data_file: Path = DATA_FILE) -> None:
@@ -76,58 +120,185 @@ def save_events(old_events: List[Dict], new_events: List[Dict], data_file: Path
     logger.info(f"Saved {len(unique_new)} new and {len(merged_events)} total events to {data_file}")
 
 
-def update_last_event(newest_event: Dict, state_file: Path = STATE_FILE) -> bool:
-    """Return True if newest_event is different than last saved, and update state_file"""
+# -----------------------------
+# Ingest watermark
+# -----------------------------
+# The state file holds the newest stored id/datetime (the watermark), the
+# ids of the RECENT_WINDOW newest stored events and the store's stat. A
+# fetched event is new when its id is not in that window; only an id older
+# than the whole window (or a store changed behind our back) needs the
+# full store. New events newer than the watermark, the normal case, are
+# spliced in front of the stored JSON without decoding it.
 
-    last_event = None
-    if state_file.exists() and state_file.stat().st_size > 0:
-        try:
-            with state_file.open("r", encoding="utf-8") as f:
-                last_event = json.load(f)
+def load_ingest_state(data_file: Path = DATA_FILE, state_file: Path = STATE_FILE) -> Optional[Dict]:
+    """Saved watermark state if it still describes data_file, else None"""
 
-        except json.JSONDecodeError:
-            logger.warning(f"{state_file} empty or corrupt, overwriting")
+    if not state_file.exists() or state_file.stat().st_size == 0:
+        return None
 
-    if last_event and newest_event["id"] == last_event.get("id"):
-        logger.debug(f"No new events, last id: {newest_event['id']}")
-        return False
+    try:
+        with state_file.open("r", encoding="utf-8") as f:
+            state = json.load(f)
+
+    except json.JSONDecodeError:
+        logger.warning(f"{state_file} empty or corrupt, overwriting")
+        return None
+
+    if not isinstance(state, dict) or "recent_ids" not in state:
+        return None  # older last_event.json format
+
+    if state.get("source") != source_stat(data_file):
+        logger.debug("Store changed since the last ingest, checking against the full store")
+        return None
+
+    return state
+
+
+def save_ingest_state(
+    recent_ids: List[int],
+    complete: bool,
+    newest_event: Optional[Dict],
+    data_file: Path = DATA_FILE,
+    state_file: Path = STATE_FILE,
+) -> None:
+    state = {
+        "id": newest_event["id"] if newest_event else None,
+        "datetime": newest_event.get("datetime") if newest_event else None,
+        "recent_ids": recent_ids[:RECENT_WINDOW],
+        "complete": complete and len(recent_ids) <= RECENT_WINDOW,
+        "source": source_stat(data_file),
+    }
 
     state_file.parent.mkdir(parents=True, exist_ok=True)
     with state_file.open("w", encoding="utf-8") as f:
-        json.dump(newest_event, f, indent=2, ensure_ascii=False)
+        json.dump(state, f, ensure_ascii=False)
+
+
+def classify_new_events(events: List[Dict], state: Dict) -> Optional[List[Dict]]:
+    """New events (newest first) judged by the state window, None if one is older than it"""
 
+    recent = set(state["recent_ids"])
+    floor = None if state.get("complete") or not recent else min(recent)
+
+    new_events = {}
+    for e in events:
+        event_id = e["id"]
+
+        if event_id in recent:
+            continue
+
+        if floor is not None and event_id < floor:
+            return None
+
+        new_events.setdefault(event_id, e)
+
+    return sorted(new_events.values(), key=lambda e: e["id"], reverse=True)
+
+
+def prepend_events(new_events: List[Dict], data_file: Path = DATA_FILE) -> bool:
+    """
+    Write new_events (newest first, all newer than the stored ones) in front
+    of data_file, byte-identical to save_events, copying the stored events
+    without decoding them. False if data_file is not in save_events' layout.
+    """
+
+    if not data_file.exists():
+        return False
+
+    blocks = [textwrap.indent(json.dumps(e, indent=2, ensure_ascii=False), "  ") for e in new_events]
+    tmp = data_file.with_suffix(data_file.suffix + ".tmp")
+
+    with data_file.open("rb") as src:
+        if src.read(2) != b"[\n":
+            return False
+
+        with tmp.open("wb") as dst:
+            dst.write(("[\n" + ",\n".join(blocks) + ",\n").encode("utf-8"))
+            shutil.copyfileobj(src, dst)
+
+    # load_events stays warm: the cached list only gains the new events in front
+    cached = _events_cache["key"] == _cache_key(data_file)
+
+    os.replace(tmp, data_file)
+
+    if cached:
+        _events_cache["events"] = new_events + _events_cache["events"]
+        _events_cache["key"] = _cache_key(data_file)
+
+    logger.info(f"Saved {len(new_events)} new events to {data_file}")
     return True
 
 
 # -----------------------------
-# Refresh events
+# Ingest events
 # -----------------------------
-async def refresh_events(
+def ingest_events(
+    events: List[Dict],
     data_file: Path = DATA_FILE,
+    views_file: Path = VIEWS_FILE,
+    sketches_file: Path = SKETCHES_FILE,
+    duplicates_file: Path = DUPLICATES_FILE,
     state_file: Path = STATE_FILE
 ) -> List[Dict]:
-    """Fetch, compare, and save new events. Returns list of new events."""
+    """Store events not seen before and update derived data. Returns the new events."""
 
-    try:
-        events = await fetch_events()
+    state = load_ingest_state(data_file, state_file)
+    new_events = classify_new_events(events, state) if state else None
 
-    except PolisAPIError:
-        logger.exception("Failed to refresh events from Polis API")
-        raise
+    if new_events is None:
+        return _ingest_full(events, data_file, views_file, sketches_file, duplicates_file, state_file)
 
-    if not events:
+    if not new_events:
         return []
 
-    events = sorted(events, key=lambda e: e["id"], reverse=True)
-    newest_event = events[0]
+    if state["id"] is not None and new_events[-1]["id"] < state["id"]:
+        # a late event inside the window, has to be sorted into the store
+        return _ingest_full(events, data_file, views_file, sketches_file, duplicates_file, state_file)
+
+    if state["id"] is not None and min(e["id"] for e in events) > state["id"]:
+        logger.warning(
+            f"No overlap with the stored events (newest {state['datetime']}), "
+            f"events may have been missed, run backfill"
+        )
+
+    for e in new_events:
+        logger.debug(
+            f"New event: {e}"
+        )
+
+    source_before = source_stat(data_file)
+    if not prepend_events(new_events, data_file):
+        return _ingest_full(events, data_file, views_file, sketches_file, duplicates_file, state_file)
+
+    update_group_views(new_events, data_file, source_before, views_file)
+    update_sketches(new_events, data_file, source_before, sketches_file)
+    update_duplicates(new_events, data_file, source_before, duplicates_file)
+
+    recent_ids = [e["id"] for e in new_events] + state["recent_ids"]
+    save_ingest_state(recent_ids, state["complete"], new_events[0], data_file, state_file)
+
+    return new_events
 
-    if not update_last_event(newest_event, state_file):
-        return []
+
+def _ingest_full(
+    events: List[Dict],
+    data_file: Path,
+    views_file: Path,
+    sketches_file: Path,
+    duplicates_file: Path,
+    state_file: Path
+) -> List[Dict]:
+    """Ingest checked against the whole store, rebuilds the watermark state"""
 
     old_events = load_events(data_file)
     seen_ids = {e.get("id") for e in old_events if "id" in e}
-    new_events = [e for e in events if e.get("id") not in seen_ids]
-    new_events = sorted(new_events, key=lambda e: e['id'], reverse=True)
+
+    new_events = {}
+    for e in events:
+        if e.get("id") not in seen_ids:
+            new_events.setdefault(e.get("id"), e)
+
+    new_events = sorted(new_events.values(), key=lambda e: e['id'], reverse=True)
 
     for e in new_events:
         logger.debug(
@@ -135,6 +306,140 @@ async def refresh_events(
         )
 
     if new_events:
+        source_before = source_stat(data_file)
         save_events(old_events, new_events, data_file)
+        update_group_views(new_events, data_file, source_before, views_file)
+        update_sketches(new_events, data_file, source_before, sketches_file)
+        update_duplicates(new_events, data_file, source_before, duplicates_file)
+
+    ids = seen_ids.union(e["id"] for e in new_events)
+    ids.discard(None)
+    recent_ids = heapq.nlargest(RECENT_WINDOW, ids)
+
+    newest = max(chain(old_events, new_events), key=lambda e: e.get("id", 0), default=None)
+    save_ingest_state(recent_ids, len(ids) <= RECENT_WINDOW, newest, data_file, state_file)
+
+    return new_events
+
+
+def store_bodies(
+    bodies: Dict[int, str],
+    data_file: Path = DATA_FILE,
+    views_file: Path = VIEWS_FILE,
+    sketches_file: Path = SKETCHES_FILE,
+    duplicates_file: Path = DUPLICATES_FILE,
+    state_file: Path = STATE_FILE
+) -> int:
+    """
+    Set the page body of stored events (enriched after they were stored).
+    Nothing derived depends on body, so derived files and the ingest state
+    that described the store stay current. Returns how many changed.
+    """
+
+    source_before = source_stat(data_file)
+    events = load_events(data_file)
+
+    changed = 0
+    for e in events:
+        body = bodies.get(e.get("id"))
+        if body is not None and e.get("body") != body:
+            e["body"] = body
+            changed += 1
+
+    if not changed:
+        return 0
+
+    save_events(events, [], data_file)
+
+    # the cached list was updated in place
+    if _events_cache["events"] is events:
+        _events_cache["key"] = _cache_key(data_file)
+
+    for path in (views_file, sketches_file, duplicates_file, state_file):
+        restamp_source(path, source_before, data_file)
+
+    logger.info(f"Stored page text of {changed} earlier events")
+    return changed
+
+
+# -----------------------------
+# Refresh events
+# -----------------------------
+# Singleflight: a refresh started while another one for the same files is
+# still running (GUI refresh during a poll cycle, overlapping scripted
+# refreshes) joins it instead of fetching and merging again, and every
+# caller gets the same new events. The shared task is shielded, so a
+# cancelled caller (kill poll) does not abort the fetch for the others.
+
+_inflight: Dict[tuple, asyncio.Task] = {}
+
+
+async def refresh_events(
+    data_file: Path = DATA_FILE,
+    state_file: Path = STATE_FILE,
+    views_file: Path = VIEWS_FILE,
+    sketches_file: Path = SKETCHES_FILE,
+    duplicates_file: Path = DUPLICATES_FILE
+) -> List[Dict]:
+    """Fetch, compare, and save new events. Returns list of new events."""
+
+    key = (data_file, state_file, views_file, sketches_file, duplicates_file)
+    task = _inflight.get(key)
+
+    if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(_refresh_events(*key))
+        _inflight[key] = task
+        task.add_done_callback(lambda t: _refresh_done(key, t))
+    else:
+        logger.debug("Joining in-flight refresh")
+
+    return await asyncio.shield(task)
+
+
+def _refresh_done(key: tuple, task: asyncio.Task) -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+
+    # retrieved here too, in case every caller was cancelled meanwhile
+    if not task.cancelled():
+        task.exception()
+
+
+async def _refresh_events(
+    data_file: Path,
+    state_file: Path,
+    views_file: Path,
+    sketches_file: Path,
+    duplicates_file: Path
+) -> List[Dict]:
+    try:
+        # skips decoding entirely when the feed is unchanged; the response
+        # only counts as seen once its events are stored (below)
+        events = await fetch_events(conditional=True, commit=False)
+
+    except PolisAPIError:
+        logger.exception("Failed to refresh events from Polis API")
+        raise
+
+    if events is None:
+        logger.debug("Events unchanged since last fetch")
+        events = []
+
+    bodies = {}
+    if ENRICH:
+        # only the new events need pages, all fetched ones if that is unknown;
+        # pending pages of earlier events are retried even without new ones
+        state = load_ingest_state(data_file, state_file) if events else None
+        candidates = classify_new_events(events, state) if state else None
+        bodies = await enrich_with_pending(events if candidates is None else candidates)
+
+    new_events = []
+    if events:
+        new_events = ingest_events(events, data_file, views_file, sketches_file, duplicates_file, state_file)
+
+    get_client().commit_validators()
+
+    if bodies:
+        store_bodies(bodies, data_file, views_file, sketches_file, duplicates_file, state_file)
 
     return new_events
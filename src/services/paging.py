@@ -0,0 +1,230 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.core.runtime import RuntimeContext
+
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+from src.core.config import settings
+from src.core.logger import get_logger
+from src.services.parallel import run_query
+from src.utils.index import EventIndex
+from src.utils.profile import QueryProfile, stage_of
+from src.utils.query import (
+    DEFAULT_FIELDS,
+    compile_hard_filter,
+    parse_boolean_query,
+)
+
+logger = get_logger(__name__)
+
+# fetch(after_id, page_size) -> (events on page, id to continue after or None)
+PageFetch = Callable[[Optional[int], int], Awaitable[tuple[list[dict], Optional[int]]]]
+
+
+@dataclass(slots=True)
+class PageCursor:
+    name: str
+    page_size: int
+    fetch: PageFetch
+    write: Callable[[list[dict]], None]
+    after: Optional[int] = None
+
+
+# -----------------------------
+# Pagers
+# -----------------------------
+# Keyset pagination: a page is addressed by the id of the last event shown,
+# never by offset, so pages stay stable while new events are stored.
+
+def _walk(order: list[int], start: int, page_size: int, match=None) -> tuple[list[int], bool]:
+    """Collect up to page_size positions from order[start:], and whether more match"""
+
+    page = []
+    for i in range(start, len(order)):
+        pos = order[i]
+
+        if match is not None and not match(pos):
+            continue
+
+        if len(page) == page_size:
+            return page, True
+
+        page.append(pos)
+
+    return page, False
+
+
+def _start_after(index: EventIndex, after: Optional[int], rank) -> int:
+    if after is None:
+        return 0
+
+    pos = index.id_pos.get(after)
+    if pos is None:
+        raise ValueError(f"Event id {after} is not in stored events")
+
+    return rank(pos) + 1
+
+
+def store_pager(index: EventIndex) -> PageFetch:
+    """Stored events in store order (newest id first), O(page) per page"""
+
+    async def fetch(after, page_size):
+        start = _start_after(index, after, lambda pos: pos)
+        positions, more = _walk(range(len(index.events)), start, page_size)
+        page = [index.events[pos] for pos in positions]
+
+        return page, (page[-1]["id"] if more else None)
+
+    return fetch
+
+
+def list_pager(result: list[dict]) -> PageFetch:
+    """Pages over an already computed (snapshot) result list"""
+
+    id_pos = {e.get("id"): i for i, e in enumerate(result)}
+
+    async def fetch(after, page_size):
+        start = 0
+        if after is not None:
+            if after not in id_pos:
+                raise ValueError(f"Event id {after} is not in the results")
+            start = id_pos[after] + 1
+
+        page = result[start:start + page_size]
+        more = start + page_size < len(result)
+
+        return page, (page[-1]["id"] if more else None)
+
+    return fetch
+
+
+def query_pager(
+    events: list[dict],
+    index: EventIndex,
+    *,
+    text=None,
+    fields=None,
+    filters=None,
+    sort=None,
+    limit=None,
+    strict: bool = True,
+    query=None,
+    exclude_ids: Optional[set] = None,
+    profile: Optional[QueryProfile] = None,
+) -> PageFetch:
+    """
+    Pages over query results. Strict queries in default order (newest
+    first, no --sort/--limit) walk the datetime index and stop after one
+    page; anything else is computed once and paged as a snapshot.
+    """
+
+    if not strict or sort or limit:
+        if profile:
+            profile.note("snapshot: full result computed once, then paged")
+
+        snapshot = None
+
+        async def fetch(after, page_size):
+            nonlocal snapshot
+
+            if snapshot is None:
+                result = await run_query(
+                    events=events,
+                    text=text,
+                    fields=fields,
+                    filters=filters,
+                    sort=sort,
+                    limit=limit,
+                    strict=strict,
+                    query=query,
+                    exclude_ids=exclude_ids,
+                    profile=profile
+                )
+                snapshot = list_pager(result)
+
+            return await snapshot(after, page_size)
+
+        return fetch
+
+    if not fields or fields == "all":
+        fields = DEFAULT_FIELDS
+
+    if profile:
+        profile.note("keyset walk over datetime index, stops after one page")
+
+    node = parse_boolean_query(query) if isinstance(query, str) else query
+    matched = None
+
+    if node is not None:
+        with stage_of(profile)("boolean query (index)", len(events)) as s:
+            matched = index.evaluate(node, fields)
+            s.rows_out = len(matched)
+
+    hard_filter = compile_hard_filter(text=text, fields=fields, filters=filters)
+
+    def match(pos):
+        if matched is not None and pos not in matched:
+            return False
+
+        event = index.events[pos]
+        if exclude_ids and event.get("id") in exclude_ids:
+            return False
+
+        return hard_filter(event)
+
+    async def fetch(after, page_size):
+        with stage_of(profile)("keyset page walk") as s:
+            start = _start_after(index, after, index.datetime_rank)
+            positions, more = _walk(index.by_datetime, start, page_size, match)
+            s.rows_out = len(positions)
+
+        # same shape as query_events results in strict mode
+        page = [dict(index.events[pos], score=0) for pos in positions]
+
+        return page, (page[-1]["id"] if more else None)
+
+    return fetch
+
+
+# -----------------------------
+# Command helpers
+# -----------------------------
+def resolve_page_size(requested: Optional[int], ctx: RuntimeContext = None) -> int:
+    """
+    Explicit --page-size wins (0 disables paging). Otherwise interactive
+    sessions use settings.page_size so large results do not flood the
+    output buffer; direct mode prints everything as before.
+    """
+
+    if requested is not None:
+        return max(requested, 0)
+
+    if ctx is not None and ctx.interactive:
+        return settings.page_size
+
+    return 0
+
+
+async def show_page(cursor: PageCursor, ctx: RuntimeContext = None, after: Optional[int] = None) -> None:
+    """Fetch and write one page, then remember cursor for the 'next' command"""
+
+    try:
+        page, next_after = await cursor.fetch(after, cursor.page_size)
+
+    except ValueError as e:
+        logger.warning(str(e))
+        return
+
+    cursor.write(page)
+    cursor.after = next_after
+
+    if ctx is not None:
+        ctx.state["page_cursor"] = cursor
+
+    logger.info(f"Returned {len(page)} events")
+
+    if next_after is not None:
+        logger.info(f"More results available, run 'next' (or --after {next_after})")
@@ -0,0 +1,282 @@
+from typing import List, Dict, Optional
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import asyncio
+import heapq
+import multiprocessing
+import os
+
+from src.core.config import settings
+from src.core.logger import get_logger
+from src.services.fetcher import read_events, DATA_FILE
+from src.services.views import source_stat
+from src.utils.query import (
+    DEFAULT_FIELDS,
+    query_events,
+    filter_events,
+    group_fields,
+    group_partials,
+    pivot_partials,
+    rank_groups,
+    event_sort_key,
+    apply_boolean_query,
+)
+from src.utils.index import EventIndex, get_index
+from src.utils.profile import QueryProfile, stage_of
+
+logger = get_logger(__name__)
+
+
+# -----------------------------
+# Process pool
+# -----------------------------
+# The pool is created lazily and kept alive between queries so worker
+# start-up and shard loading is only paid once per stored file version.
+# It is one single-process executor per shard: shard i always runs in the
+# same process, so every worker only ever holds its own slice.
+
+_executors: List[ProcessPoolExecutor] = []
+
+
+def resolve_workers(workers: Optional[int] = None) -> int:
+    """Configured worker count, where 0 or less means one per CPU core"""
+
+    workers = settings.query_workers if workers is None else workers
+
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+
+    return workers
+
+
+def get_executors(workers: int) -> List[ProcessPoolExecutor]:
+    """One executor per shard, shard i pinned to the process of executor i"""
+
+    if len(_executors) == workers:
+        return _executors
+
+    shutdown_executor()
+
+    # spawn behaves the same on Linux and Windows and is safe with the
+    # GUI's background threads (fork is not)
+    context = multiprocessing.get_context("spawn")
+    _executors.extend(
+        ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(shard, workers)
+        )
+        for shard in range(workers)
+    )
+    logger.debug(f"Started query process pool with {workers} workers")
+
+    return _executors
+
+
+def shutdown_executor() -> None:
+    for executor in _executors:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    _executors.clear()
+
+
+# -----------------------------
+# Worker side
+# -----------------------------
+# Each worker process serves one shard and keeps only that slice of the
+# stored events and its index, keyed by the data file stat, so repeated
+# queries only ship query arguments and results. The full list is only
+# alive while a new file version is sliced.
+
+_worker: Dict = {"shard": 0, "shards": 1}
+_shard_cache: Dict = {"key": None, "events": [], "index": None}
+
+
+def _init_worker(shard: int, shards: int) -> None:
+    _worker["shard"] = shard
+    _worker["shards"] = shards
+
+
+def _shard_events(data_path: str, stat: tuple):
+    key = (data_path, stat)
+
+    if _shard_cache["key"] != key:
+        # release the old slice before decoding the new version
+        _shard_cache.update(key=None, events=[], index=None)
+
+        path = Path(data_path)
+        events = (read_events(path) or []) if path.exists() else []
+
+        shard, shards = _worker["shard"], _worker["shards"]
+        size = -(-len(events) // shards)
+
+        # contiguous shards keep the sequential tie order when merging
+        part = events[shard * size:(shard + 1) * size]
+        del events
+
+        _shard_cache.update(key=key, events=part, index=EventIndex(part))
+
+    return _shard_cache["events"], _shard_cache["index"]
+
+
+def _run_shard(data_path: str, stat: tuple, job: Dict):
+    events, index = _shard_events(data_path, stat)
+
+    if not job["group_by"]:
+        # per-shard top-k, already sorted with the final sort key
+        return query_events(events, index=index, **job)
+
+    fields = job["fields"]
+    if not fields or fields == "all":
+        fields = DEFAULT_FIELDS
+
+    if job["query"]:
+        events = apply_boolean_query(events, job["query"], fields, index)
+
+    if job["strict"]:
+        events = filter_events(
+            events,
+            text=job["text"],
+            fields=fields,
+            filters=job["filters"]
+        )
+
+    if job["exclude_ids"]:
+        events = [e for e in events if e.get("id") not in job["exclude_ids"]]
+
+    pivot = group_fields(job["group_by"])
+
+    if len(pivot) > 1:
+        return pivot_partials(
+            events,
+            group_by=pivot,
+            text=job["text"],
+            fields=fields,
+            filters=job["filters"],
+            index=index
+        )
+
+    return group_partials(
+        events,
+        group_by=job["group_by"],
+        text=job["text"],
+        fields=fields,
+        filters=job["filters"]
+    )
+
+
+# -----------------------------
+# Public API
+# -----------------------------
+async def parallel_query_events(
+    data_file: Path = DATA_FILE,
+    *,
+    workers: Optional[int] = None,
+    text: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    filters: Optional[Dict[str, str]] = None,
+    group_by: Optional[str] = None,
+    sort: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    strict: bool = True,
+    query: Optional[str] = None,
+    facets: Optional[List[str]] = None,
+    exclude_ids: Optional[set] = None,
+) -> list | tuple:
+    """
+    Same result as query_events over load_events(data_file), evaluated
+    as one shard per worker process. Event mode merges per-shard top-k
+    lists (and sums facet counts), group mode merges per-shard
+    {count, score_sum} partials.
+    """
+
+    workers = resolve_workers(workers)
+    stat = source_stat(data_file)
+    stat = tuple(sorted(stat.items())) if stat else None
+
+    job = {
+        "query": query,
+        "text": text,
+        "fields": fields,
+        "filters": filters,
+        "group_by": group_by,
+        "sort": sort,
+        "limit": limit,
+        "strict": strict,
+        "facets": None if group_by else facets,
+        "exclude_ids": exclude_ids,
+    }
+
+    executors = get_executors(workers)
+    loop = asyncio.get_running_loop()
+
+    parts = await asyncio.gather(*(
+        loop.run_in_executor(executor, _run_shard, str(data_file), stat, job)
+        for executor in executors
+    ))
+
+    if group_by:
+        groups = {}
+
+        for part in parts:
+            for key, partial in part.items():
+                if key not in groups:
+                    groups[key] = {"count": 0, "score_sum": 0}
+
+                groups[key]["count"] += partial["count"]
+                groups[key]["score_sum"] += partial["score_sum"]
+
+        return rank_groups(groups, sort=sort, limit=limit)
+
+    facet_counts = None
+    if job["facets"]:
+        facet_counts = {field: {} for field in facets}
+
+        for _, part_counts in parts:
+            for field, table in part_counts.items():
+                merged_table = facet_counts[field]
+                for value, count in table.items():
+                    merged_table[value] = merged_table.get(value, 0) + count
+
+        parts = [events for events, _ in parts]
+
+    merged = heapq.merge(*parts, key=event_sort_key(sort), reverse=True)
+
+    if limit:
+        result = [e for _, e in zip(range(limit), merged)]
+    else:
+        result = list(merged)
+
+    return (result, facet_counts) if facet_counts is not None else result
+
+
+async def run_query(
+    events: List[Dict],
+    data_file: Path = DATA_FILE,
+    profile: Optional[QueryProfile] = None,
+    **query
+) -> list:
+    """
+    Run query_events over the stored events, sharded across processes when
+    the store is large enough, otherwise in-process using the shared index.
+    """
+
+    workers = resolve_workers()
+
+    if workers > 1 and len(events) >= settings.query_parallel_min_events:
+        logger.debug(f"Parallel query over {len(events)} events, {workers} workers")
+
+        if profile:
+            profile.note(f"sharded across {workers} worker processes (per-shard stages not traced)")
+
+        with stage_of(profile)("parallel shards + merge", len(events)) as s:
+            result = await parallel_query_events(data_file, workers=workers, **query)
+            s.rows_out = len(result[0] if isinstance(result, tuple) else result)
+
+        return result
+
+    if profile:
+        profile.note(f"in-process over {len(events)} stored events")
+
+    return query_events(events, index=get_index(events), profile=profile, **query)
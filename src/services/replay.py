@@ -0,0 +1,56 @@
+from typing import Dict
+from pathlib import Path
+import asyncio
+import os
+import time
+
+from src.api.archive import ARCHIVE_DIR, iter_archive
+from src.api.decode import decode_events, PolisAPIDecodeError
+from src.core.logger import get_logger
+from src.services.fetcher import DATA_FILE, ingest_events
+
+logger = get_logger(__name__)
+
+
+# -----------------------------
+# Replay archived responses
+# -----------------------------
+async def replay_archive(
+    rebuild: bool = False,
+    archive_dir: Path = ARCHIVE_DIR,
+    data_file: Path = DATA_FILE,
+    **ingest_kwargs
+) -> Dict:
+    """
+    Feed every archived response through ingest_events in arrival order,
+    as fast as possible, yielding to the event loop between responses so
+    the UI and other jobs (poll) keep running; each ingest itself runs
+    without interleaving. rebuild=True starts from an empty store (the old
+    one is kept as <data_file>.bak).
+    """
+
+    if rebuild and data_file.exists():
+        backup = data_file.with_suffix(data_file.suffix + ".bak")
+        os.replace(data_file, backup)
+        logger.info(f"Moved {data_file} to {backup}")
+
+    stats = {"responses": 0, "events": 0, "new": 0, "skipped": 0, "seconds": 0.0}
+    start = time.perf_counter()
+
+    for entry, body in iter_archive(archive_dir):
+        await asyncio.sleep(0)
+
+        try:
+            events = decode_events(body)
+
+        except PolisAPIDecodeError as e:
+            logger.warning(f"Archived response {entry['digest']}: {e}, skipping")
+            stats["skipped"] += 1
+            continue
+
+        stats["responses"] += 1
+        stats["events"] += len(events)
+        stats["new"] += len(ingest_events(events, data_file, **ingest_kwargs))
+
+    stats["seconds"] = time.perf_counter() - start
+    return stats
@@ -0,0 +1,229 @@
+from typing import List, Dict, Optional
+from pathlib import Path
+import json
+
+from src.core.config import settings
+from src.core.logger import get_logger
+from src.services.views import source_stat
+from src.utils.query import compile_field, normalize_text
+from src.utils.sketch import HyperLogLog, CountMinSketch, SpaceSaving
+
+logger = get_logger(__name__)
+
+SKETCHES_FILE = settings.cache_dir / "sketches.json"
+SKETCH_FIELDS = settings.rank_sketch_fields
+
+
+# -----------------------------
+# Approximate rank sketches
+# -----------------------------
+# For every field in POLIS_SCANNER_RANK_SKETCH_FIELDS a HyperLogLog
+# (distinct values), Count-Min (frequencies) and Space-Saving (top values)
+# sketch is kept per scope. A scope is "<year>|<type>" where either part may
+# be "*", so each event updates four scopes and 'rank --approx' can answer
+# per type and/or year without merging. Sketches are updated at ingest by
+# refresh_events, like the materialized group views (and like them rebuilt
+# on first use when out of date).
+
+_get_datetime = compile_field("datetime")
+_get_type = compile_field("type")
+
+
+def _scopes(event: Dict) -> List[str]:
+    year = str(_get_datetime(event) or "")[:4] or "*"
+    event_type = normalize_text(_get_type(event)) or "*"
+
+    return list({f"{year}|{event_type}", f"{year}|*", f"*|{event_type}", "*|*"})
+
+
+class _ScopeSketches:
+    def __init__(self, data: Optional[Dict] = None, fields=SKETCH_FIELDS):
+        data = data or {}
+        self.n = data.get("n", 0)
+        self.fields = {}
+        self._getters = {field: compile_field(field) for field in fields}
+
+        for field in fields:
+            saved = data.get("fields", {}).get(field)
+            self.fields[field] = (
+                HyperLogLog.from_dict(saved["hll"]) if saved else HyperLogLog(),
+                CountMinSketch.from_dict(saved["cms"]) if saved else CountMinSketch(),
+                SpaceSaving.from_dict(saved["ss"]) if saved else SpaceSaving(),
+            )
+
+    def add(self, event: Dict) -> None:
+        self.n += 1
+
+        for field, sketches in self.fields.items():
+            value = normalize_text(self._getters[field](event))
+            if not value:
+                continue
+
+            for sketch in sketches:
+                sketch.add(value)
+
+    def merge(self, other: "_ScopeSketches") -> None:
+        self.n += other.n
+
+        for field, sketches in self.fields.items():
+            for sketch, other_sketch in zip(sketches, other.fields[field]):
+                sketch.merge(other_sketch)
+
+    def to_dict(self) -> Dict:
+        return {
+            "n": self.n,
+            "fields": {
+                field: {"hll": hll.to_dict(), "cms": cms.to_dict(), "ss": ss.to_dict()}
+                for field, (hll, cms, ss) in self.fields.items()
+            },
+        }
+
+
+def load_sketches(sketches_file: Path = SKETCHES_FILE) -> Dict:
+    """Load saved sketches, safely handling missing/empty/invalid JSON"""
+
+    if not sketches_file.exists() or sketches_file.stat().st_size == 0:
+        return {}
+
+    try:
+        with sketches_file.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+
+    except json.JSONDecodeError:
+        logger.warning(f"{sketches_file} is empty or corrupt, rebuilding")
+        return {}
+
+    return data if isinstance(data, dict) else {}
+
+
+def _add_events(data: Dict, events: List[Dict], fields) -> None:
+    scopes = {}
+
+    for e in events:
+        for scope in _scopes(e):
+            sketches = scopes.get(scope)
+            if sketches is None:
+                sketches = _ScopeSketches(data["scopes"].get(scope), fields)
+                scopes[scope] = sketches
+
+            sketches.add(e)
+
+    for scope, sketches in scopes.items():
+        data["scopes"][scope] = sketches.to_dict()
+
+
+def _save(data: Dict, sketches_file: Path) -> None:
+    sketches_file.parent.mkdir(parents=True, exist_ok=True)
+    with sketches_file.open("w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def rebuild_sketches(
+    events: List[Dict],
+    data_file: Path,
+    sketches_file: Path = SKETCHES_FILE,
+    fields=SKETCH_FIELDS,
+) -> Dict:
+    data = {"fields": list(fields), "source": source_stat(data_file), "scopes": {}}
+    _add_events(data, events, fields)
+    _save(data, sketches_file)
+
+    logger.debug(f"Rebuilt rank sketches for {list(fields)} from {len(events)} events")
+    return data
+
+
+def update_sketches(
+    new_events: List[Dict],
+    data_file: Path,
+    source_before: Optional[Dict],
+    sketches_file: Path = SKETCHES_FILE,
+    fields=SKETCH_FIELDS,
+) -> None:
+    """Add new_events after they were saved (see update_group_views)"""
+
+    if not fields:
+        return
+
+    data = load_sketches(sketches_file)
+
+    if (
+        not data
+        or data.get("fields") != list(fields)
+        or data.get("source") != source_before
+    ):
+        logger.debug(f"{sketches_file} is out of date, rebuilt on first use")
+        return
+
+    _add_events(data, new_events, fields)
+    data["source"] = source_stat(data_file)
+    _save(data, sketches_file)
+
+
+def approx_rank(
+    field: str,
+    data_file: Path,
+    event_type: Optional[str] = None,
+    year: Optional[str] = None,
+    limit: Optional[int] = None,
+    sketches_file: Path = SKETCHES_FILE,
+    fields=SKETCH_FIELDS,
+) -> Optional[Dict]:
+    """
+    Approximate top values and distinct count for field, or None if the
+    field is not sketched. event_type matches like --filters (substring),
+    so every type scope containing it is merged.
+    """
+
+    if field not in fields:
+        return None
+
+    data = load_sketches(sketches_file)
+
+    if (
+        not data
+        or data.get("fields") != list(fields)
+        or data.get("source") != source_stat(data_file)
+    ):
+        from src.services.fetcher import load_events
+
+        events = load_events(data_file)
+        if not events:
+            return None
+
+        data = rebuild_sketches(events, data_file, sketches_file, fields)
+
+    year = year or "*"
+    event_type = normalize_text(event_type)
+
+    if not event_type:
+        keys = [f"{year}|*"]
+
+    else:
+        keys = [
+            scope for scope in data["scopes"]
+            if scope.startswith(f"{year}|") and scope != f"{year}|*"
+            and event_type in scope.split("|", 1)[1]
+        ]
+
+    result = _ScopeSketches(None, [field])
+    for key in keys:
+        if key in data["scopes"]:
+            result.merge(_ScopeSketches(data["scopes"][key], [field]))
+
+    hll, cms, ss = result.fields[field]
+
+    rows = []
+    for value, count, error in ss.top():
+        # both sketches only overestimate, so the smaller one is tighter
+        estimate = min(count, cms.estimate(value))
+        rows.append({"group": value, "count": estimate, "min_count": max(count - error, 0)})
+
+    rows.sort(key=lambda r: (-r["count"], r["group"]))
+
+    return {
+        "n": result.n,
+        "distinct": hll.estimate() if result.n else 0,
+        "distinct_error": hll.relative_error,
+        "count_error": round(cms.epsilon * result.n),
+        "rows": rows[:limit] if limit else rows,
+    }
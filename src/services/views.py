@@ -0,0 +1,183 @@
+from typing import List, Dict, Optional
+from pathlib import Path
+import json
+
+from src.core.config import settings
+from src.core.logger import get_logger
+from src.utils.query import compile_field, normalize_text
+
+logger = get_logger(__name__)
+
+VIEWS_FILE = settings.cache_dir / "group_views.json"
+GROUP_FIELDS = settings.rank_materialized_groups
+
+
+# -----------------------------
+# Materialized group counts
+# -----------------------------
+# Per-field {value: count} maps for the commonly grouped fields declared in
+# config (POLIS_SCANNER_RANK_MATERIALIZED_GROUPS). They are kept up to date by
+# refresh_events so an unfiltered 'rank --group <field>' never has to rescan
+# the stored events. Ingest only adds the new events to views that are
+# current; missing or outdated views are rebuilt on first use instead, so a
+# refresh never rescans the store either.
+
+def source_stat(data_file: Path) -> Optional[Dict]:
+    if not data_file.exists():
+        return None
+
+    stat = data_file.stat()
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def restamp_source(path: Path, source_before: Optional[Dict], data_file: Path) -> bool:
+    """
+    Point a file describing data_file at source_before (views, sketches,
+    state...) at its current stat, after a rewrite that did not change
+    anything it depends on. False if it described another version.
+    """
+
+    if not path.exists() or path.stat().st_size == 0:
+        return False
+
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+
+    except json.JSONDecodeError:
+        return False
+
+    if not isinstance(data, dict) or data.get("source") != source_before:
+        return False
+
+    data["source"] = source_stat(data_file)
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+    return True
+
+
+def _count_into(counts: Dict[str, Dict[str, int]], events: List[Dict]) -> None:
+    for field, values in counts.items():
+        get = compile_field(field)
+        for e in events:
+            key = normalize_text(get(e))
+            if not key:
+                continue
+
+            values[key] = values.get(key, 0) + 1
+
+
+def load_group_views(views_file: Path = VIEWS_FILE) -> Dict:
+    """Load saved group views, safely handling missing/empty/invalid JSON"""
+
+    if not views_file.exists() or views_file.stat().st_size == 0:
+        return {}
+
+    try:
+        with views_file.open("r", encoding="utf-8") as f:
+            views = json.load(f)
+
+    except json.JSONDecodeError:
+        logger.warning(f"{views_file} is empty or corrupt, rebuilding")
+        return {}
+
+    return views if isinstance(views, dict) else {}
+
+
+def save_group_views(views: Dict, views_file: Path = VIEWS_FILE) -> None:
+    views_file.parent.mkdir(parents=True, exist_ok=True)
+    with views_file.open("w", encoding="utf-8") as f:
+        json.dump(views, f, ensure_ascii=False)
+
+
+def is_view_current(views: Dict, data_file: Path, fields=GROUP_FIELDS) -> bool:
+    """True if views were built for these fields and the current data_file"""
+
+    return (
+        bool(views)
+        and views.get("fields") == list(fields)
+        and views.get("source") == source_stat(data_file)
+    )
+
+
+def rebuild_group_views(
+    events: List[Dict],
+    data_file: Path,
+    views_file: Path = VIEWS_FILE,
+    fields=GROUP_FIELDS,
+) -> Dict:
+    """Recount all views from scratch (used on first run or after a mismatch)"""
+
+    counts = {field: {} for field in fields}
+    _count_into(counts, events)
+
+    views = {
+        "fields": list(fields),
+        "source": source_stat(data_file),
+        "counts": counts,
+    }
+    save_group_views(views, views_file)
+
+    logger.debug(f"Rebuilt group views for {list(fields)} from {len(events)} events")
+    return views
+
+
+def update_group_views(
+    new_events: List[Dict],
+    data_file: Path,
+    source_before: Optional[Dict],
+    views_file: Path = VIEWS_FILE,
+    fields=GROUP_FIELDS,
+) -> None:
+    """
+    Add new_events to the views after they were saved to data_file.
+    source_before is the data_file stat taken before saving, used to
+    verify the views still describe the store without new_events;
+    otherwise they are left for get_group_counts to rebuild.
+    """
+
+    if not fields:
+        return
+
+    views = load_group_views(views_file)
+
+    if (
+        not views
+        or views.get("fields") != list(fields)
+        or views.get("source") != source_before
+    ):
+        logger.debug(f"{views_file} is out of date, rebuilt on first use")
+        return
+
+    _count_into(views["counts"], new_events)
+    views["source"] = source_stat(data_file)
+    save_group_views(views, views_file)
+
+
+def get_group_counts(
+    field: str,
+    data_file: Path,
+    views_file: Path = VIEWS_FILE,
+    fields=GROUP_FIELDS,
+) -> Optional[Dict[str, int]]:
+    """
+    Return materialized {value: count} for field, or None if the field
+    is not materialized (caller should fall back to the query engine).
+    """
+
+    if field not in fields:
+        return None
+
+    views = load_group_views(views_file)
+
+    if not is_view_current(views, data_file, fields):
+        from src.services.fetcher import load_events
+
+        events = load_events(data_file)
+        if not events:
+            return None
+
+        views = rebuild_group_views(events, data_file, views_file, fields)
+
+    return views["counts"].get(field)
@@ -0,0 +1,231 @@
+from typing import List, Dict, Optional
+from datetime import datetime
+from pathlib import Path
+import json
+
+from src.core.config import settings
+from src.core.logger import get_logger
+from src.utils.matcher import AhoCorasick
+from src.utils.query import (
+    DEFAULT_FIELDS,
+    compile_field,
+    compile_text_blob,
+    normalize_text,
+    parse_boolean_query,
+)
+
+logger = get_logger(__name__)
+
+WATCHES_FILE = settings.data_dir / "watches.json"
+
+
+# -----------------------------
+# Stored watches
+# -----------------------------
+def load_watches(watches_file: Path = WATCHES_FILE) -> List[Dict]:
+    """Load saved watches, safely handling missing/empty/invalid JSON"""
+
+    if not watches_file.exists() or watches_file.stat().st_size == 0:
+        return []
+
+    try:
+        with watches_file.open("r", encoding="utf-8") as f:
+            watches = json.load(f)
+
+    except json.JSONDecodeError:
+        logger.warning(f"{watches_file} is empty or corrupt, ignoring watches")
+        return []
+
+    return watches if isinstance(watches, list) else []
+
+
+def save_watches(watches: List[Dict], watches_file: Path = WATCHES_FILE) -> None:
+    watches_file.parent.mkdir(parents=True, exist_ok=True)
+    with watches_file.open("w", encoding="utf-8") as f:
+        json.dump(watches, f, indent=2, ensure_ascii=False)
+
+
+def add_watch(query: str, watches_file: Path = WATCHES_FILE) -> Dict:
+    """Validate and store a standing query, raises ValueError on bad syntax"""
+
+    if parse_boolean_query(query) is None:
+        raise ValueError("Empty watch query")
+
+    watches = load_watches(watches_file)
+    watch = {
+        "id": max((w["id"] for w in watches), default=0) + 1,
+        "query": query.strip(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+    }
+
+    watches.append(watch)
+    save_watches(watches, watches_file)
+
+    return watch
+
+
+def remove_watch(watch_id: int, watches_file: Path = WATCHES_FILE) -> bool:
+    watches = load_watches(watches_file)
+    kept = [w for w in watches if w["id"] != watch_id]
+
+    if len(kept) == len(watches):
+        return False
+
+    save_watches(kept, watches_file)
+    return True
+
+
+# -----------------------------
+# Shared matcher
+# -----------------------------
+# All watches are compiled into one matcher. Every distinct term gets an id:
+# unscoped terms go into one Aho-Corasick automaton run over the event text
+# blob, field-scoped terms into a dispatch table of one automaton per field.
+# An event is scanned once per automaton, then only the watches containing
+# a hit term (plus the few that can match without any, e.g. "not x") are
+# evaluated against the hit set. Cost is O(new events), not O(watches).
+
+class WatchMatcher:
+    def __init__(self, watches: List[Dict], fields: List[str] = DEFAULT_FIELDS):
+        self.fields = fields
+        self.watches = []
+        self._blob = compile_text_blob(fields)
+
+        self._term_ids: Dict[tuple, int] = {}
+        self._text = AhoCorasick()
+        self._by_field: Dict[str, tuple] = {}  # field -> (accessor, automaton)
+        self._always_terms = set()
+        self._triggers: Dict[int, List[int]] = {}
+        self._unconditional: List[int] = []
+
+        for watch in watches:
+            try:
+                node = self._compile(parse_boolean_query(watch["query"]))
+
+            except ValueError as e:
+                logger.warning(f"Skipping watch #{watch.get('id')}: {e}")
+                continue
+
+            if node is None:
+                continue
+
+            i = len(self.watches)
+            self.watches.append((watch, node))
+
+            terms = set()
+            self._collect_terms(node, terms)
+            for term_id in terms:
+                self._triggers.setdefault(term_id, []).append(i)
+
+            if self._evaluate(node, self._always_terms):
+                self._unconditional.append(i)
+
+    def _compile(self, node):
+        """Replace term values by term ids, registering new terms"""
+
+        if node is None:
+            return None
+
+        kind = node[0]
+
+        if kind == "term":
+            _, field, value, _ = node
+            key = (field, value)
+
+            term_id = self._term_ids.get(key)
+            if term_id is None:
+                term_id = len(self._term_ids)
+                self._term_ids[key] = term_id
+
+                if not value:
+                    self._always_terms.add(term_id)
+                elif field:
+                    if field not in self._by_field:
+                        self._by_field[field] = (compile_field(field), AhoCorasick())
+                    self._by_field[field][1].add(value, term_id)
+                else:
+                    self._text.add(value, term_id)
+
+            return ("term", term_id)
+
+        if kind == "not":
+            return ("not", self._compile(node[1]))
+
+        return (kind, [self._compile(n) for n in node[1]])
+
+    def _collect_terms(self, node, terms: set) -> None:
+        if node[0] == "term":
+            terms.add(node[1])
+        elif node[0] == "not":
+            self._collect_terms(node[1], terms)
+        else:
+            for child in node[1]:
+                self._collect_terms(child, terms)
+
+    def _evaluate(self, node, hits: set) -> bool:
+        kind = node[0]
+
+        if kind == "term":
+            return node[1] in hits
+
+        if kind == "not":
+            return not self._evaluate(node[1], hits)
+
+        if kind == "and":
+            return all(self._evaluate(n, hits) for n in node[1])
+
+        return any(self._evaluate(n, hits) for n in node[1])
+
+    def match(self, event: Dict) -> List[Dict]:
+        """Watches matching event, in the order they were added"""
+
+        hits = set(self._always_terms)
+
+        if len(self._text):
+            hits |= self._text.find(self._blob(event))
+
+        for get, automaton in self._by_field.values():
+            value = normalize_text(get(event))
+            if value:
+                hits |= automaton.find(value)
+
+        candidates = set(self._unconditional)
+        for term_id in hits:
+            candidates.update(self._triggers.get(term_id, ()))
+
+        return [
+            self.watches[i][0] for i in sorted(candidates)
+            if self._evaluate(self.watches[i][1], hits)
+        ]
+
+
+# Compiled once per watches file version, like load_events
+_matcher_cache = {"key": None, "matcher": None}
+
+
+def get_matcher(watches_file: Path = WATCHES_FILE) -> Optional[WatchMatcher]:
+    if not watches_file.exists():
+        return None
+
+    stat = watches_file.stat()
+    key = (str(watches_file), stat.st_mtime_ns, stat.st_size)
+
+    if _matcher_cache["key"] != key:
+        watches = load_watches(watches_file)
+        _matcher_cache["matcher"] = WatchMatcher(watches) if watches else None
+        _matcher_cache["key"] = key
+
+        logger.debug(f"Compiled {len(watches)} watches")
+
+    return _matcher_cache["matcher"]
+
+
+def match_watches(events: List[Dict], watches_file: Path = WATCHES_FILE) -> List[tuple]:
+    """[(watch, event)] for newly ingested events matching any watch, oldest event first"""
+
+    matcher = get_matcher(watches_file)
+    if matcher is None or not events:
+        return []
+
+    ordered = sorted(events, key=lambda e: e["id"])
+    return [(watch, e) for e in ordered for watch in matcher.match(e)]
@@ -0,0 +1,61 @@
+import time
+from typing import Optional
+
+
+# ==========================================================
+# ADAPTIVE POLL INTERVAL
+# ==========================================================
+#
+# The arrival rate (new events per second) is tracked as an exponentially
+# weighted moving average of what each refresh returned over the time since
+# the previous one. The next interval is the time expected to collect
+# target_events new events at that rate, clamped to [min_s, max_s]. A burst
+# raises the rate and shortens the interval at once, every quiet cycle
+# decays the rate by (1 - alpha) so the interval backs off geometrically.
+
+ALPHA = 0.3
+
+
+class AdaptiveInterval:
+    def __init__(
+        self,
+        initial_s: float,
+        min_s: float,
+        max_s: float,
+        target_events: float = 1.0,
+        alpha: float = ALPHA,
+    ):
+        self.min_s = min_s
+        self.max_s = max(max_s, min_s)
+        self.target_events = target_events
+        self.alpha = alpha
+
+        self.interval = self.clamp(initial_s)
+        self.rate = target_events / self.interval  # events/s, seeded from initial_s
+        self._last: Optional[float] = None
+
+    def clamp(self, seconds: float) -> float:
+        return min(max(seconds, self.min_s), self.max_s)
+
+    def observe(self, new_events: int, now: Optional[float] = None) -> float:
+        """Record a refresh result and return the next interval in seconds"""
+
+        now = time.monotonic() if now is None else now
+
+        if self._last is None:
+            # the first refresh returns the catch-up backlog, not the arrival rate
+            self._last = now
+            return self.interval
+
+        elapsed = max(now - self._last, 1e-3)
+        self._last = now
+
+        sample = new_events / elapsed
+        self.rate = self.alpha * sample + (1 - self.alpha) * self.rate
+
+        if self.rate > 0:
+            self.interval = self.clamp(self.target_events / self.rate)
+        else:
+            self.interval = self.max_s
+
+        return self.interval
@@ -0,0 +1,73 @@
+try:
+    import numpy as np
+except ImportError:  # optional, callers fall back to plain Python
+    np = None
+
+
+# ==========================================================
+# COLUMNAR PIVOT (NumPy)
+# ==========================================================
+#
+# A field column is encoded once as (codes, categories): one small integer
+# per event plus the distinct values in first-seen order. The code rows of
+# several columns are reduced to the cells that actually occur (np.unique
+# over rows), so counts and score sums per pivot cell are one bincount
+# each instead of a dict update per event, and memory follows the number
+# of events rather than the product of the category counts.
+
+def available() -> bool:
+    return np is not None
+
+
+def encode(values: list[str]) -> tuple:
+    """(codes, categories) for a column of normalized values"""
+
+    # dict encoding is O(n) and beats np.unique's sort of unicode arrays
+    mapping = {}
+    codes = np.fromiter(
+        (mapping.setdefault(v, len(mapping)) for v in values),
+        dtype=np.int64,
+        count=len(values)
+    )
+    return codes, list(mapping)
+
+
+def pivot_cells(columns: list[tuple], scores=None) -> tuple:
+    """
+    (cells, counts, score_sums) for the non-empty pivot cells, cells holding
+    one row of category codes (one per column) per cell.
+    """
+
+    rows = np.stack([np.asarray(codes, dtype=np.int64) for codes, _ in columns], axis=1)
+    cells, inverse = np.unique(rows, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    counts = np.bincount(inverse, minlength=len(cells))
+
+    if scores is None:
+        score_sums = np.zeros(len(cells), dtype=np.int64)
+    else:
+        score_sums = np.bincount(inverse, weights=np.asarray(scores, dtype=np.float64), minlength=len(cells))
+
+    return cells, counts, score_sums
+
+
+def pivot_partials(columns: list[tuple], scores=None) -> dict[tuple, dict]:
+    """Non-empty pivot cells as {(value1, value2, ...): {count, score_sum}}"""
+
+    if not len(columns[0][0]):
+        return {}
+
+    cells, counts, score_sums = pivot_cells(columns, scores)
+    groups = {}
+
+    for cell, count, score_sum in zip(cells.tolist(), counts.tolist(), score_sums.tolist()):
+        key = tuple(categories[i] for (_, categories), i in zip(columns, cell))
+
+        # like group_partials, events missing any grouped value are skipped
+        if not all(key):
+            continue
+
+        groups[key] = {"count": count, "score_sum": int(score_sum)}
+
+    return groups
@@ -0,0 +1,239 @@
+from typing import Any
+
+from src.core.logger import get_logger
+from src.utils import columnar
+from src.utils.query import compile_field, compile_text_blob, normalize_text
+
+logger = get_logger(__name__)
+
+
+# ==========================================================
+# EVENT INDEX
+# ==========================================================
+#
+# In-memory inverted index over one list of events. Events are referred to
+# by their position in that list; posting sets are plain Python sets of
+# positions so boolean queries become C-level set algebra.
+#
+# Per field these are built lazily on first use:
+#   columns[field]: [normalized value per position] -> facet counts
+#   codes[field]:   (NumPy codes, categories)       -> pivot grouping
+#   values[field]: {normalized value: positions}   -> field-scoped terms
+#   tokens[field]: {whitespace token: positions}   -> unscoped terms
+#
+# Terms keep the engine's substring semantics by scanning the (small)
+# vocabulary instead of the events.
+#
+# Orderings for keyset pagination: list order (the store keeps newest id
+# first) and by_datetime, the engine's default result order.
+
+class EventIndex:
+    def __init__(self, events: list[dict]):
+        self.events = events
+        self.universe = frozenset(range(len(events)))
+        self.id_pos = {e.get("id"): i for i, e in enumerate(events)}
+
+        self._columns: dict[str, list[str]] = {}
+        self._codes: dict[str, tuple] = {}
+        self._tokens: dict[str, dict[str, set]] = {}
+        self._values: dict[str, dict[str, set]] = {}
+        self._term_cache: dict[tuple, frozenset] = {}
+        self._by_datetime: list[int] | None = None
+        self._datetime_rank: list[int] | None = None
+
+    # --------------------------------------------------
+    # Orderings
+    # --------------------------------------------------
+
+    @property
+    def by_datetime(self) -> list[int]:
+        """Positions newest datetime first, ties in list order (stable like query_events)"""
+
+        if self._by_datetime is None:
+            get_datetime = compile_field("datetime")
+            datetimes = [get_datetime(e) or "" for e in self.events]
+            self._by_datetime = sorted(
+                range(len(self.events)),
+                key=lambda pos: datetimes[pos],
+                reverse=True
+            )
+
+            self._datetime_rank = [0] * len(self.events)
+            for rank, pos in enumerate(self._by_datetime):
+                self._datetime_rank[pos] = rank
+
+        return self._by_datetime
+
+    def datetime_rank(self, pos: int) -> int:
+        self.by_datetime
+        return self._datetime_rank[pos]
+
+    # --------------------------------------------------
+    # Posting maps
+    # --------------------------------------------------
+
+    def column(self, field: str) -> list[str]:
+        column = self._columns.get(field)
+
+        if column is None:
+            get = compile_field(field)
+            column = [normalize_text(get(e)) for e in self.events]
+            self._columns[field] = column
+
+        return column
+
+    def codes(self, field: str) -> tuple:
+        """Column encoded as (codes, categories), requires NumPy"""
+
+        encoded = self._codes.get(field)
+
+        if encoded is None:
+            encoded = columnar.encode(self.column(field))
+            self._codes[field] = encoded
+
+        return encoded
+
+    def values(self, field: str) -> dict[str, set]:
+        postings = self._values.get(field)
+
+        if postings is None:
+            postings = {}
+            for pos, value in enumerate(self.column(field)):
+                postings.setdefault(value, set()).add(pos)
+
+            self._values[field] = postings
+
+        return postings
+
+    def tokens(self, field: str) -> dict[str, set]:
+        postings = self._tokens.get(field)
+
+        if postings is None:
+            postings = {}
+            for value, positions in self.values(field).items():
+                for token in value.split():
+                    postings.setdefault(token, set()).update(positions)
+
+            self._tokens[field] = postings
+
+        return postings
+
+    # --------------------------------------------------
+    # Term lookup
+    # --------------------------------------------------
+
+    def _scan(self, vocabulary: dict[str, set], term: str) -> set:
+        result = set()
+
+        for key, positions in vocabulary.items():
+            if term in key:
+                result |= positions
+
+        return result
+
+    def term(self, field: str | None, value: str, phrase: bool, fields: list[str]) -> frozenset:
+        """Positions of events matching one term node"""
+
+        cache_key = (field, value, phrase, tuple(fields))
+        cached = self._term_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        if field:
+            result = self._scan(self.values(field), value)
+
+        elif not value:
+            result = set(self.universe)
+
+        elif " " not in value:
+            result = set()
+            for f in fields:
+                result |= self._scan(self.tokens(f), value)
+
+        else:
+            # phrase: every word must be present, then verify adjacency
+            # on the few remaining candidates only
+            candidates = None
+            for word in value.split():
+                positions = self.term(None, word, False, fields)
+                candidates = positions if candidates is None else candidates & positions
+
+            blob = compile_text_blob(fields)
+            result = {
+                pos for pos in candidates
+                if value in blob(self.events[pos])
+            }
+
+        result = frozenset(result)
+        self._term_cache[cache_key] = result
+        return result
+
+    # --------------------------------------------------
+    # Boolean evaluation
+    # --------------------------------------------------
+
+    def evaluate(self, node: tuple | None, fields: list[str]) -> frozenset:
+        """Evaluate a parse_boolean_query node tree into a set of positions"""
+
+        if node is None:
+            return self.universe
+
+        kind = node[0]
+
+        if kind == "term":
+            _, field, value, phrase = node
+            return self.term(field, value, phrase, fields)
+
+        if kind == "not":
+            return self.universe - self.evaluate(node[1], fields)
+
+        if kind == "or":
+            result = set()
+            for child in node[1]:
+                result |= self.evaluate(child, fields)
+
+            return frozenset(result)
+
+        # AND: intersect positives smallest first, then subtract negatives
+        # so "a and not b" never materializes the complement of b
+        positives = [self.evaluate(c, fields) for c in node[1] if c[0] != "not"]
+        negatives = [self.evaluate(c[1], fields) for c in node[1] if c[0] == "not"]
+
+        if positives:
+            positives.sort(key=len)
+            result = set(positives[0])
+            for positions in positives[1:]:
+                result &= positions
+                if not result:
+                    break
+
+        else:
+            result = set(self.universe)
+
+        for positions in negatives:
+            result -= positions
+
+        return frozenset(result)
+
+    def select(self, positions) -> list[dict]:
+        """Events at positions, in original list order"""
+
+        return [self.events[pos] for pos in sorted(positions)]
+
+
+# -----------------------------
+# Index cache
+# -----------------------------
+# load_events returns the same list object while the stored file is
+# unchanged, so one index per list object is reused across queries.
+
+_cache: dict[str, Any] = {"events": None, "index": None}
+
+
+def get_index(events: list[dict]) -> EventIndex:
+    if _cache["events"] is not events:
+        _cache["index"] = EventIndex(events)
+        _cache["events"] = events
+        logger.debug(f"Built event index over {len(events)} events")
+
+    return _cache["index"]
@@ -0,0 +1,81 @@
+from collections import deque
+
+
+# ==========================================================
+# AHO-CORASICK
+# ==========================================================
+#
+# Multi-pattern substring matcher: one pass over the text reports every
+# added pattern that occurs in it, however many patterns there are. Used by
+# the watch rules so new events are scanned once for all rule terms.
+
+class AhoCorasick:
+    def __init__(self):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[set] = [set()]
+        self._built = True
+
+    def __len__(self) -> int:
+        return len(self._goto) - 1
+
+    def add(self, pattern: str, key) -> None:
+        """Report key whenever pattern occurs in a searched text"""
+
+        node = 0
+        for char in pattern:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(set())
+            node = nxt
+
+        self._out[node].add(key)
+        self._built = False
+
+    def build(self) -> None:
+        """Compute failure links (breadth first), called lazily by find"""
+
+        queue = deque()
+        for node in self._goto[0].values():
+            self._fail[node] = 0
+            queue.append(node)
+
+        while queue:
+            node = queue.popleft()
+
+            for char, child in self._goto[node].items():
+                queue.append(child)
+
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._out[child] |= self._out[self._fail[child]]
+
+        self._built = True
+
+    def find(self, text: str) -> set:
+        """Keys of all patterns occurring in text"""
+
+        if not self._built:
+            self.build()
+
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        node = 0
+
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+
+            node = goto[node].get(char, 0)
+
+            if out[node]:
+                found |= out[node]
+
+        return found
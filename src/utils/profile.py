@@ -0,0 +1,109 @@
+from contextlib import contextmanager
+import time
+import tracemalloc
+
+from src.ui.log_buffer import log_buffer
+
+
+# ==========================================================
+# QUERY PROFILE
+# ==========================================================
+#
+# Collects the plan steps chosen for a query and wall time / row counts per
+# stage, optionally peak memory allocated per stage (tracemalloc, which
+# slows Python down noticeably so it is only enabled for --profile).
+
+class Stage:
+    __slots__ = ("name", "seconds", "rows_in", "rows_out", "peak_bytes")
+
+    def __init__(self, name: str, rows_in: int | None = None):
+        self.name = name
+        self.seconds = 0.0
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.peak_bytes = None
+
+
+class QueryProfile:
+    def __init__(self, memory: bool = False):
+        self.memory = memory
+        self.plan: list[str] = []
+        self.stages: list[Stage] = []
+        self._started_tracing = False
+
+    def note(self, step: str) -> None:
+        self.plan.append(step)
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int | None = None):
+        record = Stage(name, rows_in)
+
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        try:
+            yield record
+
+        finally:
+            record.seconds = time.perf_counter() - start
+
+            if self.memory:
+                record.peak_bytes = max(tracemalloc.get_traced_memory()[1] - base, 0)
+
+            self.stages.append(record)
+
+    def close(self) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def report(self) -> list[str]:
+        self.close()
+
+        lines = [f"plan: {step}" for step in self.plan]
+        total = 0.0
+
+        for s in self.stages:
+            total += s.seconds
+            rows = ""
+            if s.rows_in is not None or s.rows_out is not None:
+                rows = f" rows {s.rows_in if s.rows_in is not None else '-'} → {s.rows_out if s.rows_out is not None else '-'}"
+
+            memory = f" peak +{s.peak_bytes / 1024:.1f} KiB" if s.peak_bytes is not None else ""
+            lines.append(f"stage {s.name}: {s.seconds * 1000:.2f} ms{rows}{memory}")
+
+        lines.append(f"total: {total * 1000:.2f} ms")
+        return lines
+
+
+class _NoStage:
+    """Stand-in record when no profile is collected"""
+
+    __slots__ = ("rows_out",)
+
+
+@contextmanager
+def _no_stage(name: str, rows_in: int | None = None):
+    yield _NoStage()
+
+
+def stage_of(profile: QueryProfile | None):
+    """profile.stage, or a no-op context manager when profile is None"""
+
+    return profile.stage if profile is not None else _no_stage
+
+
+def write_profile(profile: QueryProfile | None) -> None:
+    """Write the --explain report to the output buffer"""
+
+    if profile is None:
+        return
+
+    for line in profile.report():
+        log_buffer.write(f"EXPLAIN: {line}")
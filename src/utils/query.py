@@ -1,8 +1,11 @@
 from typing import Any
+from functools import lru_cache
 import re
 
 from src.core.logger import get_logger
 from src.core.config import settings
+from src.utils import columnar
+from src.utils.profile import QueryProfile, stage_of
 
 logger = get_logger(__name__)
 
@@ -48,7 +51,21 @@ def parse_interval(value: str | list[str]) -> int:
     return number * multipliers[unit]
 
 
+def parse_count(flag: str, value: str | None) -> int | None:
+    """Non-negative integer option value, raises ValueError naming the flag"""
+
+    if not value:
+        return None
+
+    if not value.isdigit():
+        raise ValueError(f"{flag} must be a number")
+
+    return int(value)
+
+
 def parse_query(args: list[str] | str) -> dict:
+    """Parse search/rank/load options, raises ValueError for a bad number"""
+
     args = " ".join(args) if isinstance(args, list) else args
     if not args:
         return {}
@@ -64,8 +81,17 @@ def parse_query(args: list[str] | str) -> dict:
     limit = extract("--limit")
     sort = extract("--sort")
     strict = extract("--strict")
+    boolean_query = extract("--query")
+    page_size = extract("--page-size")
+    facets = extract("--facets")
+    after = extract("--after")
+    approx = re.search(r"--approx\b", args) is not None
+    explain = re.search(r"--explain\b", args) is not None
+    profile = re.search(r"--profile\b", args) is not None
+    dedupe = re.search(r"--dedupe\b", args) is not None
 
     fields = fields.split() if fields else None
+    facets = facets.split() if facets else None
 
     if filters:
         parts = filters.split()
@@ -76,8 +102,9 @@ def parse_query(args: list[str] | str) -> dict:
 
     sort = sort.split() if sort else None
 
-    if limit:
-        limit = int(limit)
+    limit = parse_count("--limit", limit)
+    page_size = parse_count("--page-size", page_size)
+    after = parse_count("--after", after)
 
     if strict and strict == "true":
         strict = True
@@ -95,7 +122,15 @@ def parse_query(args: list[str] | str) -> dict:
         "group": group_by,
         "limit": limit,
         "sort": sort,
-        "strict": strict
+        "strict": strict,
+        "query": boolean_query,
+        "page_size": page_size,
+        "after": after,
+        "facets": facets,
+        "approx": approx,
+        "dedupe": dedupe,
+        "explain": explain or profile,
+        "profile": profile
     }
 
 
@@ -110,54 +145,506 @@ def normalize_text(value: Any) -> str:
     return str(value).lower().strip()
 
 
+# Accessors are compiled once per field (or field list) and cached, so the
+# hot loops below never split field paths per event.
+
+@lru_cache(maxsize=256)
+def compile_field(field: str):
+    """Compiled get_field for one (possibly dotted) field path"""
+
+    parts = tuple(field.split("."))
+
+    if len(parts) == 1:
+        key = parts[0]
+        return lambda event: event.get(key) if isinstance(event, dict) else None
+
+    if len(parts) == 2:
+        outer, inner = parts
+
+        def get_nested(event):
+            value = event.get(outer) if isinstance(event, dict) else None
+            return value.get(inner) if isinstance(value, dict) else None
+
+        return get_nested
+
+    def get_path(event):
+        value = event
+        for part in parts:
+            if not isinstance(value, dict):
+                return None
+
+            value = value.get(part)
+
+        return value
+
+    return get_path
+
+
 def get_field(event: dict, field: str):
-    parts = field.split(".")
-    value = event
-    for part in parts:
-        if not isinstance(value, dict):
-            return None
-            
-        value = value.get(part)
-        
-    return value
+    return compile_field(field)(event)
+
+
+@lru_cache(maxsize=64)
+def _compile_text_blob(fields: tuple[str, ...]):
+    getters = [compile_field(f) for f in fields]
+
+    def blob(event: dict) -> str:
+        values = []
+        for get in getters:
+            v = get(event)
+
+            if v is not None:
+                values.append(str(v).lower().strip())
+
+        return " ".join(values)
+
+    return blob
+
+
+def compile_text_blob(fields: list[str]):
+    """Compiled event_text_blob for a field list"""
+
+    return _compile_text_blob(tuple(fields))
 
 
 def event_text_blob(event: dict, fields: list[str]) -> str:
-    values = []
-    for f in fields:
-        v = get_field(event, f)
-        
-        if v is not None:
-            values.append(normalize_text(v))
-            
-    return " ".join(values)
+    return compile_text_blob(fields)(event)
+
+
+def compile_scorer(text, filters, fields):
+    """Compiled score_query_event for one query"""
+
+    words = normalize_text(text).split() if text else []
+    blob = compile_text_blob(fields) if words else None
+    filter_items = [
+        (compile_field(f), normalize_text(val)) for f, val in (filters or {}).items()
+    ]
+
+    def score(event: dict) -> int:
+        total = 0
+
+        if words:
+            text_blob = blob(event)
+            for w in words:
+                if w in text_blob:
+                    total += 1
+
+        for get, val in filter_items:
+            if val in normalize_text(get(event)):
+                total += 1
+
+        return total
+
+    return score
 
 
 def score_query_event(event, text, filters, fields):
-    score = 0
+    return compile_scorer(text, filters, fields)(event)
 
-    if text:
-        blob = event_text_blob(event, fields)
-        words = normalize_text(text).split()
-        
-        for w in words:
-            if w in blob:
-                score += 1
 
-    if filters:
-        for f, val in filters.items():
-            field_value = normalize_text(get_field(event, f))
+def rank_groups(
+    groups: dict[str, dict],
+    *,
+    sort: list[str] | None = None,
+    limit: int | None = None,
+) -> list[dict]:
+    """Turn group partials ({key: {count, score_sum}}) into sorted rank rows"""
+
+    result = []
+
+    for k, v in groups.items():
+        avg_score = v["score_sum"] / v["count"] if v["count"] else 0
+        result.append({
+            "group": k,
+            "count": v["count"],
+            "avg_score": round(avg_score, 3),
+        })
+
+    if sort:
+        def group_sort_key(row):
+            values = []
             
-            if normalize_text(val) in field_value:
-                score += 1
+            for field in sort:
+                values.append(row.get(field))
+                
+            return tuple(values)
 
-    return score
+        result.sort(key=group_sort_key, reverse=True)
+        
+    else:
+        
+        result.sort(key=lambda x: (-x["avg_score"], -x["count"], x["group"]))
+
+    return result[:limit] if limit else result
+
+
+# ==========================================================
+# BOOLEAN QUERY
+# ==========================================================
+#
+# Grammar (operators are case-insensitive, AND is implicit):
+#
+#   expr  := and ("or" and)*
+#   and   := unary (["and"] unary)*
+#   unary := "not" unary | "(" expr ")" | term
+#   term  := [field ":"] (word | "quoted phrase")
+#
+# Unscoped terms match as substrings of the searched fields (same as --text),
+# field-scoped terms match as substrings of that field (same as --filters).
+# Parsed nodes are tuples:
+#   ("and", [nodes]), ("or", [nodes]), ("not", node),
+#   ("term", field | None, value, is_phrase)
+
+_QUERY_TOKEN_RE = re.compile(
+    r'\s*(?:(\()|(\))|([a-z_][\w.]*):"([^"]*)"?|"([^"]*)"?|([^\s()"]+))',
+    re.IGNORECASE
+)
+_FIELD_TERM_RE = re.compile(r"^([a-z_][\w.]*):(.+)$", re.IGNORECASE)
+_OPERATORS = ("and", "or", "not")
+
+
+def _tokenize_boolean_query(text: str) -> list[tuple]:
+    tokens = []
+    pos = 0
+    text = text.strip()
+
+    while pos < len(text):
+        match = _QUERY_TOKEN_RE.match(text, pos)
+        if not match or match.end() == pos:
+            raise ValueError(f"Unexpected character in query at position {pos}")
+
+        pos = match.end()
+        lparen, rparen, field, field_phrase, phrase, word = match.groups()
+
+        if lparen:
+            tokens.append(("(",))
+        elif rparen:
+            tokens.append((")",))
+        elif field is not None:
+            tokens.append(("term", field.lower(), normalize_text(field_phrase), True))
+        elif phrase is not None:
+            tokens.append(("term", None, normalize_text(phrase), True))
+        elif word.lower() in _OPERATORS:
+            tokens.append((word.lower(),))
+        else:
+            scoped = _FIELD_TERM_RE.match(word)
+            if scoped:
+                tokens.append(("term", scoped.group(1).lower(), normalize_text(scoped.group(2)), False))
+            else:
+                tokens.append(("term", None, normalize_text(word), False))
+
+    return tokens
+
+
+def parse_boolean_query(text: str | None) -> tuple | None:
+    """Parse a boolean query string into a node tree, None if empty"""
+
+    if not text or not text.strip():
+        return None
+
+    tokens = _tokenize_boolean_query(text)
+    pos = 0
+
+    def peek():
+        return tokens[pos][0] if pos < len(tokens) else None
+
+    def parse_or():
+        nonlocal pos
+        nodes = [parse_and()]
+
+        while peek() == "or":
+            pos += 1
+            nodes.append(parse_and())
+
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def parse_and():
+        nonlocal pos
+        nodes = [parse_unary()]
+
+        while peek() not in (None, "or", ")"):
+            if peek() == "and":
+                pos += 1
+            nodes.append(parse_unary())
+
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    def parse_unary():
+        nonlocal pos
+        kind = peek()
+
+        if kind == "not":
+            pos += 1
+            return ("not", parse_unary())
+
+        if kind == "(":
+            pos += 1
+            node = parse_or()
+            if peek() != ")":
+                raise ValueError("Missing closing parenthesis in query")
+            pos += 1
+            return node
+
+        if kind == "term":
+            token = tokens[pos]
+            pos += 1
+            return token
+
+        raise ValueError(f"Unexpected '{kind or 'end of query'}' in query")
+
+    node = parse_or()
+
+    if pos != len(tokens):
+        raise ValueError(f"Unexpected '{peek()}' in query")
+
+    return node
+
+
+def compile_boolean_query(node: tuple | None, fields: list[str]):
+    """Compile a parsed query into a per-event predicate (used without an index)"""
+
+    if node is None:
+        return lambda e: True
+
+    kind = node[0]
+
+    if kind == "term":
+        _, field, value, _ = node
+
+        if field:
+            get = compile_field(field)
+            return lambda e: value in normalize_text(get(e))
+
+        blob = compile_text_blob(fields)
+        return lambda e: value in blob(e)
+
+    if kind == "not":
+        inner = compile_boolean_query(node[1], fields)
+        return lambda e: not inner(e)
+
+    children = [compile_boolean_query(n, fields) for n in node[1]]
+
+    if kind == "and":
+        return lambda e: all(c(e) for c in children)
+
+    return lambda e: any(c(e) for c in children)
+
+
+def apply_boolean_query(
+    events: list[dict],
+    query: str | tuple | None,
+    fields: list[str],
+    index=None,
+) -> list[dict]:
+    """
+    Keep events matching the boolean query, in their original order.
+    With an EventIndex built over these exact events the query runs as set
+    operations over posting sets, otherwise as a compiled predicate.
+    """
+
+    node = parse_boolean_query(query) if isinstance(query, str) else query
+
+    if node is None:
+        return events
+
+    if index is not None and index.events is events:
+        return index.select(index.evaluate(node, fields))
+
+    match = compile_boolean_query(node, fields)
+    return [e for e in events if match(e)]
 
 
 # ==========================================================
 # QUERY ENGINE
 # ==========================================================
 
+# body is only present on events enriched from their detail page
+DEFAULT_FIELDS = ["name", "summary", "type", "location.name", "body"]
+
+
+def compile_hard_filter(
+    *,
+    text: str | None = None,
+    fields: list[str] | None = None,
+    filters: dict[str, str] | None = None,
+):
+    """Per-event predicate: matches all filters and all text words"""
+
+    filter_items = [(compile_field(f), normalize_text(val)) for f, val in (filters or {}).items()]
+    words = normalize_text(text).split() if text else []
+    text_blob = compile_text_blob(fields) if words else None
+
+    def match(e: dict) -> bool:
+        for get, val in filter_items:
+            if val not in normalize_text(get(e)):
+                return False
+
+        if words:
+            blob = text_blob(e)
+            return all(w in blob for w in words)
+
+        return True
+
+    return match
+
+
+def filter_events(
+    events: list[dict],
+    *,
+    text: str | None = None,
+    fields: list[str] | None = None,
+    filters: dict[str, str] | None = None,
+) -> list[dict]:
+    """Hard filtering: keep events matching all filters and all text words"""
+
+    if not text and not filters:
+        return events
+
+    match = compile_hard_filter(text=text, fields=fields, filters=filters)
+    return [e for e in events if match(e)]
+
+
+def group_partials(
+    events: list[dict],
+    *,
+    group_by: str,
+    text: str | None = None,
+    fields: list[str] | None = None,
+    filters: dict[str, str] | None = None,
+) -> dict[str, dict]:
+    """Count and sum scores per group key, mergeable across event subsets"""
+
+    groups = {}
+    get_group = compile_field(group_by)
+    score_event = compile_scorer(text, filters, fields)
+
+    for e in events:
+        key = normalize_text(get_group(e))
+        if not key:
+            continue
+
+        if key not in groups:
+            groups[key] = {"count": 0, "score_sum": 0}
+
+        score = score_event(e)
+
+        groups[key]["count"] += 1
+        groups[key]["score_sum"] += score
+
+    return groups
+
+
+def group_fields(group_by: str | list[str]) -> list[str]:
+    """'type,location.name' -> ['type', 'location.name']"""
+
+    if isinstance(group_by, (list, tuple)):
+        return list(group_by)
+
+    return [f.strip() for f in group_by.split(",") if f.strip()]
+
+
+def pivot_partials(
+    events: list[dict],
+    *,
+    group_by: list[str],
+    text: str | None = None,
+    fields: list[str] | None = None,
+    filters: dict[str, str] | None = None,
+    index=None,
+) -> dict[tuple, dict]:
+    """
+    group_partials over several fields in one pass, keyed by value tuples.
+    With NumPy the cells come from combined categorical codes (the codes
+    of an EventIndex over these events' source list when given).
+    """
+
+    scores = None
+    if text or filters:
+        score_event = compile_scorer(text, filters, fields)
+        scores = [score_event(e) for e in events]
+
+    if columnar.available():
+        if index is not None:
+            positions = [index.id_pos[e.get("id")] for e in events]
+            columns = []
+            for field in group_by:
+                codes, categories = index.codes(field)
+                columns.append((codes[positions], categories))
+
+        else:
+            columns = [
+                columnar.encode([normalize_text(get(e)) for e in events])
+                for get in map(compile_field, group_by)
+            ]
+
+        return columnar.pivot_partials(columns, scores)
+
+    groups = {}
+    getters = [compile_field(f) for f in group_by]
+
+    for i, e in enumerate(events):
+        key = tuple([normalize_text(get(e)) for get in getters])
+        if not all(key):
+            continue
+
+        if key not in groups:
+            groups[key] = {"count": 0, "score_sum": 0}
+
+        groups[key]["count"] += 1
+        groups[key]["score_sum"] += scores[i] if scores else 0
+
+    return groups
+
+
+def facet_counter(facets: list[str], index=None):
+    """
+    ({field: {value: count}}, add(event)) for counting facets while a
+    result set is built. With an EventIndex over the events being counted
+    the normalized values come from its columns instead of the events.
+    """
+
+    counts = {field: {} for field in facets}
+
+    if index is not None:
+        id_pos = index.id_pos
+        getters = [
+            (counts[f], lambda e, column=index.column(f): column[id_pos[e.get("id")]])
+            for f in facets
+        ]
+
+    else:
+        getters = [
+            (counts[f], lambda e, get=compile_field(f): normalize_text(get(e)))
+            for f in facets
+        ]
+
+    def add(event: dict) -> None:
+        for table, get in getters:
+            value = get(event)
+            if value:
+                table[value] = table.get(value, 0) + 1
+
+    return counts, add
+
+
+def event_sort_key(sort: list[str] | None = None):
+    """Sort key for scored events (used with reverse=True)"""
+
+    if sort:
+        getters = [
+            (lambda e: e.get("score", 0)) if field == "score" else compile_field(field)
+            for field in sort
+        ]
+
+        def key(event):
+            return tuple([get(event) for get in getters])
+
+        return key
+
+    get_datetime = compile_field("datetime")
+    return lambda e: (e.get("score", 0), get_datetime(e))
+
+
 def query_events(
     events: list[dict],
     *,
@@ -168,135 +655,162 @@ def query_events(
     sort: list[str] | None = None,
     limit: int | None = None,
     strict: bool = True,
-) -> list:
+    query: str | tuple | None = None,
+    facets: list[str] | None = None,
+    exclude_ids: set | None = None,
+    index=None,
+    profile: QueryProfile | None = None,
+) -> list | tuple[list, dict]:
+    """
+    Events (or group rows with group_by) matching the query. With facets
+    (event mode only) returns (events, {field: {value: count}}), counted
+    over all matches before limit in the same pass that copies them.
+    exclude_ids (e.g. superseded near-duplicates) are dropped after
+    filtering.
+    """
 
     if not fields or fields == "all":
-        fields = ["name", "summary", "type", "location.name"]
+        fields = DEFAULT_FIELDS
+
+    stage = stage_of(profile)
+    indexed = index is not None and index.events is events
 
     # ------------------------------------------------------
-    # HARD FILTERING
+    # BOOLEAN QUERY (always a hard filter)
     # ------------------------------------------------------
-    if strict:
-        filtered = []
-
-        for e in events:
-            ok = True
+    if query:
+        if profile:
+            profile.note(
+                "boolean query via index posting sets" if indexed
+                else "boolean query via predicate scan"
+            )
 
-            if filters:
-                for f, val in filters.items():
-                    field_value = normalize_text(get_field(e, f))
-                    
-                    if normalize_text(val) not in field_value:
-                        ok = False
-                        break
+        with stage("boolean query", len(events)) as s:
+            events = apply_boolean_query(events, query, fields, index)
+            s.rows_out = len(events)
 
-            if ok:
-                filtered.append(e)
-
-        events = filtered
+    # ------------------------------------------------------
+    # HARD FILTERING
+    # ------------------------------------------------------
+    if strict:
+        if filters:
+            with stage("filter fields", len(events)) as s:
+                events = filter_events(events, filters=filters)
+                s.rows_out = len(events)
 
         if text:
-            words = normalize_text(text).split()
-            filtered = []
+            with stage("text blobs + match", len(events)) as s:
+                events = filter_events(events, text=text, fields=fields)
+                s.rows_out = len(events)
 
-            for e in events:
-                blob = event_text_blob(e, fields)
-                
-                if all(w in blob for w in words):
-                    filtered.append(e)
+    if exclude_ids:
+        if profile:
+            profile.note(f"excluding {len(exclude_ids)} superseded near-duplicates")
 
-            events = filtered
+        with stage("dedupe", len(events)) as s:
+            events = [e for e in events if e.get("id") not in exclude_ids]
+            s.rows_out = len(events)
 
     # ------------------------------------------------------
     # GROUP MODE
     # ------------------------------------------------------
 
     if group_by:
-        groups = {}
+        pivot = group_fields(group_by)
+
+        if len(pivot) > 1:
+            if profile:
+                profile.note(
+                    f"pivot {' × '.join(pivot)} via "
+                    + ("NumPy categorical codes" if columnar.available() else "dict of value tuples")
+                    + (" from index" if indexed and columnar.available() else "")
+                )
+
+            with stage("pivot + score", len(events)) as s:
+                groups = pivot_partials(
+                    events,
+                    group_by=pivot,
+                    text=text,
+                    fields=fields,
+                    filters=filters,
+                    index=index if indexed else None
+                )
+                s.rows_out = len(groups)
 
-        for e in events:
-            key = normalize_text(get_field(e, group_by))
-            if not key:
-                continue
-
-            if key not in groups:
-                groups[key] = {"count": 0, "score_sum": 0}
-
-            score = score_query_event(e, text, filters, fields)
-
-            groups[key]["count"] += 1
-            groups[key]["score_sum"] += score
+        else:
+            if profile:
+                profile.note(f"group by {group_by}")
 
-        result = []
+            with stage("group + score", len(events)) as s:
+                groups = group_partials(
+                    events,
+                    group_by=group_by,
+                    text=text,
+                    fields=fields,
+                    filters=filters
+                )
+                s.rows_out = len(groups)
 
-        for k, v in groups.items():
-            avg_score = v["score_sum"] / v["count"] if v["count"] else 0
-            result.append({
-                "group": k,
-                "count": v["count"],
-                "avg_score": round(avg_score, 3),
-            })
+        with stage("sort + limit groups", len(groups)) as s:
+            result = rank_groups(groups, sort=sort, limit=limit)
+            s.rows_out = len(result)
 
-        if sort:
-            def group_sort_key(row):
-                values = []
-                
-                for field in sort:
-                    values.append(row.get(field))
-                    
-                return tuple(values)
-
-            result.sort(key=group_sort_key, reverse=True)
-            
-        else:
-            
-            result.sort(key=lambda x: (-x["avg_score"], -x["count"], x["group"]))
-
-        return result[:limit] if limit else result
+        return result
 
     # ------------------------------------------------------
     # EVENT MODE
     # ------------------------------------------------------
 
+    facet_counts = None
+    if facets:
+        if profile:
+            profile.note(
+                f"facets {' '.join(facets)} counted in the same pass"
+                + (" from index columns" if indexed else "")
+            )
+
+        facet_counts, count_facets = facet_counter(facets, index if indexed else None)
+
     if not strict:
-        scored = []
-        for e in events:
-            score = score_query_event(e, text, filters, fields)
-            if not score:
-                continue # ignore events without any match score
+        with stage("text blobs + score" + (" + facets" if facets else ""), len(events)) as s:
+            score_event = compile_scorer(text, filters, fields)
+            scored = []
+            for e in events:
+                score = score_event(e)
+                if not score:
+                    continue # ignore events without any match score
+
+                if facets:
+                    count_facets(e)
+                    
+                event_copy = dict(e)
+                event_copy["score"] = score
+                scored.append(event_copy)
                 
-            event_copy = dict(e)
-            event_copy["score"] = score
-            scored.append(event_copy)
-            
-        events = scored
+            events = scored
+            s.rows_out = len(events)
         
     else:
-        non_scored = []
-        for e in events:
-            event_copy = dict(e)
-            event_copy["score"] = 0
-            non_scored.append(event_copy)
-            
-        events = non_scored
+        with stage("copy" + (" + facets" if facets else ""), len(events)) as s:
+            non_scored = []
+            for e in events:
+                if facets:
+                    count_facets(e)
 
-    if sort:
-        def event_sort_key(event):
-            values = []
-            for field in sort:
-                if field == "score":
-                    values.append(event.get("score", 0))
-                    
-                else:
-                    values.append(get_field(event, field))
-                    
-            return tuple(values)
+                event_copy = dict(e)
+                event_copy["score"] = 0
+                non_scored.append(event_copy)
+                
+            events = non_scored
+            s.rows_out = len(events)
 
-        events.sort(key=event_sort_key, reverse=True)
-        
-    else:
-        events.sort(key=lambda e: (e.get("score", 0), get_field(e, "datetime")), reverse=True)
+    if profile:
+        profile.note(f"sort by {' '.join(sort) if sort else 'score datetime'} desc")
 
-    return events[:limit] if limit else events
-    
-    
+    with stage("sort", len(events)) as s:
+        events.sort(key=event_sort_key(sort), reverse=True)
+        s.rows_out = len(events)
+
+    events = events[:limit] if limit else events
+
+    return (events, facet_counts) if facets else events
@@ -0,0 +1,263 @@
+"""
+Small mergeable streaming sketches used for approximate ranking.
+
+    HyperLogLog   distinct count, standard error 1.04 / sqrt(2^p)
+    CountMin      point frequency, overestimates by <= e/width * n
+                  with probability 1 - e^-depth
+    SpaceSaving   top-k heavy hitters, each count overestimates by at
+                  most its recorded error (always <= n / k)
+    MinHash       Jaccard similarity of shingle sets, plus LSH band keys
+                  for finding similar items without pairwise comparison
+
+All of them serialize to plain JSON types (to_dict/from_dict) and use a
+stable hash so sketches built in different processes can be merged.
+"""
+
+from hashlib import blake2b
+import base64
+import math
+import operator
+import struct
+import zlib
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _hash128(value: str) -> tuple[int, int]:
+    digest = blake2b(value.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:], "big")
+
+
+# ==========================================================
+# HYPERLOGLOG
+# ==========================================================
+
+class HyperLogLog:
+    def __init__(self, p: int = 10, registers: bytearray | None = None):
+        self.p = p
+        self.m = 1 << p
+        self.registers = registers if registers is not None else bytearray(self.m)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(self.m)
+
+    def add(self, value: str) -> None:
+        h = _hash64(value)
+        index = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def estimate(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            # small range correction (linear counting)
+            return round(m * math.log(m / zeros))
+
+        return round(raw)
+
+    def to_dict(self) -> dict:
+        return {"p": self.p, "registers": base64.b64encode(bytes(self.registers)).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HyperLogLog":
+        return cls(data["p"], bytearray(base64.b64decode(data["registers"])))
+
+
+# ==========================================================
+# COUNT-MIN
+# ==========================================================
+
+class CountMinSketch:
+    def __init__(self, width: int = 256, depth: int = 4, rows: list[list[int]] | None = None):
+        self.width = width
+        self.depth = depth
+        self.rows = rows if rows is not None else [[0] * width for _ in range(depth)]
+        self.total = sum(self.rows[0]) if rows is not None else 0
+
+    @property
+    def epsilon(self) -> float:
+        return math.e / self.width
+
+    def _cells(self, value: str):
+        # Kirsch-Mitzenmacher: depth indexes from one 128 bit hash
+        h1, h2 = _hash128(value)
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, value: str, count: int = 1) -> None:
+        for row, cell in zip(self.rows, self._cells(value)):
+            row[cell] += count
+
+        self.total += count
+
+    def estimate(self, value: str) -> int:
+        return min(row[cell] for row, cell in zip(self.rows, self._cells(value)))
+
+    def merge(self, other: "CountMinSketch") -> None:
+        for row, other_row in zip(self.rows, other.rows):
+            for i, v in enumerate(other_row):
+                row[i] += v
+
+        self.total += other.total
+
+    def to_dict(self) -> dict:
+        return {"width": self.width, "depth": self.depth, "rows": self.rows}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CountMinSketch":
+        return cls(data["width"], data["depth"], data["rows"])
+
+
+# ==========================================================
+# SPACE-SAVING
+# ==========================================================
+
+class SpaceSaving:
+    def __init__(self, k: int = 64, counters: dict[str, list[int]] | None = None):
+        self.k = k
+        self.counters = counters if counters is not None else {}  # item -> [count, error]
+
+    def add(self, value: str, count: int = 1) -> None:
+        counter = self.counters.get(value)
+
+        if counter is not None:
+            counter[0] += count
+            return
+
+        if len(self.counters) < self.k:
+            self.counters[value] = [count, 0]
+            return
+
+        # evict the smallest counter, the newcomer inherits its count as error
+        victim = min(self.counters, key=lambda item: self.counters[item][0])
+        floor = self.counters.pop(victim)[0]
+        self.counters[value] = [floor + count, floor]
+
+    def merge(self, other: "SpaceSaving") -> None:
+        # an item missing from a full sketch may still have occurred up to
+        # that sketch's smallest count times, so that is added as error
+        def floor(sketch):
+            if len(sketch.counters) < sketch.k:
+                return 0
+            return min(c for c, _ in sketch.counters.values())
+
+        self_floor = floor(self)
+        other_floor = floor(other)
+        merged = {}
+
+        for item in self.counters.keys() | other.counters.keys():
+            c1, e1 = self.counters.get(item, (self_floor, self_floor))
+            c2, e2 = other.counters.get(item, (other_floor, other_floor))
+            merged[item] = [c1 + c2, e1 + e2]
+
+        top = sorted(merged.items(), key=lambda kv: kv[1][0], reverse=True)[:self.k]
+        self.counters = dict(top)
+
+    def top(self, n: int | None = None) -> list[tuple[str, int, int]]:
+        """[(item, count, error)] by count, true count is in [count - error, count]"""
+
+        rows = sorted(
+            ((item, c, e) for item, (c, e) in self.counters.items()),
+            key=lambda row: (-row[1], row[0])
+        )
+        return rows[:n] if n else rows
+
+    def to_dict(self) -> dict:
+        return {"k": self.k, "counters": self.counters}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SpaceSaving":
+        return cls(data["k"], data["counters"])
+
+
+# ==========================================================
+# MINHASH
+# ==========================================================
+#
+# One permutation hashing: every shingle is hashed once, the top bits pick
+# one of k bins and each bin keeps its minimum, so a signature costs one
+# hash per shingle instead of k. Empty bins borrow from the next non-empty
+# bin (rotation densification). The fraction of equal bins estimates the
+# Jaccard similarity of the shingle sets.
+
+_MINHASH_BITS = 7  # 2^7 = 128 bins
+_MINHASH_MIX = 0x9E3779B1
+
+
+def shingles(text: str, size: int = 4) -> set[str]:
+    text = " ".join(text.split())
+
+    if len(text) <= size:
+        return {text} if text else set()
+
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def minhash_signature(text: str, size: int = 4) -> tuple[int, ...]:
+    k = 1 << _MINHASH_BITS
+    value_bits = 32 - _MINHASH_BITS
+    value_mask = (1 << value_bits) - 1
+    empty = 1 << value_bits
+
+    bins = [empty] * k
+
+    for shingle in shingles(text, size):
+        # crc32 is stable across processes, the multiply spreads its bits
+        h = (zlib.crc32(shingle.encode("utf-8")) * _MINHASH_MIX) & 0xFFFFFFFF
+        i = h >> value_bits
+        v = h & value_mask
+
+        if v < bins[i]:
+            bins[i] = v
+
+    if all(v == empty for v in bins):
+        return tuple(bins)
+
+    for i in range(k):
+        if bins[i] != empty:
+            continue
+
+        step = 1
+        while bins[(i + step) % k] > value_mask:  # empty or borrowed
+            step += 1
+
+        # offset by distance so borrowed values rarely collide by accident
+        bins[i] = bins[(i + step) % k] + step * empty
+
+    return tuple(bins)
+
+
+def jaccard_estimate(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    return sum(map(operator.eq, a, b)) / len(a)
+
+
+def lsh_bands(signature: tuple[int, ...], bands: int = 16, prefix=None) -> list[int]:
+    """
+    One bucket key per band of rows (prefix scopes the keys). Items sharing
+    any key are candidates; with 16 bands of 8 rows a pair with similarity
+    0.8 collides with probability 0.95, one with 0.5 with probability 0.06.
+    Keys are signed 64-bit and stable across processes, so they can be saved.
+    """
+
+    rows = len(signature) // bands
+    scoped = blake2b(repr(prefix).encode("utf-8"), digest_size=8)
+
+    keys = []
+    for band in range(bands):
+        h = scoped.copy()
+        h.update(struct.pack(f"<H{rows}I", band, *signature[band * rows:(band + 1) * rows]))
+        keys.append(int.from_bytes(h.digest(), "little", signed=True))
+
+    return keys
@@ -0,0 +1,16 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# run from anywhere: the app imports itself as the top-level 'src' package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.scripts.synthetic import make_events
+
+
+@pytest.fixture
+def events():
+    """300 synthetic events, newest first"""
+
+    return make_events(300)
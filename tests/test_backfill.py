@@ -0,0 +1,120 @@
+import asyncio
+from functools import partial
+
+import pytest
+
+from src.api import polis
+from src.api.polis import PolisClient
+from src.scripts.mock_polis import MockPolisServer
+from src.services import backfill
+from src.services.backfill import backfill_events
+from src.services.fetcher import ingest_events, load_events
+
+
+@pytest.fixture
+def files(tmp_path):
+    return dict(
+        data_file=tmp_path / "events.json",
+        state_file=tmp_path / "last_event.json",
+        views_file=tmp_path / "views.json",
+        sketches_file=tmp_path / "sketches.json",
+        duplicates_file=tmp_path / "duplicates.json",
+    )
+
+
+def run_backfill(monkeypatch, files, stored=(), server_kwargs=None, **backfill_kwargs):
+    """backfill_events against a local mock API, with `stored` ingested first"""
+
+    calls = {"in_flight": 0, "peak": 0}
+
+    async def run():
+        async with MockPolisServer(rate=0, initial=300, **(server_kwargs or {})) as server:
+            monkeypatch.setattr(polis, "EVENT_URL", server.url)
+
+            client = PolisClient(rate_per_s=0, cache_ttl_s=0, breaker_failures=100)
+            fetch = partial(polis.fetch_events, client=client, backoff_s=0, backoff_max_s=0, retries=1)
+
+            async def tracked(**kwargs):
+                calls["in_flight"] += 1
+                calls["peak"] = max(calls["peak"], calls["in_flight"])
+                try:
+                    return await fetch(**kwargs)
+                finally:
+                    calls["in_flight"] -= 1
+
+            monkeypatch.setattr(backfill, "fetch_events", tracked)
+
+            try:
+                if stored:
+                    ingest_events([e for e in server.events if stored(e)], **files)
+
+                result = await backfill_events(**backfill_kwargs, **files)
+            finally:
+                await client.close()
+
+            return server, result
+
+    server, result = asyncio.run(run())
+    return server, result, calls
+
+
+def located(*names):
+    return lambda e: e["location"]["name"] in names
+
+
+def test_partitions_merged_into_store(monkeypatch, files):
+    server, result, _ = run_backfill(
+        monkeypatch, files,
+        stored=lambda e: e["location"]["name"] == "Stockholm" and e["id"] % 2,
+        counties=["Stockholm", "STOCKHOLM", "Malmö"],
+    )
+
+    expected = [e for e in server.events if located("Stockholm", "Malmö")(e)]
+    stockholm = [e for e in expected if e["location"]["name"] == "Stockholm"]
+
+    assert server.stats["200"] == 3
+    assert result["partitions"] == 3
+    assert result["failed"] == []
+    assert result["fetched"] == len(expected) + len(stockholm)
+
+    # overlapping partitions and already stored events are stored once
+    stored_before = {e["id"] for e in stockholm if e["id"] % 2}
+    assert sorted(e["id"] for e in result["new_events"]) == sorted(
+        e["id"] for e in expected if e["id"] not in stored_before
+    )
+
+    ids = [e["id"] for e in load_events(files["data_file"])]
+    assert ids == sorted({e["id"] for e in expected}, reverse=True)
+
+
+def test_failed_partition_does_not_stop_others(monkeypatch, files):
+    server, result, _ = run_backfill(
+        monkeypatch, files,
+        server_kwargs=dict(fail_locations=("Malmö",)),
+        counties=["Stockholm", "Malmö", "Uppsala"],
+    )
+
+    assert result["failed"] == [("Malmö", None)]
+    assert server.stats["503"] == 2  # first try and one retry
+
+    stored = load_events(files["data_file"])
+    assert {e["location"]["name"] for e in stored} == {"Stockholm", "Uppsala"}
+    assert len(stored) == len([e for e in server.events if located("Stockholm", "Uppsala")(e)])
+
+
+def test_county_type_fan_out_is_bounded(monkeypatch, files):
+    server, result, calls = run_backfill(
+        monkeypatch, files,
+        server_kwargs=dict(latency_s=0.02),
+        counties=["Stockholm", "Malmö", "Uppsala"],
+        event_types=["Brand", "Stöld"],
+        concurrency=2,
+    )
+
+    assert result["partitions"] == 6
+    assert server.stats["200"] == 6
+    assert calls["peak"] == 2
+
+    stored = load_events(files["data_file"])
+    assert stored
+    assert all(e["type"] in ("Brand", "Stöld") for e in stored)
@@ -0,0 +1,49 @@
+import asyncio
+
+from src.api.cache import ResponseCache
+
+
+def test_slow_holder_does_not_release_new_lock(tmp_path):
+    cache = ResponseCache(tmp_path, ttl_s=60, lock_timeout_s=0.2)
+    params = {"type": "Brand"}
+    lock_file = cache._path(params).with_suffix(".lock")
+
+    async def run():
+        order = []
+        b_locked = asyncio.Event()
+        a_done = asyncio.Event()
+
+        async def slow_a():
+            async with cache.lock(params):
+                order.append("a")
+                await b_locked.wait()  # presumed dead meanwhile
+            a_done.set()
+
+        async def b():
+            await asyncio.sleep(0.05)
+            async with cache.lock(params):
+                order.append("b")
+                b_locked.set()
+                await a_done.wait()
+
+                # a released after its lock was broken, b still holds one
+                assert lock_file.exists()
+                order.append("b checked")
+
+        await asyncio.gather(slow_a(), b())
+        return order
+
+    assert asyncio.run(run()) == ["a", "b", "b checked"]
+    assert not lock_file.exists()
+
+
+def test_fresh_entry_roundtrip(tmp_path):
+    cache = ResponseCache(tmp_path, ttl_s=60)
+    params = {"limit": 5}
+
+    assert cache.fresh(params) is None
+
+    entry = cache.store(params, [{"id": 1}], {"etag": "x", "digest": "d"})
+
+    assert cache.fresh(params)["events"] == [{"id": 1}]
+    assert entry["etag"] == "x"
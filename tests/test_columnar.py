@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from src.utils import columnar, query
+from src.utils.index import EventIndex
+
+pytestmark = pytest.mark.skipif(not columnar.available(), reason="NumPy not installed")
+
+
+def pivot_without_numpy(monkeypatch, events, **kwargs):
+    with monkeypatch.context() as m:
+        m.setattr(columnar, "available", lambda: False)
+        return query.pivot_partials(events, **kwargs)
+
+
+@pytest.mark.parametrize("text", [None, "brand"])
+def test_pivot_matches_dict_path(events, monkeypatch, text):
+    kwargs = dict(group_by=["type", "location.name"], text=text, fields=query.DEFAULT_FIELDS)
+
+    expected = pivot_without_numpy(monkeypatch, events, **kwargs)
+
+    assert query.pivot_partials(events, **kwargs) == expected
+    assert query.pivot_partials(events, index=EventIndex(events), **kwargs) == expected
+
+
+def test_pivot_high_cardinality():
+    # dense cells would be 3000^3 (and 3000^6 overflows int64)
+    rng = random.Random(3)
+    events = [
+        {"id": i, "a": f"a{rng.randrange(3000)}", "b": f"b{rng.randrange(3000)}", "c": f"c{i % 3000}"}
+        for i in range(20_000)
+    ]
+    events[0]["c"] = ""  # missing values are skipped
+
+    groups = query.pivot_partials(events, group_by=["a", "b", "c", "a", "b", "c"])
+
+    assert sum(g["count"] for g in groups.values()) == len(events) - 1
+    assert groups[(events[1]["a"], events[1]["b"], events[1]["c"]) * 2]["count"] >= 1
@@ -0,0 +1,48 @@
+import pytest
+
+from src.core import config
+
+
+@pytest.fixture
+def reload_settings(monkeypatch):
+    # load_settings replaces the module global, restored afterwards
+    monkeypatch.setattr(config, "settings", config.settings)
+
+    def reload(**env):
+        for key, value in env.items():
+            if value is None:
+                monkeypatch.delenv(key, raising=False)
+            else:
+                monkeypatch.setenv(key, value)
+
+        return config.load_settings(force_reload=True)
+
+    return reload
+
+
+def test_page_base_follows_event_url(reload_settings):
+    settings = reload_settings(
+        POLIS_SCANNER_POLIS_EVENT_URL="http://127.0.0.1:8080/api/events",
+        POLIS_SCANNER_POLIS_BASE_URL=None,
+    )
+
+    assert settings.polis_base_url == "http://127.0.0.1:8080"
+
+
+def test_page_base_override(reload_settings):
+    settings = reload_settings(
+        POLIS_SCANNER_POLIS_EVENT_URL="http://127.0.0.1:8080/api/events",
+        POLIS_SCANNER_POLIS_BASE_URL="https://polisen.se",
+    )
+
+    assert settings.polis_base_url == "https://polisen.se"
+
+
+def test_default_urls(reload_settings):
+    settings = reload_settings(
+        POLIS_SCANNER_POLIS_EVENT_URL=None,
+        POLIS_SCANNER_POLIS_BASE_URL=None,
+    )
+
+    assert settings.polis_event_url == "https://polisen.se/api/events"
+    assert settings.polis_base_url == "https://polisen.se"
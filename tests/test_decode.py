@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from src.api import decode
+from src.api.decode import PolisAPIDecodeError, decode_events, decode_stats
+from src.scripts.synthetic import make_events
+
+
+def payload(items) -> bytes:
+    return json.dumps(items, ensure_ascii=False).encode("utf-8")
+
+
+def test_valid_events_round_trip():
+    events = make_events(20)
+    assert decode_events(payload(events)) == events
+
+
+def test_unknown_keys_are_left_out():
+    event = dict(make_events(1)[0], extra="x")
+    event["location"] = dict(event["location"], county="y")
+
+    (record,) = decode_events(payload([event]))
+
+    assert "extra" not in record
+    assert record["location"] == {"name": event["location"]["name"], "gps": event["location"]["gps"]}
+
+
+def test_drop_reasons():
+    good = make_events(3)
+    bad = [
+        "not an event",
+        dict(good[0], id="123"),
+        dict(good[0], id=True),
+        {k: v for k, v in good[1].items() if k != "summary"},
+        dict(good[1], name=None),
+        dict(good[2], location={"gps": "1,2"}),
+        dict(good[2], location={"name": "X", "gps": 5}),
+    ]
+
+    before = decode_stats.copy()
+    events = decode_events(payload(good + bad))
+    delta = decode_stats - before
+
+    assert events == good
+    assert delta["items"] == len(good) + len(bad)
+    assert delta["dropped"] == len(bad)
+    assert delta["dropped:not an object"] == 1
+    assert delta["dropped:id"] == 2
+    assert delta["dropped:summary"] == 1
+    assert delta["dropped:name"] == 1
+    assert delta["dropped:location.name"] == 1
+    assert delta["dropped:location.gps"] == 1
+
+
+@pytest.mark.parametrize("body", [b"{not json", b'{"id": 1}', b'"events"'])
+def test_invalid_payload_raises(body):
+    with pytest.raises(PolisAPIDecodeError):
+        decode_events(body)
+
+
+DECODERS = [decode._decode_python]
+if decode.msgspec is not None:
+    DECODERS.append(decode._decode_msgspec)
+
+
+@pytest.mark.parametrize("decoder", DECODERS, ids=lambda d: d.__name__)
+def test_decoders_agree_on_optional_gps(decoder):
+    events = make_events(3)
+    events[0]["location"]["gps"] = None
+    del events[1]["location"]["gps"]
+
+    records, dropped = decoder(payload(events))
+
+    assert not dropped
+    assert records[0]["location"] == {"name": events[0]["location"]["name"]}
+    assert records[1]["location"] == {"name": events[1]["location"]["name"]}
+    assert records[2] == events[2]
@@ -0,0 +1,164 @@
+from pathlib import Path
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+from src.services import dedupe
+from src.services.dedupe import get_superseded, load_duplicates, rebuild_duplicates, update_duplicates
+from src.services.fetcher import save_events
+from src.scripts.synthetic import make_events
+from src.utils.sketch import lsh_bands, minhash_signature
+
+
+@pytest.fixture
+def reposts():
+    """Synthetic events where every fifth one reposts an earlier one, lightly edited"""
+
+    rng = random.Random(7)
+    events = make_events(200)[::-1]  # oldest first
+
+    for i in range(5, len(events), 5):
+        source = events[rng.randrange(max(0, i - 20), i)]  # within the window
+        events[i] = dict(
+            events[i],
+            type=source["type"],
+            location=source["location"],
+            summary=source["summary"][:-1] + " (uppdaterad).",
+        )
+
+    return events[::-1]
+
+
+@pytest.fixture(autouse=True)
+def fresh_process():
+    dedupe._index_cache.update(source=None, index=None)
+    yield
+    dedupe._index_cache.update(source=None, index=None)
+
+
+def test_lsh_bands_are_stable():
+    # keys are persisted, so they must not depend on hash() seeding
+    code = (
+        "from src.utils.sketch import lsh_bands, minhash_signature;"
+        "print(lsh_bands(minhash_signature('brand i lägenhet'), prefix=('brand', 'malmö')))"
+    )
+    root = Path(__file__).resolve().parent.parent
+
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=root,
+            env=dict(os.environ, PYTHONHASHSEED=seed),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        for seed in ("1", "2")
+    }
+    assert len(outputs) == 1
+
+    signature = minhash_signature("brand i lägenhet")
+    keys = lsh_bands(signature, prefix=("brand", "malmö"))
+
+    assert keys != lsh_bands(signature, prefix=("brand", "lund"))
+    assert all(-(2 ** 63) <= k < 2 ** 63 for k in keys)
+
+
+@pytest.mark.parametrize("merge_every", [16, 4096])
+def test_incremental_matches_rebuild(reposts, tmp_path, monkeypatch, merge_every):
+    # 16: lookups mostly bisect the sorted band file, 4096: all in the tail
+    monkeypatch.setattr(dedupe, "MERGE_EVERY", merge_every)
+
+    data_file = tmp_path / "events.json"
+    data_file.write_text("[]", encoding="utf-8")
+    duplicates_file = tmp_path / "duplicates.json"
+
+    expected = rebuild_duplicates(reposts, data_file, tmp_path / "expected.json").clusters()
+    assert expected
+
+    oldest_first = reposts[::-1]
+    rebuild_duplicates(oldest_first[:100], data_file, duplicates_file)
+
+    for start in range(100, len(oldest_first), 25):
+        # every batch in a "new process" that only has the saved index
+        dedupe._index_cache.update(source=None, index=None)
+
+        source = load_duplicates(duplicates_file)["source"]
+        update_duplicates(oldest_first[start:start + 25], data_file, source, duplicates_file)
+
+    data = load_duplicates(duplicates_file)
+    index = dedupe._load_index(data, duplicates_file, dedupe.THRESHOLD, dedupe.WINDOW_S)
+
+    assert index.clusters() == expected
+    assert data["records"] == len(reposts)
+    assert (data["merged"] > 0) == (merge_every < len(reposts))
+
+
+def test_truncated_sidecar_rebuilds_on_first_use(reposts, tmp_path):
+    data_file = tmp_path / "events.json"
+    save_events([], reposts, data_file)
+    duplicates_file = tmp_path / "duplicates.json"
+
+    expected = rebuild_duplicates(reposts, data_file, tmp_path / "expected.json").clusters()
+
+    rebuild_duplicates(reposts[10:], data_file, duplicates_file)
+    source = load_duplicates(duplicates_file)["source"]
+
+    keys_file = duplicates_file.with_suffix(".keys")
+    keys_file.write_bytes(keys_file.read_bytes()[:-8])
+
+    # ingest leaves the broken index alone instead of rebuilding it
+    dedupe._index_cache.update(source=None, index=None)
+    update_duplicates(reposts[:10], data_file, source, duplicates_file)
+
+    assert load_duplicates(duplicates_file)["records"] == len(reposts) - 10
+
+    superseded = get_superseded(data_file, duplicates_file)
+
+    assert load_duplicates(duplicates_file)["records"] == len(reposts)
+    assert superseded == {i for ids in expected.values() for i in ids if i != max(ids)}
+
+
+def report(event_id, when, summary):
+    return {
+        "id": event_id,
+        "datetime": when,
+        "name": f"Trafikkontroll, Kiruna {event_id}",
+        "summary": summary,
+        "type": "Trafikkontroll",
+        "location": {"name": "Kiruna"},
+    }
+
+
+def test_recurring_reports_outside_window_stay_apart(tmp_path):
+    data_file = tmp_path / "events.json"
+    data_file.write_text("[]", encoding="utf-8")
+
+    summary = "Hastighetskontroll på E10."
+    events = [
+        report(1, "2023-06-01 10:00:00 +02:00", summary),
+        report(2, "2024-06-01 10:00:00 +02:00", summary),
+        report(3, "2024-06-01 12:30:00 +02:00", summary),
+    ]
+
+    index = rebuild_duplicates(events, data_file, tmp_path / "duplicates.json")
+
+    assert index.clusters() == {2: [2, 3]}
+
+
+def test_short_summaries_are_not_clustered(tmp_path):
+    data_file = tmp_path / "events.json"
+    data_file.write_text("[]", encoding="utf-8")
+
+    events = [
+        report(i, f"2024-06-01 10:{i:02d}:00 +02:00", summary)
+        for i, summary in enumerate(["", "", "  ", None, "E4", "E4"], 1)
+    ]
+
+    index = rebuild_duplicates(events, data_file, tmp_path / "duplicates.json")
+
+    assert index.clusters() == {}
+    assert len(index) == 0
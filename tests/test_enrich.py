@@ -0,0 +1,164 @@
+import asyncio
+from functools import partial
+
+import pytest
+
+from src.api import polis
+from src.api.polis import PolisClient, fetch_events
+from src.scripts.mock_polis import MockPolisServer
+from src.services import enrich, fetcher
+from src.services.enrich import enrich_events, enrich_with_pending, extract_body, load_page, load_pending
+
+
+def run_against_mock(monkeypatch, scenario, **server_kwargs):
+    """Run scenario(server, client, events) against a local mock API"""
+
+    async def run():
+        async with MockPolisServer(rate=0, initial=40, **server_kwargs) as server:
+            monkeypatch.setattr(polis, "EVENT_URL", server.url)
+            monkeypatch.setattr(enrich, "BASE_URL", server.base_url)
+
+            client = PolisClient(rate_per_s=0, cache_ttl_s=0)
+            try:
+                events = await fetch_events(client=client)
+                return await scenario(server, client, events)
+            finally:
+                await client.close()
+
+    return asyncio.run(run())
+
+
+def test_extract_body():
+    html = (
+        "<html><head><script>var x = 1;</script></head><body><nav>Meny</nav>"
+        '<div class="text-body editorial-html"><p>Brand i  lägenhet.</p><p>Ingen skadad.</p></div>'
+        "</body></html>"
+    )
+
+    assert extract_body(html) == "Brand i lägenhet. Ingen skadad."
+
+
+def test_pages_fetched_and_cached(monkeypatch, tmp_path):
+    async def scenario(server, client, events):
+        assert await enrich_events(events, 4, tmp_path, client) == len(events)
+        assert server.stats["page"] == len(events)
+
+        # second pass is served from cache/pages
+        fresh = [{k: v for k, v in e.items() if k != "body"} for e in events]
+        assert await enrich_events(fresh, 4, tmp_path, client) == len(events)
+        assert server.stats["page"] == len(events)
+
+        return events
+
+    events = run_against_mock(monkeypatch, scenario)
+
+    assert events[0]["body"].startswith(events[0]["summary"])
+    assert load_page(events[0]["id"], tmp_path) == events[0]["body"]
+
+
+def test_pages_capped_newest_first(monkeypatch, tmp_path):
+    async def scenario(server, client, events):
+        assert await enrich_events(events[::-1], 4, tmp_path, client, max_pages=5) == 5
+        return events
+
+    events = run_against_mock(monkeypatch, scenario)
+
+    assert [("body" in e) for e in events] == [True] * 5 + [False] * (len(events) - 5)
+
+
+def test_pages_use_shared_rate_limit(monkeypatch, tmp_path):
+    async def scenario(server, client, events):
+        reserved = []
+        reserve = client.limiter.reserve
+        monkeypatch.setattr(client.limiter, "reserve", lambda: reserved.append(1) or reserve())
+
+        await enrich_events(events[:10], 4, tmp_path, client)
+        return len(reserved)
+
+    assert run_against_mock(monkeypatch, scenario) == 10
+
+
+def test_block_stops_page_fetches(monkeypatch, tmp_path):
+    async def scenario(server, client, events):
+        server.error_rate = 1.0
+        server.errors = (429,)
+
+        assert await enrich_events(events, 4, tmp_path, client) == 0
+        return server.stats["429"], client.breaker
+
+    blocked, breaker = run_against_mock(monkeypatch, scenario, retry_after_s=120)
+
+    # only the requests already in flight when the block arrived
+    assert blocked <= 4
+    assert breaker.state == "open"
+    assert breaker.remaining() > 100
+
+
+def test_pending_pages_retried_within_cap(monkeypatch, tmp_path):
+    pending_file = tmp_path / "pending.json"
+    fetch = partial(enrich_with_pending, pending_file=pending_file, pages_dir=tmp_path, max_pages=10)
+
+    async def scenario(server, client, events):
+        assert await fetch(events[5:], client=client) == {}
+        assert sorted(load_pending(pending_file)) == sorted(e["id"] for e in events[15:])
+
+        # next refresh: its new events first, then the newest pending ones
+        bodies = await fetch(events[:5], client=client)
+
+        assert server.stats["page"] == 20
+        return events, bodies
+
+    events, bodies = run_against_mock(monkeypatch, scenario)
+
+    assert all("body" in e for e in events[:15])
+    assert sorted(bodies) == sorted(e["id"] for e in events[15:20])
+    assert sorted(load_pending(pending_file)) == sorted(e["id"] for e in events[20:])
+
+
+def test_gone_page_is_not_retried(monkeypatch, tmp_path):
+    pending_file = tmp_path / "pending.json"
+
+    async def scenario(server, client, events):
+        gone = dict(events[0], url="/aktuellt/handelser/borttagen/")
+        await enrich_with_pending([gone], pending_file, pages_dir=tmp_path, client=client)
+        return gone
+
+    gone = run_against_mock(monkeypatch, scenario)
+
+    assert gone["body"] == ""
+    assert load_pending(pending_file) == {}
+
+
+def test_refresh_stores_pending_pages_later(monkeypatch, tmp_path):
+    files = dict(
+        data_file=tmp_path / "events.json",
+        state_file=tmp_path / "last_event.json",
+        views_file=tmp_path / "views.json",
+        sketches_file=tmp_path / "sketches.json",
+        duplicates_file=tmp_path / "duplicates.json",
+    )
+
+    async def scenario(server, client, events):
+        monkeypatch.setattr(polis, "_client", client)
+        monkeypatch.setattr(fetcher, "ENRICH", True)
+        monkeypatch.setattr(fetcher, "enrich_with_pending", partial(
+            enrich_with_pending,
+            pending_file=tmp_path / "pending.json",
+            pages_dir=tmp_path / "pages",
+            client=client,
+            max_pages=15,
+        ))
+
+        new = await fetcher.refresh_events(**files)
+        for _ in range(2):
+            # feed unchanged, only pending pages are fetched
+            assert await fetcher.refresh_events(**files) == []
+
+        return new
+
+    new = run_against_mock(monkeypatch, scenario)
+    stored = fetcher.load_events(files["data_file"])
+
+    assert len(new) == len(stored) == 40
+    assert all(e.get("body") for e in stored)
+    assert fetcher.load_ingest_state(files["data_file"], files["state_file"]) is not None
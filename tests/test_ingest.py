@@ -0,0 +1,181 @@
+import json
+
+import pytest
+
+from src.services import dedupe, fetcher
+from src.services.dedupe import get_superseded, load_duplicates
+from src.services.fetcher import (
+    classify_new_events,
+    ingest_events,
+    load_events,
+    load_ingest_state,
+    prepend_events,
+    save_events,
+    store_bodies,
+)
+from src.services.sketches import approx_rank, load_sketches
+from src.services.views import get_group_counts, is_view_current, load_group_views, source_stat
+from src.scripts.synthetic import make_events
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Paths for an isolated store and its derived files"""
+
+    return {
+        "data_file": tmp_path / "events.json",
+        "views_file": tmp_path / "views.json",
+        "sketches_file": tmp_path / "sketches.json",
+        "duplicates_file": tmp_path / "duplicates.json",
+        "state_file": tmp_path / "last_event.json",
+    }
+
+
+def test_classify_new_events():
+    state = {"recent_ids": [10, 9, 8, 7], "complete": False}
+    events = [{"id": i} for i in (12, 11, 11, 10, 9)]
+
+    assert [e["id"] for e in classify_new_events(events, state)] == [12, 11]
+
+
+def test_classify_known_events_only():
+    state = {"recent_ids": [10, 9, 8], "complete": False}
+    assert classify_new_events([{"id": 9}, {"id": 8}], state) == []
+
+
+def test_classify_older_than_window():
+    state = {"recent_ids": [10, 9, 8], "complete": False}
+    assert classify_new_events([{"id": 11}, {"id": 5}], state) is None
+
+
+def test_classify_complete_window_knows_every_id():
+    state = {"recent_ids": [10, 9, 8], "complete": True}
+    assert [e["id"] for e in classify_new_events([{"id": 5}], state)] == [5]
+
+
+def test_prepend_matches_save_events(tmp_path):
+    events = make_events(50)
+    new, old = events[:7], events[7:]
+
+    spliced = tmp_path / "spliced.json"
+    save_events(old, [], spliced)
+    assert prepend_events(new, spliced)
+
+    saved = tmp_path / "saved.json"
+    save_events(old, new, saved)
+
+    assert spliced.read_bytes() == saved.read_bytes()
+
+
+def test_prepend_refuses_other_layout(tmp_path):
+    data_file = tmp_path / "events.json"
+    data_file.write_text(json.dumps(make_events(3)), encoding="utf-8")
+
+    assert not prepend_events(make_events(1, start_id=900_000), data_file)
+
+
+def test_ingest_fast_path_equals_full(store, tmp_path):
+    events = make_events(120)
+
+    # first ingest has no state and goes through the full path
+    assert ingest_events(events[40:], **store) == events[40:]
+
+    # later polls overlap the stored events
+    assert ingest_events(events[20:60], **store) == events[20:40]
+    assert ingest_events(events[:30], **store) == events[:20]
+    assert ingest_events(events[:30], **store) == []
+
+    expected = tmp_path / "expected.json"
+    save_events([], events, expected)
+
+    assert store["data_file"].read_bytes() == expected.read_bytes()
+
+    state = json.loads(store["state_file"].read_text(encoding="utf-8"))
+    assert state["id"] == events[0]["id"]
+    assert state["recent_ids"][:3] == [e["id"] for e in events[:3]]
+
+
+def build_derived(store):
+    """First use of every derived file, like rank/search would"""
+
+    get_group_counts("type", store["data_file"], store["views_file"])
+    approx_rank("type", store["data_file"], sketches_file=store["sketches_file"])
+    get_superseded(store["data_file"], store["duplicates_file"])
+
+
+def derived_current(store):
+    source = source_stat(store["data_file"])
+
+    return (
+        is_view_current(load_group_views(store["views_file"]), store["data_file"]),
+        load_sketches(store["sketches_file"]).get("source") == source,
+        load_duplicates(store["duplicates_file"]).get("source") == source,
+    )
+
+
+@pytest.fixture
+def new_process():
+    """Nothing cached in memory, only the files"""
+
+    def reset():
+        fetcher._events_cache.update(key=None, events=[])
+        dedupe._index_cache.update(source=None, index=None)
+
+    reset()
+    yield reset
+    reset()
+
+
+def test_fast_path_does_not_decode_store(store, monkeypatch, new_process):
+    events = make_events(100)
+    ingest_events(events[10:], **store)
+    build_derived(store)
+
+    new_process()
+
+    def load_events(*args, **kwargs):
+        raise AssertionError("load_events called on the fast path")
+
+    monkeypatch.setattr(fetcher, "load_events", load_events)
+
+    assert ingest_events(events[:20], **store) == events[:10]
+    assert derived_current(store) == (True, True, True)
+
+
+def test_outdated_derived_data_is_rebuilt_on_first_use(store, monkeypatch, new_process):
+    events = make_events(100)
+    ingest_events(events[10:], **store)
+
+    # never used yet: ingest leaves it to the readers instead of rescanning
+    assert derived_current(store) == (False, False, False)
+    new_process()
+
+    def load_events(*args, **kwargs):
+        raise AssertionError("load_events called during ingest")
+
+    with monkeypatch.context() as m:
+        m.setattr(fetcher, "load_events", load_events)
+        assert ingest_events(events[:20], **store) == events[:10]
+
+    assert derived_current(store) == (False, False, False)
+
+    counts = get_group_counts("type", store["data_file"], store["views_file"])
+    assert sum(counts.values()) == len(events)
+
+    build_derived(store)
+    assert derived_current(store) == (True, True, True)
+
+
+def test_store_bodies_keeps_derived_data_current(store, new_process):
+    events = make_events(50)
+    ingest_events(events, **store)
+    build_derived(store)
+
+    assert store_bodies({events[3]["id"]: "Sidtext."}, **store) == 1
+
+    assert load_events(store["data_file"])[3]["body"] == "Sidtext."
+    assert derived_current(store) == (True, True, True)
+    assert load_ingest_state(store["data_file"], store["state_file"]) is not None
+
+    # nothing changed: the store is not rewritten
+    assert store_bodies({events[3]["id"]: "Sidtext."}, **store) == 0
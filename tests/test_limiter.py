@@ -0,0 +1,103 @@
+import pytest
+
+from src.api import limiter
+from src.api.limiter import CircuitBreaker, TokenBucket, backoff_delay, parse_retry_after
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(limiter.time, "monotonic", clock)
+    return clock
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_s=60)
+
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "closed"
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.remaining() == 60
+
+
+def test_breaker_success_resets_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_s=60)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == "closed"
+
+
+def test_breaker_half_open_single_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_s=60)
+    breaker.record_failure()
+
+    clock.now += 61
+    assert breaker.state == "half-open"
+
+    assert breaker.allow()
+    assert not breaker.allow()  # probe in flight
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_breaker_failed_probe_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=5, reset_s=60)
+    breaker.trip(10)
+
+    clock.now += 11
+    assert breaker.allow()
+    breaker.record_failure()  # below threshold, but it was the probe
+
+    assert breaker.state == "open"
+    assert breaker.remaining() == 60
+
+
+def test_breaker_trip_keeps_longest(clock):
+    breaker = CircuitBreaker(failure_threshold=5, reset_s=60)
+
+    breaker.trip(120)
+    breaker.trip(30)
+
+    assert breaker.remaining() == 120
+
+
+def test_token_bucket_burst_then_rate(clock):
+    bucket = TokenBucket(rate_per_s=2, burst=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+    clock.now += 10
+    assert bucket.reserve() == 0
+
+
+def test_backoff_delay_bounds():
+    for attempt in range(1, 10):
+        assert 0 <= backoff_delay(attempt, 2, 30, 2.0) <= min(30, 2 * 2 ** (attempt - 1))
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(None, None), ("", None), ("12", 12.0), ("soon", None), ("Thu, 01 Jan 1970 00:00:00 GMT", 0.0)],
+)
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value) == expected
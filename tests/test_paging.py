@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from src.commands import find, search
+from src.services.paging import PageCursor, list_pager, query_pager, store_pager
+from src.utils.query import parse_query
+from src.utils.index import EventIndex
+from src.utils.query import DEFAULT_FIELDS, compile_boolean_query, parse_boolean_query
+
+
+def walk(fetch, page_size):
+    """Follow a pager through a PageCursor until it runs out"""
+
+    pages = []
+    cursor = PageCursor(name="test", page_size=page_size, fetch=fetch, write=pages.append)
+
+    async def run():
+        page, cursor.after = await cursor.fetch(None, cursor.page_size)
+        cursor.write(page)
+
+        while cursor.after is not None:
+            page, cursor.after = await cursor.fetch(cursor.after, cursor.page_size)
+            cursor.write(page)
+
+    asyncio.run(run())
+    return pages
+
+
+@pytest.mark.parametrize("page_size", [1, 7, 300, 1000])
+def test_store_pager_round_trip(events, page_size):
+    pages = walk(store_pager(EventIndex(events)), page_size)
+
+    assert [e for page in pages for e in page] == events
+    assert all(len(page) == page_size for page in pages[:-1])
+
+
+def test_store_pager_stable_after_new_events(events):
+    index = EventIndex(events)
+    first, after = asyncio.run(store_pager(index)(None, 10))
+
+    # newer events in front do not shift a keyset page
+    newer = [dict(events[0], id=events[0]["id"] + i) for i in range(5, 0, -1)]
+    page, _ = asyncio.run(store_pager(EventIndex(newer + events))(after, 10))
+
+    assert page == events[10:20]
+
+
+def test_query_pager_round_trip(events):
+    node = parse_boolean_query("stockholm or brand")
+    predicate = compile_boolean_query(node, DEFAULT_FIELDS)
+
+    index = EventIndex(events)
+    pages = walk(query_pager(events, index, query=node), 9)
+
+    ids = [e["id"] for page in pages for e in page]
+    expected = [index.events[pos]["id"] for pos in index.by_datetime if predicate(index.events[pos])]
+
+    assert ids == expected
+
+
+def test_list_pager_unknown_after(events):
+    with pytest.raises(ValueError):
+        asyncio.run(list_pager(events[:5])(events[10]["id"], 5))
+
+
+def test_parse_query_rejects_bad_numbers():
+    assert parse_query("--text brand --page-size 20 --after 500010")["after"] == 500010
+
+    with pytest.raises(ValueError, match="--page-size must be a number"):
+        parse_query("--text brand --page-size x")
+
+    with pytest.raises(ValueError, match="--after must be a number"):
+        parse_query("--text brand --after abc")
+
+
+@pytest.mark.parametrize("module, command, args", [
+    (search, search.cmd_search, ["--text", "brand", "--after", "abc"]),
+    (search, search.cmd_search, ["--text", "brand", "--page-size", "x"]),
+    (find, find.cmd_find, ["brand", "--after", "abc"]),
+    (find, find.cmd_find, ["brand", "--page-size", "x"]),
+])
+def test_commands_warn_on_bad_paging_options(module, command, args, monkeypatch):
+    warnings = []
+    monkeypatch.setattr(module.logger, "warning", warnings.append)
+
+    def load_events():
+        raise AssertionError("ran the query")
+
+    monkeypatch.setattr(module, "load_events", load_events)
+
+    asyncio.run(command(args))
+
+    assert warnings == [f"{args[-2]} must be a number"]
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from src.services import fetcher, parallel
+from src.services.fetcher import save_events
+from src.utils.query import query_events
+
+
+@pytest.fixture
+def data_file(events, tmp_path):
+    data_file = tmp_path / "events.json"
+    save_events([], events, data_file)
+    return data_file
+
+
+@pytest.fixture
+def pinned_worker():
+    saved = dict(parallel._worker)
+    parallel._shard_cache.update(key=None, events=[], index=None)
+    yield
+    parallel._worker.update(saved)
+    parallel._shard_cache.update(key=None, events=[], index=None)
+
+
+def test_worker_keeps_only_its_shard(events, data_file, monkeypatch, pinned_worker):
+    monkeypatch.setattr(fetcher, "_events_cache", {"key": None, "events": []})
+    parallel._init_worker(1, 3)
+
+    part, index = parallel._shard_events(str(data_file), ("v", 1))
+
+    assert [e["id"] for e in part] == [e["id"] for e in events[100:200]]
+    assert index.events is part
+    assert fetcher._events_cache["key"] is None
+
+    # same version: served from the slice
+    assert parallel._shard_events(str(data_file), ("v", 1))[0] is part
+
+
+@pytest.mark.parametrize("query", [
+    dict(text="brand", sort=["datetime"], limit=20),
+    dict(query="brand OR stöld", facets=["type"]),
+    dict(group_by="type", sort=["count"]),
+    dict(group_by="type location.name", strict=False, text="lägenhet"),
+])
+def test_parallel_matches_sequential(events, data_file, query):
+    async def run():
+        try:
+            return await parallel.parallel_query_events(data_file, workers=3, **query)
+        finally:
+            parallel.shutdown_executor()
+
+    assert asyncio.run(run()) == query_events(events, **query)
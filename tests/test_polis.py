@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from src.api import polis
+from src.api.polis import PolisClient, fetch_events
+
+
+def half_open_client(**kwargs) -> PolisClient:
+    client = PolisClient(cache_ttl_s=0, **kwargs)
+    client.breaker.trip(0)  # cool-down over, next request is the probe
+    assert client.breaker.state == "half-open"
+    return client
+
+
+async def cancel_probe(client: PolisClient) -> None:
+    probe = asyncio.create_task(fetch_events(client=client, retries=0))
+    await asyncio.sleep(0.05)
+
+    assert not client.breaker.allow()  # probe in flight
+
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+
+@pytest.fixture
+def slow_request(monkeypatch):
+    async def _request(http, params, validators):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(polis, "_request", _request)
+
+
+def test_cancelled_probe_is_released(slow_request, monkeypatch):
+    async def run():
+        client = half_open_client(rate_per_s=0)
+        await cancel_probe(client)
+
+        async def _request(http, params, validators):
+            return []
+
+        monkeypatch.setattr(polis, "_request", _request)
+
+        assert await fetch_events(client=client, retries=0) == []
+        assert client.breaker.state == "closed"
+
+    asyncio.run(run())
+
+
+def test_probe_cancelled_while_rate_limited_is_released(slow_request):
+    async def run():
+        client = half_open_client(rate_per_s=0.01, burst=1)
+        client.limiter.reserve()  # bucket empty, the probe waits in acquire()
+
+        await cancel_probe(client)
+
+        assert client.breaker.state == "half-open"
+        assert client.breaker.allow()
+
+    asyncio.run(run())
+
+
+def test_probe_crash_is_released(monkeypatch):
+    async def _request(http, params, validators):
+        raise RuntimeError("bug")
+
+    monkeypatch.setattr(polis, "_request", _request)
+
+    async def run():
+        client = half_open_client(rate_per_s=0)
+
+        with pytest.raises(RuntimeError):
+            await fetch_events(client=client, retries=0)
+
+        assert client.breaker.allow()
+
+    asyncio.run(run())
+
+
+def test_failed_ingest_does_not_consume_response(monkeypatch, tmp_path):
+    from src.scripts.mock_polis import MockPolisServer
+    from src.services import fetcher
+
+    files = dict(
+        data_file=tmp_path / "events.json",
+        state_file=tmp_path / "last_event.json",
+        views_file=tmp_path / "views.json",
+        sketches_file=tmp_path / "sketches.json",
+        duplicates_file=tmp_path / "duplicates.json",
+    )
+
+    ingest = fetcher.ingest_events
+    calls = []
+
+    def failing_once(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            raise OSError("disk full")
+        return ingest(*args, **kwargs)
+
+    monkeypatch.setattr(fetcher, "ingest_events", failing_once)
+
+    async def run():
+        async with MockPolisServer(rate=0, initial=30) as server:
+            client = PolisClient(rate_per_s=0, cache_ttl_s=0)
+            monkeypatch.setattr(polis, "EVENT_URL", server.url)
+            monkeypatch.setattr(polis, "_client", client)
+
+            try:
+                with pytest.raises(OSError):
+                    await fetcher.refresh_events(**files)
+
+                # unchanged feed (304 / same digest) must still be stored
+                stored = await fetcher.refresh_events(**files)
+                again = await fetcher.refresh_events(**files)
+            finally:
+                await client.close()
+
+        return stored, again
+
+    stored, again = asyncio.run(run())
+
+    assert len(stored) == 30
+    assert again == []
@@ -0,0 +1,59 @@
+import pytest
+
+from src.utils.index import EventIndex
+from src.utils.query import DEFAULT_FIELDS, compile_boolean_query, parse_boolean_query
+
+
+def test_parse_precedence():
+    # AND binds tighter than OR, adjacency is an implicit AND
+    assert parse_boolean_query("brand stockholm or rån") == (
+        "or",
+        [
+            ("and", [("term", None, "brand", False), ("term", None, "stockholm", False)]),
+            ("term", None, "rån", False),
+        ],
+    )
+
+
+def test_parse_not_parens_and_fields():
+    node = parse_boolean_query('not (type:brand OR location.name:"malmö") "natt kväll"')
+
+    assert node == (
+        "and",
+        [
+            ("not", ("or", [("term", "type", "brand", False), ("term", "location.name", "malmö", True)])),
+            ("term", None, "natt kväll", True),
+        ],
+    )
+
+
+@pytest.mark.parametrize("text", [None, "", "   "])
+def test_parse_empty(text):
+    assert parse_boolean_query(text) is None
+
+
+@pytest.mark.parametrize("text", ["(brand", "brand)", "brand or", "not", "brand AND AND rån"])
+def test_parse_errors(text):
+    with pytest.raises(ValueError):
+        parse_boolean_query(text)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "brand",
+        "type:brand",
+        "brand or rån",
+        "stockholm and not type:brand",
+        'location.name:"göteborg" (natt or kväll)',
+        "not polis",
+        "nosuchword",
+    ],
+)
+def test_index_evaluate_matches_scan(events, text):
+    node = parse_boolean_query(text)
+    predicate = compile_boolean_query(node, DEFAULT_FIELDS)
+
+    expected = {pos for pos, e in enumerate(events) if predicate(e)}
+
+    assert set(EventIndex(events).evaluate(node, DEFAULT_FIELDS)) == expected
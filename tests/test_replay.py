@@ -0,0 +1,55 @@
+import asyncio
+import json
+
+from src.api.archive import archive_response
+from src.scripts.synthetic import make_events
+from src.services.fetcher import save_events
+from src.services.replay import replay_archive
+
+
+def test_replay_rebuilds_store_and_yields(tmp_path):
+    archive_dir = tmp_path / "archive"
+    files = dict(
+        data_file=tmp_path / "events.json",
+        state_file=tmp_path / "last_event.json",
+        views_file=tmp_path / "views.json",
+        sketches_file=tmp_path / "sketches.json",
+        duplicates_file=tmp_path / "duplicates.json",
+    )
+
+    events = make_events(200)
+    for start in range(150, -1, -10):
+        body = json.dumps(events[start:start + 50], ensure_ascii=False).encode("utf-8")
+        archive_response(body, archive_dir=archive_dir)
+
+    archive_response(b"{not json", archive_dir=archive_dir)
+    files["data_file"].write_text("[]", encoding="utf-8")
+
+    async def run():
+        ticks = 0
+        done = False
+
+        async def ticker():
+            nonlocal ticks
+            while not done:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(ticker())
+        stats = await replay_archive(rebuild=True, archive_dir=archive_dir, **files)
+        done = True
+        await task
+
+        return stats, ticks
+
+    stats, ticks = asyncio.run(run())
+
+    assert stats["responses"] == 16
+    assert stats["skipped"] == 1
+    assert stats["new"] == len(events)
+    assert ticks >= stats["responses"]  # the loop kept running in between
+
+    expected = tmp_path / "expected.json"
+    save_events([], events, expected)
+    assert files["data_file"].read_bytes() == expected.read_bytes()
+    assert (tmp_path / "events.json.bak").exists()
@@ -0,0 +1,55 @@
+import asyncio
+from functools import partial
+
+from src.commands import poll, refresh
+from src.scripts.synthetic import make_events
+from src.services import watch
+from src.ui.log_buffer import log_buffer
+
+
+def watch_lines():
+    return [line for line in log_buffer if line.startswith("WATCH:")]
+
+
+def test_match_watches_oldest_event_first(tmp_path):
+    watches_file = tmp_path / "watches.json"
+    watch.add_watch("brand", watches_file)
+
+    events = make_events(5)  # newest first
+    for e in events:
+        e["type"] = "Brand"
+
+    hits = watch.match_watches(events, watches_file)
+
+    assert [e["id"] for _, e in hits] == sorted(e["id"] for e in events)
+
+
+def test_refresh_and_poll_print_watches_in_the_same_order(tmp_path, monkeypatch):
+    watches_file = tmp_path / "watches.json"
+    watch.add_watch("brand", watches_file)
+    watch.add_watch("larm", watches_file)
+
+    events = make_events(4)
+    for e in events:
+        e["type"] = "Brand"
+        e["summary"] = "larm"
+
+    async def fake_refresh():
+        return [dict(e) for e in events]
+
+    match = partial(watch.match_watches, watches_file=watches_file)
+    for module in (refresh, poll):
+        monkeypatch.setattr(module, "refresh_events", fake_refresh)
+        monkeypatch.setattr(module, "match_watches", match)
+
+    log_buffer.clear()
+    asyncio.run(refresh.cmd_refresh())
+    from_refresh = watch_lines()
+
+    log_buffer.clear()
+    asyncio.run(poll.poll_once())
+    from_poll = watch_lines()
+    log_buffer.clear()
+
+    assert len(from_refresh) == 8
+    assert from_refresh == from_poll